@@ -51,4 +51,7 @@ def main() -> None:
     # print(client_service.generate_monthly_report())
 
 if __name__ == '__main__':
-    main()
+    try:
+        main()
+    finally:
+        client_service.client_excel_manager.close()
@@ -0,0 +1,17 @@
+from config import create_client_service
+import sys
+
+
+def main() -> None:
+    stale_days = int(sys.argv[1]) if len(sys.argv) > 1 else 365
+    client_service = create_client_service()
+    archive = client_service.archive
+    if archive is None:
+        raise ValueError("No client archive configured")
+
+    archived = client_service.archive_stale_clients(stale_days)
+    client_service.client_excel_manager.close()
+    print(f"[ARCHIVE] Moved {len(archived)} clients older than {stale_days} days to {archive.filepath}")
+
+if __name__ == '__main__':
+    main()
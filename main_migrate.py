@@ -0,0 +1,11 @@
+from config import create_client_service
+
+
+def main() -> None:
+    client_service = create_client_service()
+    client_service.client_excel_manager.normalize_uppercase_columns()
+    client_service.client_excel_manager.close()
+    print(f"[MIGRATE] Uppercase columns normalized in {client_service.client_excel_manager.filepath}")
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,10 @@
 from src.scheduler.clients_scheduler import create_scheduler
+from config import scheduler_db_url
 import time
 
 
 def main() -> None:
-    scheduler = create_scheduler()
+    scheduler = create_scheduler(jobstore_url=scheduler_db_url)
     scheduler.start()
     print(f"[SCHEDULER] starting ... ")
 
@@ -0,0 +1,15 @@
+from src.service.workbook_runner import run_workbooks
+import sys
+
+
+def main() -> None:
+    directory = sys.argv[1] if len(sys.argv) > 1 else "."
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    result = run_workbooks(directory, max_workers=max_workers)
+    print(f"[WORKBOOKS] Processed {len(result['workbooks'])} workbooks, failed: {result['failed']}")
+    print(f"[WORKBOOKS] Notified {result['notified']}")
+    print(f"[WORKBOOKS] Removed {result['removed']}")
+    print(f"[WORKBOOKS] Report {result['report']}")
+
+if __name__ == '__main__':
+    main()
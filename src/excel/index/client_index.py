@@ -0,0 +1,297 @@
+from typing import TypedDict, Callable, Iterable, Iterator, Unpack
+from src.model.client import ClientRecord
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from operator import itemgetter
+from datetime import date
+
+
+class ClientQuery(TypedDict, total=False):
+    """Typed dictionary describing the filters accepted by `ClientIndex.find`.
+
+    Attributes:
+        company: Exact insurance company name.
+        car_year_between: Inclusive (min, max) range of car production years.
+        price_gte: Minimum insurance price (inclusive).
+        price_lte: Maximum insurance price (inclusive).
+        due_from: Earliest next payment date (inclusive).
+        due_before: Latest next payment date (exclusive).
+    """
+    company: str
+    car_year_between: tuple[int, int]
+    price_gte: int
+    price_lte: int
+    due_from: date
+    due_before: date
+
+
+class ClientIndex:
+    """In-memory secondary indexes over client rows, keyed by client email.
+
+    Maintains a hash index on the insurance company and sorted indexes on
+    price, car year and next payment date, so lookups do not need a full
+    scan of the worksheet.
+    """
+
+    def __init__(self, clients: Iterable[ClientRecord] = ()) -> None:
+        """Initialize the index.
+
+        Args:
+            clients: Clients to index initially.
+        """
+        self._clients: dict[str, ClientRecord] = {}
+        self._by_company: dict[str, set[str]] = defaultdict(set)
+        self._by_price: list[tuple[int, str]] = []
+        self._by_car_year: list[tuple[int, str]] = []
+        self._by_next_payment: list[tuple[date, str]] = []
+        self.rebuild(clients)
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def __iter__(self) -> Iterator[ClientRecord]:
+        return iter(self._clients.values())
+
+    def copy(self) -> "ClientIndex":
+        """Copy the index without sorting again.
+
+        Returns:
+            ClientIndex: Independent index with the same entries.
+        """
+        index = ClientIndex()
+        index._clients = dict(self._clients)
+        index._by_company = defaultdict(set, {company: set(emails) for company, emails in self._by_company.items()})
+        index._by_price = list(self._by_price)
+        index._by_car_year = list(self._by_car_year)
+        index._by_next_payment = list(self._by_next_payment)
+        return index
+
+    def rebuild(self, clients: Iterable[ClientRecord]) -> None:
+        """Drop all entries and index the given clients from scratch.
+
+        Args:
+            clients: Clients to index.
+        """
+        self._clients.clear()
+        self._by_company.clear()
+
+        for client in clients:
+            self._clients[client.email] = client
+            self._by_company[client.insurance_company].add(client.email)
+
+        self._by_price = sorted((c.price, e) for e, c in self._clients.items())
+        self._by_car_year = sorted((c.car_year, e) for e, c in self._clients.items())
+        self._by_next_payment = sorted((c.next_payment, e) for e, c in self._clients.items())
+
+    def get(self, email: str) -> ClientRecord | None:
+        """Get an indexed client by email.
+
+        Args:
+            email: Client email.
+
+        Returns:
+            ClientRecord | None: Client data or None if not indexed.
+        """
+        return self._clients.get(email)
+
+    def add(self, client: ClientRecord) -> None:
+        """Index a client, replacing any entry with the same email in place.
+
+        A replaced client keeps its position, so iteration follows the worksheet order.
+
+        Args:
+            client: Client data to index.
+        """
+        email = client.email
+        previous = self._clients.get(email)
+        if previous is not None:
+            self._unindex(previous)
+
+        self._clients[email] = client
+        self._by_company[client.insurance_company].add(email)
+        insort(self._by_price, (client.price, email))
+        insort(self._by_car_year, (client.car_year, email))
+        insort(self._by_next_payment, (client.next_payment, email))
+
+    def remove(self, email: str) -> bool:
+        """Remove a client from all indexes.
+
+        Args:
+            email: Email of the client to remove.
+
+        Returns:
+            bool: True if the client was indexed, False otherwise.
+        """
+        client = self._clients.pop(email, None)
+        if client is None:
+            return False
+
+        self._unindex(client)
+        return True
+
+    def first_payment(self) -> date | None:
+        """Get the earliest next payment date of all indexed clients.
+
+        Returns:
+            date | None: Earliest payment date or None if no client is indexed.
+        """
+        return self._by_next_payment[0][0] if self._by_next_payment else None
+
+    def next_payment_from(self, day: date) -> date | None:
+        """Get the first next payment date on or after a given day.
+
+        Args:
+            day: First day to consider.
+
+        Returns:
+            date | None: Payment date or None if no payment falls on or after the day.
+        """
+        pos = bisect_left(self._by_next_payment, day, key=itemgetter(0))
+        return self._by_next_payment[pos][0] if pos < len(self._by_next_payment) else None
+
+    def find(self, **query: Unpack[ClientQuery]) -> list[ClientRecord]:
+        """Find clients matching all given filters.
+
+        The most selective index among the given filters is used to produce
+        candidates, which are then checked against the remaining filters.
+
+        Args:
+            **query: Filters described by `ClientQuery`.
+
+        Returns:
+            list[ClientRecord]: Matching clients, in no particular order.
+        """
+        candidates = self._plan(query)
+        if candidates is None:
+            return [c for c in self._clients.values() if self._matches(c, query)]
+
+        clients = (self._clients[email] for email in candidates)
+        return [client for client in clients if self._matches(client, query)]
+
+    # -----------------------------------------------------------------------------------------------------
+    # Method auxiliary
+    # -----------------------------------------------------------------------------------------------------
+
+    def _plan(self, query: ClientQuery) -> list[str] | set[str] | None:
+        """Choose the index that yields the fewest candidates for a query.
+
+        Args:
+            query: Query filters.
+
+        Returns:
+            list[str] | set[str] | None: Candidate emails or None if no indexed filter was given.
+        """
+        plans: list[tuple[int, Callable[[], list[str] | set[str]]]] = []
+
+        if "company" in query:
+            bucket = self._by_company.get(query["company"], set())
+            plans.append((len(bucket), lambda: bucket))
+
+        if "car_year_between" in query:
+            low, high = query["car_year_between"]
+            plans.append(self._range_plan(self._by_car_year, low, high, True))
+
+        if "price_gte" in query or "price_lte" in query:
+            plans.append(self._range_plan(self._by_price, query.get("price_gte"), query.get("price_lte"), True))
+
+        if "due_from" in query or "due_before" in query:
+            plans.append(
+                self._range_plan(self._by_next_payment, query.get("due_from"), query.get("due_before"), False)
+            )
+
+        if not plans:
+            return None
+
+        _, produce = min(plans, key=itemgetter(0))
+        return produce()
+
+    @staticmethod
+    def _range_plan[K: (int, date)](
+            entries: list[tuple[K, str]],
+            low: K | None,
+            high: K | None,
+            high_inclusive: bool,
+    ) -> tuple[int, Callable[[], list[str]]]:
+        """Build a candidate plan for a range over a sorted index.
+
+        Args:
+            entries: Sorted (key, email) entries.
+            low: Inclusive lower bound or None.
+            high: Upper bound or None.
+            high_inclusive: Whether the upper bound is inclusive.
+
+        Returns:
+            tuple[int, Callable[[], list[str]]]: Number of candidates and a function producing them.
+        """
+        key = itemgetter(0)
+        start = bisect_left(entries, low, key=key) if low is not None else 0
+        if high is None:
+            stop = len(entries)
+        elif high_inclusive:
+            stop = bisect_right(entries, high, key=key)
+        else:
+            stop = bisect_left(entries, high, key=key)
+
+        stop = max(start, stop)
+        return stop - start, lambda: [email for _, email in entries[start:stop]]
+
+    @staticmethod
+    def _matches(client: ClientRecord, query: ClientQuery) -> bool:
+        """Check whether a client satisfies all query filters.
+
+        Args:
+            client: Client data.
+            query: Query filters.
+
+        Returns:
+            bool: True if the client matches.
+        """
+        if "company" in query and client.insurance_company != query["company"]:
+            return False
+
+        if "car_year_between" in query:
+            low, high = query["car_year_between"]
+            if not low <= client.car_year <= high:
+                return False
+
+        if "price_gte" in query and client.price < query["price_gte"]:
+            return False
+
+        if "price_lte" in query and client.price > query["price_lte"]:
+            return False
+
+        if "due_from" in query and client.next_payment < query["due_from"]:
+            return False
+
+        if "due_before" in query and client.next_payment >= query["due_before"]:
+            return False
+
+        return True
+
+    def _unindex(self, client: ClientRecord) -> None:
+        """Remove a client from the secondary indexes.
+
+        Args:
+            client: Indexed client data.
+        """
+        email = client.email
+        company = client.insurance_company
+        self._by_company[company].discard(email)
+        if not self._by_company[company]:
+            del self._by_company[company]
+
+        self._discard_sorted(self._by_price, (client.price, email))
+        self._discard_sorted(self._by_car_year, (client.car_year, email))
+        self._discard_sorted(self._by_next_payment, (client.next_payment, email))
+
+    @staticmethod
+    def _discard_sorted[K: (int, date)](entries: list[tuple[K, str]], entry: tuple[K, str]) -> None:
+        """Remove an entry from a sorted index if present.
+
+        Args:
+            entries: Sorted (key, email) entries.
+            entry: Entry to remove.
+        """
+        pos = bisect_left(entries, entry)
+        if pos < len(entries) and entries[pos] == entry:
+            del entries[pos]
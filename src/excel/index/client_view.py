@@ -0,0 +1,72 @@
+from src.excel.index.client_index import ClientIndex, ClientQuery
+from src.model.client import ClientRecord
+from typing import Iterator, Unpack
+from datetime import date
+
+
+class ClientView:
+    """Immutable snapshot of the client table for readers.
+
+    A view owns a private copy of the client index taken at one manager
+    generation and is never modified afterwards. Readers such as reports and
+    reminder selection can use it from any thread while a writer keeps
+    mutating the workbook, without locks and without seeing half-applied changes.
+    """
+
+    def __init__(self, version: int, index: ClientIndex) -> None:
+        """Initialize the view.
+
+        Args:
+            version: Manager generation the view was taken at.
+            index: Index copy owned by the view.
+        """
+        self.version = version
+        self._index = index
+        self.clients: tuple[ClientRecord, ...] = tuple(index)
+
+    def __len__(self) -> int:
+        return len(self.clients)
+
+    def __iter__(self) -> Iterator[ClientRecord]:
+        return iter(self.clients)
+
+    def get(self, email: str) -> ClientRecord | None:
+        """Get a client by email.
+
+        Args:
+            email: Client email.
+
+        Returns:
+            ClientRecord | None: Client data or None if not in the view.
+        """
+        return self._index.get(email)
+
+    def find(self, **query: Unpack[ClientQuery]) -> list[ClientRecord]:
+        """Find clients matching all given filters.
+
+        Args:
+            **query: Filters described by `ClientQuery`.
+
+        Returns:
+            list[ClientRecord]: Matching clients, in no particular order.
+        """
+        return self._index.find(**query)
+
+    def first_payment(self) -> date | None:
+        """Get the earliest next payment date.
+
+        Returns:
+            date | None: Earliest payment date or None if the view is empty.
+        """
+        return self._index.first_payment()
+
+    def next_payment_from(self, day: date) -> date | None:
+        """Get the first next payment date on or after a given day.
+
+        Args:
+            day: First day to consider.
+
+        Returns:
+            date | None: Payment date or None if no payment falls on or after the day.
+        """
+        return self._index.next_payment_from(day)
@@ -0,0 +1,137 @@
+from src.excel.manager.client_manager import ClientExcelManager
+from src.model.client import ArchivedClient, ClientRecord
+from src.excel.manager.base_manager import ExcelManager, mutation
+from typing import Iterable, Iterator
+from openpyxl import load_workbook
+from datetime import date
+from pathlib import Path
+import logging
+
+ARCHIVE_HEADERS = [
+    "NAME", "EMAIL", "INSURANCE COMPANY", "CAR MODEL", "CAR YEAR", "PRICE", "NEXT PAYMENT", "ARCHIVED ON", "REASON"
+]
+
+
+class ClientArchiveManager(ExcelManager):
+    """Append-only archive workbook of clients removed from the live workbook, e.g. `Clients.archive.xlsx`.
+
+    Archived clients are buffered and appended in batches, so the archive file
+    is rewritten once per batch rather than once per client. The archive is only
+    parsed when it is written to or read, and reads stream it in read-only mode.
+    """
+
+    def __init__(
+            self,
+            filepath: str,
+            sheet_name: str = "Archive",
+            batch_size: int = 100,
+            lock_timeout: float | None = 30.0,
+    ) -> None:
+        """Initialize the archive.
+
+        Args:
+            filepath: Path to the archive workbook.
+            sheet_name: Worksheet name of the archive.
+            batch_size: Number of buffered clients that triggers a write.
+            lock_timeout: Seconds to wait for the file lock held by another process, or None to wait forever.
+
+        Raises:
+            ValueError: If the batch size is not positive.
+        """
+        if batch_size < 1:
+            raise ValueError("Batch size should be at least 1")
+
+        super().__init__(filepath, sheet_name, lock_timeout=lock_timeout)
+        self.batch_size = batch_size
+        self.pending: list[ArchivedClient] = []
+
+    def add(self, clients: Iterable[ClientRecord], reason: str) -> None:
+        """Buffer clients for archiving, writing the archive when a batch is full.
+
+        Args:
+            clients: Clients removed from the live workbook.
+            reason: Why the clients were archived.
+        """
+        today = date.today()
+        self.pending.extend(ArchivedClient(client, today, reason) for client in clients)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Append all buffered clients to the archive workbook and save it."""
+        if not self.pending:
+            return
+
+        rows = [
+            [*archived.client.to_dict().values(), archived.archived_on.isoformat(), archived.reason]
+            for archived in self.pending
+        ]
+        self.append_archived(rows)
+        logging.info(f"[ARCHIVE] {len(self.pending)} clients archived in {self.filepath}")
+        self.pending.clear()
+
+    @mutation
+    def append_archived(self, rows: list[list[str | int]]) -> None:
+        """Append archive rows and save the workbook.
+
+        The call is recorded, so the rows are appended again when another process
+        saved the archive in the meantime.
+
+        Args:
+            rows: Row values in the order of `ARCHIVE_HEADERS`.
+        """
+        ws = self.get_sheet()
+        if all(cell.value is None for cell in ws[1]):
+            for col_idx, header in enumerate(ARCHIVE_HEADERS, start=1):
+                self.write_cell(ws, 1, col_idx, header)
+
+        for row in rows:
+            ws.append(row)
+        self.save()
+
+    def iter_clients(self) -> Iterator[ArchivedClient]:
+        """Stream archived clients, including buffered ones, without loading the whole workbook.
+
+        Rows that cannot be parsed are logged and skipped.
+
+        Yields:
+            ArchivedClient: Archived clients in the order they were archived.
+        """
+        if Path(self.filepath).exists():
+            workbook = load_workbook(self.filepath, read_only=True)
+            try:
+                if self.sheet_name in workbook.sheetnames:
+                    yield from self._parse_rows(workbook[self.sheet_name].iter_rows(min_row=2, values_only=True))
+            finally:
+                workbook.close()
+        yield from list(self.pending)
+
+    # -----------------------------------------------------------------------------------------------------
+    # Method auxiliary
+    # -----------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def _parse_rows(rows: Iterable[tuple]) -> Iterator[ArchivedClient]:
+        """Convert archive rows into archived clients.
+
+        Args:
+            rows: Row values of the archive sheet.
+
+        Yields:
+            ArchivedClient: Parsed archived clients.
+        """
+        required_length = len(ClientRecord._fields)
+        for row_idx, row in enumerate(rows, start=2):
+            try:
+                client = ClientExcelManager._parse_client_row(row, required_length)
+                if client is None:
+                    continue
+                archived_on = ClientExcelManager._to_date(row[required_length] if len(row) > required_length else None)
+                if archived_on is None:
+                    raise ValueError("invalid archive date")
+            except (TypeError, ValueError) as e:
+                logging.warning(f"[INVALID] Archive row {row_idx} skipped: {e}")
+                continue
+
+            reason = row[required_length + 1] if len(row) > required_length + 1 else None
+            yield ArchivedClient(client, archived_on, str(reason or ""))
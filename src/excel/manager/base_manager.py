@@ -1,9 +1,68 @@
 from openpyxl.utils import get_column_letter, column_index_from_string, range_boundaries
-from src.excel.type.style_type import CellStyle, apply_style
+from src.excel.type.style_type import CellStyle, apply_style, prepare_style
 from openpyxl.worksheet.worksheet import Worksheet
+from typing import Callable, Concatenate, Mapping, Any, Iterable, Iterator, cast
+from src.excel.storage.operation import Operation
+from src.excel.storage.file_lock import FileLock
+from src.excel.storage.journal import Journal
+from datetime import datetime, timezone
+from openpyxl.packaging.custom import IntProperty
+from openpyxl.writer.excel import ExcelWriter
+from zipfile import ZipFile, ZIP_DEFLATED
 from openpyxl import load_workbook, Workbook
-from typing import Callable, Mapping
+from openpyxl.cell.cell import Cell
+from contextlib import contextmanager
+from functools import wraps
 from pathlib import Path
+from math import ceil
+import threading
+import tempfile
+import logging
+import shutil
+import time
+import os
+
+JOURNAL_SEQ_PROPERTY = "journal_seq"
+
+
+def mutation[M: ExcelManager, **P, R](method: Callable[Concatenate[M, P], R]) -> Callable[Concatenate[M, P], R]:
+    """Record calls of a mutating manager method so they can be re-applied after a conflicting save.
+
+    Nested mutations and calls made while replaying are not recorded again.
+    The method runs under the manager's write lock, so a write-behind save never
+    sees a half-applied mutation. Mutation listeners are notified after a
+    recorded call completes, outside the lock.
+
+    Args:
+        method: Manager method that modifies the workbook.
+
+    Returns:
+        Callable: Wrapped method.
+    """
+    @wraps(method)
+    def wrapper(self: M, *args: P.args, **kwargs: P.kwargs) -> R:
+        with self._write_lock:
+            if self._replaying or self._mutation_depth:
+                return method(self, *args, **kwargs)
+
+            operation = Operation(method.__name__, args, kwargs)
+            self._pending_ops.append(operation)
+            self._mutation_depth += 1
+            try:
+                result = method(self, *args, **kwargs)
+            except BaseException:
+                if operation in self._pending_ops:
+                    self._pending_ops.remove(operation)
+                raise
+            finally:
+                self._mutation_depth -= 1
+                self._generation += 1
+
+        for listener in list(self._mutation_listeners):
+            listener(operation)
+        return result
+
+    return wrapper
 
 
 class ExcelManager:
@@ -13,26 +72,94 @@ class ExcelManager:
     Attributes:
         filepath (str): Path to the Excel file.
         sheet_name (str): Default worksheet name.
-        workbook (Workbook): OpenPyXL workbook instance.
+        workbook (Workbook): OpenPyXL workbook instance, loaded on first access.
+        autofit_sample_rows (int | None): Maximum number of rows measured when column widths
+            are fully recomputed, or None to measure every row.
+        backup_count (int): Number of previous file versions kept as `<name>.bak1.xlsx` ... `<name>.bakN.xlsx`.
+        compression_level (int | None): Zip deflate level from 0 (fastest) to 9 (smallest),
+            or None for the zlib default.
+        file_lock (FileLock): Advisory lock on `<filepath>.lock` held while checking and saving the file.
+        journal (Journal | None): Write-ahead journal `<filepath>.journal` of mutations not yet
+            written to the workbook file, or None when every save writes the file.
+        journal_max_bytes (int): Journal size that triggers a compaction into the workbook file.
+        journal_compact_interval (float | None): Seconds after which a save compacts the journal,
+            or None to compact only on size or an explicit `compact` call.
+        write_behind_interval (float | None): Seconds a background thread waits after a change
+            before saving, or None to save synchronously on every `save` call.
     """
 
     def __init__(
             self,
             filepath: str,
             sheet_name: str = "Clients",
+            autofit_sample_rows: int | None = None,
+            backup_count: int = 0,
+            compression_level: int | None = None,
+            lock_timeout: float | None = 30.0,
+            journal: bool = False,
+            journal_max_bytes: int = 1_048_576,
+            journal_compact_interval: float | None = 300.0,
+            write_behind_interval: float | None = None,
     ) -> None:
         """Initialize an ExcelManager.
 
         Args:
             filepath (str): Path to the Excel file.
             sheet_name (str, optional): Name of the worksheet. Defaults to "Clients".
+            autofit_sample_rows (int | None, optional): Row cap for full width recomputes. Defaults to None.
+            backup_count (int, optional): Number of previous versions to keep on save. Defaults to 0.
+            compression_level (int | None, optional): Zip deflate level (0-9). Defaults to None.
+            lock_timeout (float | None, optional): Seconds to wait for the file lock, or None to wait forever.
+                Defaults to 30.0.
+            journal (bool, optional): Record mutations in a journal instead of rewriting the file
+                on every save. Defaults to False.
+            journal_max_bytes (int, optional): Journal size that triggers a compaction. Defaults to 1 MiB.
+            journal_compact_interval (float | None, optional): Seconds between compactions. Defaults to 300.0.
+            write_behind_interval (float | None, optional): Save in a background thread at most once
+                per this many seconds instead of on every `save` call. Defaults to None.
+
+        Raises:
+            ValueError: If the compression level is out of range.
         """
+        if compression_level is not None and not 0 <= compression_level <= 9:
+            raise ValueError("Compression level should be between 0 and 9")
+
         self.filepath = filepath
         self.sheet_name = sheet_name
-        self.workbook = self._load_or_create()
-
-        if self.sheet_name not in self.workbook.sheetnames:
-            self.workbook.create_sheet(self.sheet_name)
+        self.autofit_sample_rows = autofit_sample_rows
+        self.backup_count = backup_count
+        self.compression_level = compression_level
+        self.file_lock = FileLock(f"{filepath}.lock", timeout=lock_timeout)
+        self.journal = Journal(f"{filepath}.journal") if journal else None
+        self.journal_max_bytes = journal_max_bytes
+        self.journal_compact_interval = journal_compact_interval
+        self.write_behind_interval = write_behind_interval
+        self._write_lock = threading.RLock()
+        self._dirty = False
+        self._dirty_event = threading.Event()
+        self._closing = threading.Event()
+        self._writer: threading.Thread | None = None
+        self._compacted_at = time.monotonic()
+        self._journal_seq = 0
+        self._pending_ops: list[Operation] = []
+        self._replaying = False
+        self._mutation_depth = 0
+        self._batch_depth = 0
+        self._batch_save = False
+        self._generation = 0
+        self._mutation_listeners: list[Callable[[Operation], None]] = []
+        self._version = self._disk_version()
+        self._workbook: Workbook | None = None
+        self._column_widths: dict[str, dict[int, int]] = {}
+        self._dirty_columns: dict[str, set[int]] = {}
+        self._last_rows: dict[str, dict[int, int]] = {}
+
+    @property
+    def workbook(self) -> Workbook:
+        """OpenPyXL workbook, parsed from the file the first time it is needed."""
+        if self._workbook is None:
+            self._load_workbook()
+        return cast(Workbook, self._workbook)
 
     def get_sheet(self, name: str | None = None) -> Worksheet:
         """Get a worksheet by name.
@@ -45,9 +172,140 @@ class ExcelManager:
         """
         return self.workbook[name or self.sheet_name]
 
+    def add_mutation_listener(self, listener: Callable[[Operation], None]) -> None:
+        """Register a function called after every recorded mutation.
+
+        Args:
+            listener (Callable[[Operation], None]): Function receiving the completed operation.
+        """
+        self._mutation_listeners.append(listener)
+
+    def refresh(self, timeout: float | None = None) -> bool:
+        """Reload the workbook if another process changed the file since it was loaded.
+
+        Pending mutations are applied to the reloaded workbook again.
+
+        Args:
+            timeout (float | None, optional): Seconds to wait for each lock instead of `lock_timeout`.
+
+        Returns:
+            bool: True if the workbook was reloaded.
+
+        Raises:
+            TimeoutError: If a lock could not be acquired in time.
+        """
+        with self.lock(timeout):
+            if self._disk_version() == self._version:
+                return False
+            self._replay_pending()
+            return True
+
+    def reload(self) -> None:
+        """Load the workbook from disk again and replay the journal, dropping unsaved changes and cached state."""
+        self._load_workbook()
+        self._replay_journal()
+
     def save(self) -> None:
-        """Save the workbook to the file path."""
-        self.workbook.save(self.filepath)
+        """Save the workbook to the file path atomically.
+
+        In write-behind mode the workbook is only marked dirty and written by a
+        background thread after `write_behind_interval`, so a burst of changes
+        is written once. Call `flush` or `close` to write it immediately.
+
+        The save runs under the file lock. If another process saved the file since
+        it was loaded, the workbook is reloaded and the pending mutations are applied
+        to it again before writing, so neither side's changes are lost.
+
+        With a journal, the pending mutations are only appended to it, and the
+        workbook file is written when the journal grows past `journal_max_bytes`
+        or `journal_compact_interval` elapsed.
+
+        The workbook is written to a temporary file in the same directory, flushed
+        to disk and renamed over the target, so an interrupted save never leaves a
+        truncated file behind. Previous versions are rotated first when `backup_count` is set.
+        """
+        if self._replaying:
+            return
+
+        if self._batch_depth:
+            self._batch_save = True
+            return
+
+        self._save_or_defer()
+
+    def flush(self) -> None:
+        """Write changes marked dirty in write-behind mode now."""
+        with self._write_lock:
+            if not self._dirty:
+                return
+            self._save_now()
+            self._dirty = False
+
+    def close(self) -> None:
+        """Stop the write-behind thread and write pending changes. Later saves are synchronous."""
+        self._closing.set()
+        self._dirty_event.set()
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+        self.flush()
+
+    def compact(self) -> None:
+        """Write the workbook file with all journaled and pending mutations and empty the journal."""
+        with self._write_lock, self.file_lock:
+            if self._disk_version() != self._version:
+                self._replay_pending()
+            self._write_file()
+            self._version = self._disk_version()
+            self._pending_ops.clear()
+            self._dirty = False
+
+    @contextmanager
+    def lock(self, timeout: float | None = None) -> Iterator[None]:
+        """Hold the manager for exclusive use by this thread and the workbook file for this process.
+
+        The write lock is taken before the file lock, in the same order as every
+        mutation and save, so holding both across several calls cannot deadlock with a writer.
+
+        Args:
+            timeout (float | None, optional): Seconds to wait for each lock instead of `lock_timeout`.
+
+        Yields:
+            None: Control to the block.
+
+        Raises:
+            TimeoutError: If a lock could not be acquired in time.
+        """
+        timeout = self.file_lock.timeout if timeout is None else timeout
+        if not self._write_lock.acquire(timeout=-1 if timeout is None else timeout):
+            raise TimeoutError(f"Could not acquire the write lock of {self.filepath}")
+        try:
+            self.file_lock.acquire(timeout)
+            try:
+                yield
+            finally:
+                self.file_lock.release()
+        finally:
+            self._write_lock.release()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Defer the saves of all mutations made in the block and save once when it ends.
+
+        The block holds the write lock, so a write-behind save never sees part of the batch.
+
+        Yields:
+            None: Control to the block.
+        """
+        with self._write_lock:
+            self._batch_depth += 1
+            try:
+                yield
+            finally:
+                self._batch_depth -= 1
+                if not self._batch_depth and self._batch_save:
+                    self._batch_save = False
+                    self._save_or_defer()
 
     # ------------------------------------------------------------------------------------------------------------------
     #  Data
@@ -66,7 +324,65 @@ class ExcelManager:
         start_col_idx = column_index_from_string(col_letter)
 
         for offset, val in enumerate(data.values()):
-            ws.cell(row=row_idx, column=start_col_idx + offset).value = val
+            self.write_cell(ws, row_idx, start_col_idx + offset, val)
+
+    def write_cell(self, ws: Worksheet, row: int, column: int, value: Any) -> Cell:
+        """Write a cell value and keep the tracked column widths and last rows up to date.
+
+        Args:
+            ws (Worksheet): Target worksheet.
+            row (int): Row index.
+            column (int): Column index.
+            value (Any): Value to write.
+
+        Returns:
+            Cell: The written cell.
+        """
+        cell = ws.cell(row=row, column=column)
+        widths = self._column_widths.get(ws.title)
+        if widths is not None:
+            current = widths.get(column, 0)
+            new_length = self._value_length(value)
+            if new_length >= current:
+                widths[column] = new_length
+            elif self._value_length(cell.value) >= current:
+                self._dirty_columns.setdefault(ws.title, set()).add(column)
+
+        last_rows = self._last_rows.get(ws.title)
+        if last_rows is not None and column in last_rows:
+            if value not in (None, ""):
+                last_rows[column] = max(last_rows[column], row)
+            elif row == last_rows[column]:
+                del last_rows[column]
+
+        cell.value = value
+        return cell
+
+    def delete_rows(self, ws: Worksheet, idx: int, amount: int = 1) -> None:
+        """Delete rows, marking columns whose widest value was removed for recompute
+        and shifting the cached last rows.
+
+        Args:
+            ws (Worksheet): Target worksheet.
+            idx (int): First row to delete.
+            amount (int, optional): Number of rows to delete. Defaults to 1.
+        """
+        widths = self._column_widths.get(ws.title)
+        if widths is not None:
+            dirty = self._dirty_columns.setdefault(ws.title, set())
+            for row in ws.iter_rows(min_row=idx, max_row=min(idx + amount - 1, ws.max_row), values_only=True):
+                for col_idx, value in enumerate(row, start=1):
+                    if value is not None and col_idx not in dirty and self._value_length(value) >= widths.get(col_idx, 0):
+                        dirty.add(col_idx)
+
+        last_rows = self._last_rows.get(ws.title, {})
+        for column, last_row in list(last_rows.items()):
+            if last_row >= idx + amount:
+                last_rows[column] = last_row - amount
+            elif last_row >= idx:
+                del last_rows[column]
+
+        ws.delete_rows(idx, amount)
 
     def apply_str_conversion_for_ranges(
             self,
@@ -79,8 +395,8 @@ class ExcelManager:
             converter_fn (Callable[[str], str]): Function to convert cell values.
             uppercase_cell_ranges (list[str] | None, optional): List of cell ranges. Defaults to None.
         """
+        ws = self.get_sheet()
         for cell_range in uppercase_cell_ranges or []:
-            ws = self.get_sheet()
             min_col, min_row, max_col, max_row = range_boundaries(cell_range)
 
             save_min_row = min_row if min_row is not None else ws.min_row
@@ -99,33 +415,40 @@ class ExcelManager:
     #  Autofit
     # ------------------------------------------------------------------------------------------------------------------
 
-    def autofit_column_widths(self, sheet_name: str | None = None, offset_dim: int = 5) -> None:
+    def autofit_column_widths(self, sheet_name: str | None = None, offset_dim: int = 5, full: bool = False) -> None:
         """Automatically adjust column widths based on content length.
 
+        The longest value per column is tracked on writes made through the manager,
+        so only columns whose widest value was overwritten or deleted are measured
+        again. Values written directly to the worksheet are picked up on a full recompute.
+
         Args:
             sheet_name (str | None, optional): Worksheet name. Defaults to the default sheet.
             offset_dim (int, optional): Additional padding for width. Defaults to 5.
+            full (bool, optional): Measure every column again. Defaults to False.
         """
         ws: Worksheet = self.get_sheet(sheet_name)
+        widths = self._column_widths.get(ws.title)
 
-        for col_cells in ws.iter_cols(min_row=1, max_row=ws.max_row):
-            col_idx = col_cells[0].column
-            max_length = 0
+        if widths is None or full:
+            widths = self._measure_columns(ws, range(1, ws.max_column + 1))
+            self._column_widths[ws.title] = widths
+            self._dirty_columns.pop(ws.title, None)
+        else:
+            dirty = self._dirty_columns.pop(ws.title, set())
+            if dirty:
+                widths.update(self._measure_columns(ws, sorted(dirty)))
 
-            for cell in col_cells:
-                value = cell.value
-                if value is not None:
-                    try:
-                        max_length = max(max_length, len(str(value)))
-                    except Exception:
-                        continue
-            if col_idx:
-                col_letter = get_column_letter(col_idx)
-                ws.column_dimensions[col_letter].width = max_length + offset_dim
+        for col_idx, max_length in widths.items():
+            col_letter = get_column_letter(col_idx)
+            ws.column_dimensions[col_letter].width = max_length + offset_dim
 
     def get_last_row_in_col(self, col_letter: str, sheet_name: str | None = None) -> int:
         """Get the index of the last non-empty row in a column.
 
+        The result is cached per column and kept current by `write_cell` and
+        `delete_rows`; it is only searched for again after the last row was cleared.
+
         Args:
             col_letter (str): Target column letter.
             sheet_name (str | None, optional): Worksheet name. Defaults to the default sheet.
@@ -134,10 +457,18 @@ class ExcelManager:
             int: Last non-empty row index.
         """
         ws = self.get_sheet(sheet_name)
+        col_idx = column_index_from_string(col_letter)
+        last_rows = self._last_rows.setdefault(ws.title, {})
+        if col_idx in last_rows:
+            return last_rows[col_idx]
+
+        last_row = 1
         for row in range(ws.max_row, 0, -1):
-            if ws[f"{col_letter}{row}"].value not in (None, ""):
-                return row
-        return 1
+            if ws.cell(row=row, column=col_idx).value not in (None, ""):
+                last_row = row
+                break
+        last_rows[col_idx] = last_row
+        return last_row
 
     # -----------------------------------------------------------------------------------------------------
     # Style
@@ -172,18 +503,25 @@ class ExcelManager:
             row_style (CellStyle | None, optional): Style for rows. Defaults to None.
             sheet_name (str | None, optional): Worksheet name. Defaults to the default sheet.
         """
+        if not headers:
+            return
+
+        ws = self.get_sheet(sheet_name)
         start_idx = column_index_from_string(start_col_letter)
+        end_idx = start_idx + len(headers) - 1
         max_row = self.get_last_row_in_col(start_col_letter, sheet_name)
 
-        for offset in range(len(headers)):
-            col_letter = get_column_letter(start_idx + offset)
-
-            if header_style:
-               self.style_cell(f"{col_letter}1", header_style, sheet_name)
+        if header_style:
+            apply_header = prepare_style(header_style)
+            for row in ws.iter_rows(min_row=1, max_row=1, min_col=start_idx, max_col=end_idx):
+                for cell in row:
+                    apply_header(cell)
 
-            if row_style and max_row >= 2:
-                for row in range(2, max_row + 1):
-                    self.style_cell(f"{col_letter}{row}", row_style, sheet_name)
+        if row_style and max_row >= 2:
+            apply_row = prepare_style(row_style)
+            for row in ws.iter_rows(min_row=2, max_row=max_row, min_col=start_idx, max_col=end_idx):
+                for cell in row:
+                    apply_row(cell)
 
     # -----------------------------------------------------------------------------------------------------
     # Format
@@ -199,6 +537,9 @@ class ExcelManager:
     ) -> None:
         """Set number format for a column range.
 
+        When the whole column is targeted, the format is also set on the column
+        dimension so cells added later inherit it in Excel.
+
         Args:
             col_letter (str): Target column letter.
             data_format (str): Format string (e.g., '0.00').
@@ -207,17 +548,333 @@ class ExcelManager:
             sheet_name (str | None, optional): Worksheet name. Defaults to the default sheet.
         """
         ws = self.get_sheet(sheet_name)
+        if start_row == 1 and end_row is None:
+            ws.column_dimensions[col_letter].number_format = data_format
+
         end_row = end_row or ws.max_row
         col_idx = column_index_from_string(col_letter)
 
-        for row_idx in range(start_row, end_row + 1):
-            cell = ws.cell(row=row_idx, column=col_idx)
-            cell.number_format = data_format
+        for row in ws.iter_rows(min_row=start_row, max_row=end_row, min_col=col_idx, max_col=col_idx):
+            for cell in row:
+                cell.number_format = data_format
 
     # -----------------------------------------------------------------------------------------------------
     # Method auxiliary
     # -----------------------------------------------------------------------------------------------------
 
+    def _measure_columns(self, ws: Worksheet, columns: Iterable[int]) -> dict[int, int]:
+        """Measure the longest value of the given columns.
+
+        When `autofit_sample_rows` is set and the sheet is larger, only evenly
+        spaced rows (always including the header) are measured.
+
+        Args:
+            ws (Worksheet): Target worksheet.
+            columns (Iterable[int]): Column indexes to measure.
+
+        Returns:
+            dict[int, int]: Longest value length per column.
+        """
+        max_row = ws.max_row
+        step = 1
+        if self.autofit_sample_rows and max_row > self.autofit_sample_rows:
+            step = ceil(max_row / self.autofit_sample_rows)
+
+        widths: dict[int, int] = {}
+        for col_idx in columns:
+            max_length = 0
+            if step == 1:
+                for (value,) in ws.iter_rows(min_row=1, max_row=max_row, min_col=col_idx, max_col=col_idx, values_only=True):
+                    max_length = max(max_length, self._value_length(value))
+            else:
+                for row_idx in range(1, max_row + 1, step):
+                    max_length = max(max_length, self._value_length(ws.cell(row=row_idx, column=col_idx).value))
+            widths[col_idx] = max_length
+        return widths
+
+    @staticmethod
+    def _value_length(value: Any) -> int:
+        """Get the displayed length of a cell value.
+
+        Args:
+            value (Any): Cell value.
+
+        Returns:
+            int: Length of the value as text, or 0 for empty or unprintable values.
+        """
+        if value is None:
+            return 0
+        try:
+            return len(str(value))
+        except Exception:
+            return 0
+
+    def _save_or_defer(self) -> None:
+        """Save the workbook now, or mark it dirty for the write-behind thread."""
+        if self.write_behind_interval is not None and not self._closing.is_set():
+            self._mark_dirty()
+            return
+
+        with self._write_lock:
+            self._save_now()
+
+    def _save_now(self) -> None:
+        """Save the workbook under the file lock, replaying pending mutations after a conflicting save."""
+        with self.file_lock:
+            if self._disk_version() != self._version:
+                self._replay_pending()
+
+            if self.journal is None:
+                self._write_file()
+            else:
+                self._journal_seq = self.journal.append(self._pending_ops, self._journal_seq + 1)
+                if self._compaction_due():
+                    self._write_file()
+
+            self._version = self._disk_version()
+            self._pending_ops.clear()
+
+    def _mark_dirty(self) -> None:
+        """Mark the workbook as changed and start the write-behind thread if it is not running."""
+        with self._write_lock:
+            self._dirty = True
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._write_behind_loop, name=f"write-behind {self.filepath}", daemon=True)
+                self._writer.start()
+        self._dirty_event.set()
+
+    def _write_behind_loop(self) -> None:
+        """Save the workbook once per `write_behind_interval` while it is marked dirty, until closed.
+
+        A failed save is retried after the next interval.
+        """
+        while not self._closing.is_set():
+            self._dirty_event.wait()
+            self._closing.wait(self.write_behind_interval)
+            self._dirty_event.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logging.error(f"[WRITE-BEHIND] Saving {self.filepath} failed, retrying: {e}")
+                self._dirty_event.set()
+
+    def _prepare_write(self) -> None:
+        """Hook called right before the workbook file is written, e.g. to apply deferred styling."""
+
+    def _after_write(self) -> None:
+        """Hook called right after the workbook file was written, e.g. to refresh derived caches."""
+
+    def _write_file(self) -> None:
+        """Write the workbook file and drop the journal entries it now contains.
+
+        The sequence number of the last journal entry is stored in the workbook, so
+        entries left behind by a crash before the journal was cleared are not replayed again.
+        """
+        self._prepare_write()
+        if self.journal is not None:
+            self._store_journal_seq()
+        self._write_atomic()
+        if self.journal is not None:
+            self.journal.clear()
+        self._compacted_at = time.monotonic()
+        self._after_write()
+
+    def _compaction_due(self) -> bool:
+        """Check whether the journal should be folded into the workbook file.
+
+        Returns:
+            bool: True if the file does not exist yet or a journal threshold was reached.
+        """
+        if self.journal is None or not os.path.exists(self.filepath):
+            return True
+        if self.journal.size >= self.journal_max_bytes:
+            return True
+        interval = self.journal_compact_interval
+        return interval is not None and time.monotonic() - self._compacted_at >= interval
+
+    def _write_atomic(self) -> None:
+        """Write the workbook to a temporary file and rename it over the target path."""
+        path = Path(self.filepath)
+        directory = path.parent
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=directory)
+
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                self._write_workbook(tmp_file)
+                tmp_file.flush()
+                os.fsync(tmp_file.fileno())
+
+            if path.exists():
+                shutil.copymode(path, tmp_name)
+                self._rotate_backups(path)
+            else:
+                umask = os.umask(0)
+                os.umask(umask)
+                os.chmod(tmp_name, 0o666 & ~umask)
+
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        self._fsync_directory(directory)
+
+    def _disk_version(self) -> tuple[tuple[int, int] | None, tuple[int, int] | None]:
+        """Get the version stamp of the workbook file and journal on disk.
+
+        Returns:
+            tuple: Stamps of the workbook file and of the journal, see `_file_stamp`.
+        """
+        journal_stamp = self._file_stamp(self.journal.path) if self.journal is not None else None
+        return self._file_stamp(self.filepath), journal_stamp
+
+    @staticmethod
+    def _file_stamp(path: str) -> tuple[int, int] | None:
+        """Get the version stamp of a file.
+
+        Args:
+            path (str): File path.
+
+        Returns:
+            tuple[int, int] | None: Modification time in nanoseconds and size, or None if the file does not exist.
+        """
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load_workbook(self) -> None:
+        """Load the workbook file and reset the state cached for the previous workbook."""
+        self._generation += 1
+        self._version = self._disk_version()
+        workbook = self._load_or_create()
+        self._column_widths.clear()
+        self._dirty_columns.clear()
+        self._last_rows.clear()
+
+        if self.sheet_name not in workbook.sheetnames:
+            workbook.create_sheet(self.sheet_name)
+        self._workbook = workbook
+        self._journal_seq = self._read_journal_seq(workbook)
+
+    def _replay_journal(self) -> None:
+        """Apply the mutations recorded in the journal and not yet contained in the loaded workbook."""
+        if self.journal is None:
+            return
+
+        entries = self.journal.read(after=self._journal_seq)
+        self._replay(entry.operation for entry in entries)
+        if entries:
+            self._journal_seq = entries[-1].seq
+
+    def _store_journal_seq(self) -> None:
+        """Record the sequence number of the last journaled mutation in the workbook's custom properties."""
+        properties = self.workbook.custom_doc_props
+        if JOURNAL_SEQ_PROPERTY in properties.names:
+            del properties[JOURNAL_SEQ_PROPERTY]
+        properties.append(IntProperty(name=JOURNAL_SEQ_PROPERTY, value=self._journal_seq))
+
+    @staticmethod
+    def _read_journal_seq(workbook: Workbook) -> int:
+        """Get the sequence number of the last journaled mutation contained in a workbook.
+
+        Args:
+            workbook (Workbook): Loaded workbook.
+
+        Returns:
+            int: Sequence number, or 0 if the workbook was never written with a journal.
+        """
+        try:
+            return int(workbook.custom_doc_props[JOURNAL_SEQ_PROPERTY].value)
+        except (KeyError, TypeError, ValueError):
+            return 0
+
+    def _replay_pending(self) -> None:
+        """Reload the workbook and apply the pending mutations to it again."""
+        operations = list(self._pending_ops)
+        self.reload()
+        self._replay(operations)
+
+    def _replay(self, operations: Iterable[Operation]) -> None:
+        """Apply recorded mutations without recording or saving them again.
+
+        Args:
+            operations (Iterable[Operation]): Operations to apply in order.
+        """
+        self._replaying = True
+        try:
+            for operation in operations:
+                try:
+                    getattr(self, operation.name)(*operation.args, **operation.kwargs)
+                except Exception as e:
+                    logging.warning(f"Could not replay {operation.name}: {e}")
+        finally:
+            self._replaying = False
+
+    def _write_workbook(self, file: Any) -> None:
+        """Serialize the workbook into an open binary file using the configured compression.
+
+        Args:
+            file (Any): Writable binary file object.
+        """
+        with ZipFile(file, "w", ZIP_DEFLATED, allowZip64=True, compresslevel=self.compression_level) as archive:
+            self.workbook.properties.modified = datetime.now(tz=timezone.utc).replace(tzinfo=None)
+            ExcelWriter(self.workbook, archive).write_data()
+
+    def _rotate_backups(self, path: Path) -> None:
+        """Shift existing backups by one and keep the current file as the newest backup.
+
+        Args:
+            path (Path): Path of the file about to be replaced.
+        """
+        if self.backup_count < 1:
+            return
+
+        for number in range(self.backup_count - 1, 0, -1):
+            older = self._backup_path(path, number)
+            if older.exists():
+                os.replace(older, self._backup_path(path, number + 1))
+
+        newest = self._backup_path(path, 1)
+        newest.unlink(missing_ok=True)
+        try:
+            os.link(path, newest)
+        except OSError:
+            shutil.copy2(path, newest)
+
+    @staticmethod
+    def _backup_path(path: Path, number: int) -> Path:
+        """Get the path of a numbered backup, keeping the original extension so it opens in Excel.
+
+        Args:
+            path (Path): Path of the saved file.
+            number (int): Backup number, 1 being the newest.
+
+        Returns:
+            Path: Backup file path.
+        """
+        return path.with_name(f"{path.stem}.bak{number}{path.suffix}")
+
+    @staticmethod
+    def _fsync_directory(directory: Path) -> None:
+        """Flush a directory entry to disk so a completed rename survives a crash.
+
+        Args:
+            directory (Path): Directory containing the saved file.
+        """
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+
     def _load_or_create(self) -> Workbook:
         """Load an existing workbook or create a new one.
 
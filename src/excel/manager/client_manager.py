@@ -1,13 +1,24 @@
 from calendar import month
 
+from src.model.client import ClientDict, ClientRecord, InvalidClientRow, ClientPatch, ClientDiff
+from openpyxl.worksheet._read_only import ReadOnlyWorksheet
 from openpyxl.utils import column_index_from_string, get_column_letter
+from src.excel.index.client_index import ClientIndex, ClientQuery
+from src.excel.index.client_view import ClientView
 from openpyxl.styles import PatternFill, Font, Border, Alignment
-from src.excel.manager.base_manager import ExcelManager
+from src.excel.type.style_type import CellStyle, to_differential_style, prepare_style
+from src.excel.manager.base_manager import ExcelManager, mutation
+from src.excel.storage.operation import Operation
+from src.excel.storage.snapshot import ClientSnapshot
 from openpyxl.worksheet.worksheet import Worksheet
-from src.excel.type.style_type import CellStyle
 from datetime import datetime, date, timedelta
-from src.model.client import ClientDict
-from typing import override, cast
+from typing import override, cast, Unpack, Any, Literal
+from openpyxl.formatting.rule import Rule
+from openpyxl import load_workbook
+from openpyxl.cell.cell import Cell
+import logging
+
+EXCEL_MAX_ROW = 1048576
 
 
 class ClientExcelManager(ExcelManager):
@@ -37,6 +48,15 @@ class ClientExcelManager(ExcelManager):
 
         uppercase_columns: list[str] | None = None,
         ratio: float = 0.74,
+        summary_mode: Literal["values", "formulas"] = "values",
+        autofit_sample_rows: int | None = None,
+        backup_count: int = 0,
+        compression_level: int | None = None,
+        lock_timeout: float | None = 30.0,
+        journal: bool = False,
+        journal_max_bytes: int = 1_048_576,
+        journal_compact_interval: float | None = 300.0,
+        write_behind_interval: float | None = None,
     ) -> None:
         """Initialize the client Excel manager.
 
@@ -51,10 +71,33 @@ class ClientExcelManager(ExcelManager):
             overdue_style: Style for overdue payments.
             main_table_start_col: Starting column for the main table.
             company_table_start_col: Starting column for the company table.
-            uppercase_columns: List of column letters to apply uppercase conversion.
+            uppercase_columns: List of column letters whose string values are upper-cased
+                when written to the main table.
             ratio: Ratio used for calculating metrics in the summary table.
+            summary_mode: "values" writes summary results computed in Python, "formulas"
+                writes whole-column Excel formulas that recalculate on open.
+            autofit_sample_rows: Row cap for full column width recomputes on huge sheets.
+            backup_count: Number of previous file versions to keep on save.
+            compression_level: Zip deflate level from 0 (fastest) to 9 (smallest).
+            lock_timeout: Seconds to wait for the file lock held by another process, or None to wait forever.
+            journal: Append mutations to `<filepath>.journal` and write the workbook only on compaction.
+            journal_max_bytes: Journal size that triggers a compaction.
+            journal_compact_interval: Seconds after which a save compacts the journal, or None.
+            write_behind_interval: Save in a background thread at most once per this many seconds, or None
+                to save on every change.
         """
-        super().__init__(filepath, sheet_name)
+        super().__init__(
+            filepath,
+            sheet_name,
+            autofit_sample_rows,
+            backup_count,
+            compression_level,
+            lock_timeout,
+            journal,
+            journal_max_bytes,
+            journal_compact_interval,
+            write_behind_interval,
+        )
         self.main_table_headers = (main_table_headers or
                                    ["NAME", "EMAIL", "INSURANCE_COMPANY", "CAR_MODEL", "CAR_YEAR", "PRICE", "NEXT_PAYMENT"])
         self.company_table_headers = company_table_headers or ["INSURANCE_COMPANY", "CLIENT"]
@@ -66,15 +109,28 @@ class ClientExcelManager(ExcelManager):
         self.overdue_style = overdue_style
         self.main_table_start_col = main_table_start_col
         self.company_table_start_col = company_table_start_col
+        self.summary_mode = summary_mode
+        self._index: ClientIndex | None = None
+        self._summary_totals: tuple[int, int] = (0, 0)
+        self._append_cursor: int | None = None
+        self._summary_rows: dict[str, int] = {}
+        self._restyle_pending = False
+        self._snapshot = ClientSnapshot(f"{filepath}.cache")
+        self._cached_clients: list[ClientRecord] | None = None
+        self._view: ClientView | None = None
+        self.invalid_rows: list[InvalidClientRow] = []
 
         self._validate_headers()
         self.summary_table_start_col = self._validate_column_ranges()
 
-        ws = self.get_sheet()
-        if all(cell.value is None for cell in ws[1]):
-            for col_idx, header in enumerate(self.main_table_headers, start=1):
-                ws.cell(row=1, column=col_idx).value = header.replace("_", " ")
-        self.update_summary_tables()
+        if not self._load_snapshot():
+            ws = self.get_sheet()
+            if all(cell.value is None for cell in ws[1]):
+                for col_idx, header in enumerate(self.main_table_headers, start=1):
+                    self.write_cell(ws, 1, col_idx, header.replace("_", " "))
+
+            self._replay_journal()
+            self.update_summary_tables()
 
     # ------------------------------------------------------------------------------------------------------------------
     #  Data
@@ -83,47 +139,136 @@ class ClientExcelManager(ExcelManager):
     def get_next_main_table_row(self) -> int:
         """Find the next available row in the main client table.
 
+        The row is searched for once and then tracked as an append cursor,
+        which is invalidated when rows are deleted or the cursor row is written.
+
         Returns:
             int: Row index where the next client can be inserted.
         """
+        if self._append_cursor is not None:
+            return self._append_cursor
+
         ws = self.get_sheet()
+        self._append_cursor = ws.max_row + 1
         for row_idx in range(2, ws.max_row + 1):
             if not ws.cell(row=row_idx, column=1).value:
-                return row_idx
-        return ws.max_row + 1
+                self._append_cursor = row_idx
+                break
+        return self._append_cursor
 
+    @mutation
     def insert_main_row(self, data: ClientDict) -> None:
         """Insert a new client row into the main table.
 
         Args:
             data: Dictionary containing client data.
         """
-        insert_row = self.get_next_main_table_row()
-        self.add_row(data=data, row_idx=insert_row, sheet_name=self.sheet_name)
+        ws = self.get_sheet()
+        insert_row = self._append_client_row(ws, data)
+        self._reindex_row(ws, insert_row)
+        self.update_summary_tables()
+
+    @mutation
+    def insert_main_rows(self, rows: list[ClientDict]) -> None:
+        """Insert several client rows into the main table, updating the summary tables once.
+
+        Args:
+            rows: Dictionaries containing client data.
+        """
+        if not rows:
+            return
+
+        ws = self.get_sheet()
+        for data in rows:
+            self._reindex_row(ws, self._append_client_row(ws, data))
         self.update_summary_tables()
 
+    # ------------------------------------------------------------------------------------------------------------------
+    #  Query
+    # ------------------------------------------------------------------------------------------------------------------
+
+    @property
+    def index(self) -> ClientIndex:
+        """Secondary indexes over the main client table, built on first use.
+
+        Returns:
+            ClientIndex: Index kept in sync with every mutation made through this manager.
+        """
+        if self._index is None:
+            self._index = ClientIndex(self.load_client_row())
+        return self._index
+
+    def find(self, **query: Unpack[ClientQuery]) -> list[ClientRecord]:
+        """Find clients matching all given filters using the secondary indexes.
+
+        Args:
+            **query: Filters such as company, car_year_between, price_gte, price_lte,
+                due_from and due_before.
+
+        Returns:
+            list[ClientRecord]: Matching clients.
+        """
+        return self.index.find(**query)
+
+    def get_client(self, email: str) -> ClientRecord | None:
+        """Get a client by email without scanning the worksheet.
+
+        Args:
+            email: Client email.
+
+        Returns:
+            ClientRecord | None: Client record or None if not found.
+        """
+        return self.index.get(email)
+
+    def snapshot(self) -> ClientView:
+        """Get an immutable view of the clients for readers.
+
+        The view is shared by all readers until the next change, so taking one is
+        free while nothing is written. After a change, the first reader copies the
+        index under the write lock, i.e. once per change rather than once per read.
+        While another thread holds the write lock, e.g. during a cleanup or a save,
+        the previous view is returned instead of waiting for the writer.
+
+        Returns:
+            ClientView: Clients as of the latest completed change.
+        """
+        view = self._view
+        if view is not None and view.version == self._generation:
+            return view
+
+        if not self._write_lock.acquire(blocking=view is None):
+            return cast(ClientView, view)
+        try:
+            if self._view is None or self._view.version != self._generation:
+                index = self.index.copy()
+                self._view = ClientView(self._generation, index)
+            return self._view
+        finally:
+            self._write_lock.release()
+
     # ------------------------------------------------------------------------------------------------------------------
     #  Tables
     # ------------------------------------------------------------------------------------------------------------------
 
     def update_summary_tables(self) -> None:
-        """Update all summary tables (companies, metrics)."""
+        """Update all summary tables (companies, metrics) from one pass over the main table."""
         ws = self.get_sheet()
-        company = self._extract_unique_insurance_company(ws)
-
-        self._aplay_uppercase()
+        company_counts, people, gross = self._compute_summary(ws)
+        self._summary_totals = (people, gross)
 
         self._update_simple_summary(
             ws,
-            company,
+            company_counts,
             tuple(self.company_table_headers),
             self.company_table_start_col,
-            "C"
+            self._main_col_letter("INSURANCE_COMPANY")
         )
 
-        self._update_metric_table(ws)
+        self._update_metric_table(ws, people, gross)
         self.save()
 
+    @mutation
     def update_client_row(self, col_value: int, value: str, data: ClientDict) -> bool:
         """Update an existing client row based on a column value.
 
@@ -138,12 +283,74 @@ class ClientExcelManager(ExcelManager):
         ws = self.get_sheet()
         for row_idx in range(2, ws.max_row + 1):
             if ws.cell(row=row_idx, column=col_value).value == value:
+                self._unindex_row(ws, row_idx)
                 for col_idx, v in enumerate(data.values(), start=1):
-                    ws.cell(row=row_idx, column=col_idx).value = cast(str | int, v)
+                    self.write_cell(ws, row_idx, col_idx, cast(str | int, v))
+                self._reindex_row(ws, row_idx)
+                self.update_summary_tables()
+                return True
+        return False
+
+    @mutation
+    def patch_client_row(self, col_value: int, value: str, fields: ClientPatch) -> bool:
+        """Write only the changed fields of an existing client row.
+
+        The company summary is rebuilt only when the insurance company changes,
+        and the tables are not restyled.
+
+        Args:
+            col_value: Index of the column to search in.
+            value: Value to match in the given column.
+            fields: Client fields to change.
+
+        Returns:
+            bool: True if the client was found, False otherwise.
+
+        Raises:
+            ValueError: If fields contain an unknown client attribute.
+        """
+        unknown = fields.keys() - set(ClientRecord._fields)
+        if unknown:
+            raise ValueError(f"Unknown client fields: {', '.join(sorted(unknown))}")
+
+        ws = self.get_sheet()
+        for row in ws.iter_rows(min_row=2, max_col=len(ClientRecord._fields)):
+            if row[col_value - 1].value != value:
+                continue
+
+            changes: dict[str, tuple[Cell, str | int]] = {}
+            for field, new_value in fields.items():
+                if isinstance(new_value, date):
+                    new_value = new_value.isoformat()
+                cell = row[ClientRecord._fields.index(field)]
+                if cell.value != new_value:
+                    changes[field] = (cell, cast(str | int, new_value))
+
+            if not changes:
+                return True
+
+            row_idx = row[0].row
+            old_price = row[ClientRecord._fields.index("price")].value
+            self._unindex_row(ws, row_idx)
+            for cell, new_value in changes.values():
+                self.write_cell(ws, row_idx, cell.column, new_value)
+            self._reindex_row(ws, row_idx)
+
+            if "insurance_company" in changes:
                 self.update_summary_tables()
                 return True
+
+            if "price" in changes:
+                people, gross = self._summary_totals
+                gross += self._as_number(changes["price"][1]) - self._as_number(old_price)
+                self._summary_totals = (people, gross)
+                self._update_metric_table(ws, people, gross)
+
+            self.save(restyle=False)
+            return True
         return False
 
+    @mutation
     def shift_payment_date(self, col_value: int, value: str, payment_date_col: int, days: int = 360) -> bool:
         """Shift a client's payment date by a given number of days.
 
@@ -160,19 +367,57 @@ class ClientExcelManager(ExcelManager):
         for row_idx in range(2, ws.max_row + 1):
             if ws.cell(row=row_idx, column=col_value).value == value:
                 data = ws.cell(row=row_idx, column=payment_date_col)
-                v = data.value
-                if isinstance(v, str):
-                    current_date = datetime.strptime(v, "%Y-%m-%d").date()
-                elif isinstance(v, date):
-                    current_date = v
-                else:
+                current_date = self._to_date(data.value)
+                if current_date is None:
                     return False
                 new_date = current_date + timedelta(days=days)
-                data.value = new_date.strftime("%Y-%m-%d")
+                self.write_cell(ws, row_idx, payment_date_col, new_date.isoformat())
+                self._reindex_row(ws, row_idx)
                 self.save()
                 return True
         return False
 
+    @mutation
+    def shift_payment_dates(
+            self,
+            col_value: int,
+            values: set[str],
+            payment_date_col: int,
+            days: int = 360
+    ) -> set[str]:
+        """Shift the payment dates of many clients in one scan, saving once.
+
+        Args:
+            col_value: Column index used to find the clients.
+            values: Values to match in the column.
+            payment_date_col: Column index of the payment date.
+            days: Number of days to shift the payment dates by.
+
+        Returns:
+            set[str]: Matched values whose payment date was updated.
+        """
+        ws = self.get_sheet()
+        shifted: set[str] = set()
+        delta = timedelta(days=days)
+
+        for row in ws.iter_rows(min_row=2, max_col=max(col_value, payment_date_col)):
+            key = row[col_value - 1].value
+            if key not in values:
+                continue
+
+            data = row[payment_date_col - 1]
+            current_date = self._to_date(data.value)
+            if current_date is None:
+                continue
+            self.write_cell(ws, data.row, payment_date_col, (current_date + delta).isoformat())
+            shifted.add(str(key))
+            self._reindex_row(ws, data.row)
+
+        if shifted:
+            self.save()
+        return shifted
+
+    @mutation
     def remove_client_row(self, col_value: int, value: str) -> bool:
         """Remove a client row based on a column value.
 
@@ -186,40 +431,62 @@ class ClientExcelManager(ExcelManager):
         ws = self.get_sheet()
         for row_idx in range(2, ws.max_row + 1):
             if ws.cell(row=row_idx, column=col_value).value == value:
-                ws.delete_rows(row_idx)
+                self._unindex_row(ws, row_idx)
+                self.delete_rows(ws, row_idx)
                 self.update_summary_tables()
                 return True
         return False
 
-    def load_client_row(self) -> list[ClientDict]:
-        """Load all clients from the worksheet.
+    @mutation
+    def remove_client_rows(self, col_value: int, values: set[str]) -> list[str]:
+        """Remove every client row whose column value is in a given set, saving once.
+
+        Args:
+            col_value: Column index to search.
+            values: Values to match in the column.
 
         Returns:
-            list[ClientDict]: List of clients as dictionaries.
+            list[str]: Matched values of the removed rows, in worksheet order.
         """
         ws = self.get_sheet()
-        clients_keys = list(ClientDict.__annotations__.keys())
-        required_length = len(clients_keys)
+        rows: list[int] = []
+        removed: list[str] = []
+        for row_idx, (v,) in enumerate(
+                ws.iter_rows(2, min_col=col_value, max_col=col_value, values_only=True), start=2):
+            if v in values:
+                rows.append(row_idx)
+                removed.append(str(v))
+
+        if not rows:
+            return removed
+
+        for row_idx in rows:
+            self._unindex_row(ws, row_idx)
+        self._delete_rows(ws, rows)
+        self.update_summary_tables()
+        return removed
 
-        clients: list[ClientDict] = []
-        for row in ws.iter_rows(2, values_only=True):
-            try:
-                if not row or any(val is None for val in row[:required_length]):
-                    continue
-
-                clients.append({
-                    "name": str(row[0]),
-                    "email": str(row[1]),
-                    "insurance_company": str(row[2]),
-                    "car_model": str(row[3]),
-                    "car_year": int(str(row[4])),
-                    "price": int(str(row[5])),
-                    "next_payment": str(row[6]),
-                })
-            except Exception:
-                continue
+    def load_client_row(self) -> list[ClientRecord]:
+        """Load all clients from the worksheet.
+
+        Every row is parsed once into a typed record. Rows that cannot be parsed
+        are logged and collected in `invalid_rows` instead of being returned.
+        Until the workbook is parsed, clients are served from the snapshot cache.
+
+        Returns:
+            list[ClientRecord]: List of client records.
+        """
+        if self._cached_clients is not None:
+            return list(self._cached_clients)
+
+        clients, invalid_rows = self._scan_client_rows()
+        for invalid in invalid_rows:
+            logging.warning(f"[INVALID] Row {invalid.row_idx} skipped: {invalid.reason}")
+
+        self.invalid_rows = invalid_rows
         return clients
 
+    @mutation
     def overwrite_clients(self, clients: list[ClientDict]) -> None:
         """Overwrite all clients in the worksheet with new data.
 
@@ -227,77 +494,546 @@ class ClientExcelManager(ExcelManager):
             clients: List of client dictionaries.
         """
         ws = self.get_sheet()
-        ws.delete_rows(2, ws.max_row)
+        self.delete_rows(ws, 2, ws.max_row)
 
         for row_idx, client in enumerate(clients, start=2):
             self.add_row(sheet_name=self.sheet_name, data=client, row_idx=row_idx)
 
+        self._index = None
         self.update_summary_tables()
 
+    @mutation
+    def normalize_uppercase_columns(self) -> None:
+        """Upper-case existing values of the configured columns and save the file.
+
+        New values are normalized when written, so this is only needed once
+        for files created before `uppercase_columns` was configured.
+        """
+        self._aplay_uppercase()
+        self.save()
+
+    @override
+    def write_cell(self, ws: Worksheet, row: int, column: int, value: Any) -> Cell:
+        """Write a cell value, normalizing uppercase columns and keeping the append cursor valid.
+
+        Args:
+            ws: Target worksheet.
+            row: Row index.
+            column: Column index.
+            value: Value to write.
+
+        Returns:
+            Cell: The written cell.
+        """
+        if ws.title == self.sheet_name and row >= 2:
+            if isinstance(value, str) and self.uppercase_columns and get_column_letter(column) in self.uppercase_columns:
+                value = value.upper()
+
+            if column == 1 and self._append_cursor is not None:
+                if not value and row < self._append_cursor:
+                    self._append_cursor = row
+                elif value and row == self._append_cursor:
+                    self._append_cursor = None
+        return super().write_cell(ws, row, column, value)
+
     @override
-    def save(self) -> None:
-        """Apply styles and save the Excel file."""
-        self.style_table_area(self.main_table_start_col, self.main_table_headers, self.header_style, self.row_style)
-        self.style_table_area(self.company_table_start_col, self.company_table_headers, self.header_style, self.row_style)
+    def delete_rows(self, ws: Worksheet, idx: int, amount: int = 1) -> None:
+        """Delete rows, invalidate the main table append cursor and shift the tracked invalid rows.
 
-        self._style_summary_table()
-        self._highlight_overdue_payment()
+        Args:
+            ws: Target worksheet.
+            idx: First row to delete.
+            amount: Number of rows to delete.
+        """
+        if ws.title == self.sheet_name:
+            self._append_cursor = None
+            self.invalid_rows = [
+                row._replace(row_idx=row.row_idx - amount) if row.row_idx >= idx + amount else row
+                for row in self.invalid_rows
+                if not idx <= row.row_idx < idx + amount
+            ]
+        super().delete_rows(ws, idx, amount)
+
+    def sync_external_changes(self, timeout: float | None = None) -> ClientDiff:
+        """Pick up edits made to the workbook file by another program, e.g. by hand in Excel.
+
+        When the file changed since it was loaded, it is streamed in read-only mode and
+        diffed against the loaded clients by email. Only the changed clients are applied
+        to the index and the summary totals, and to the rows of the loaded workbook, so
+        the next save writes them back without parsing the file again. When the workbook
+        is not loaded, the file has rows that cannot be parsed, or no client changed, so
+        the edits are outside the client rows, the workbook is parsed again on the next
+        write instead, so a save never overwrites the external edits.
+        With pending or journaled mutations, the workbook is reloaded and they are replayed instead.
+        Mutation listeners are notified when clients changed, after the locks are released.
 
-        super().autofit_column_widths()
+        Args:
+            timeout (float | None, optional): Seconds to wait for each lock instead of `lock_timeout`.
+
+        Returns:
+            ClientDiff: Clients added, changed and removed in the file.
+
+        Raises:
+            TimeoutError: If a lock could not be acquired in time.
+        """
+        with self.lock(timeout):
+            diff = self._apply_external_changes()
+        return self._notify_diff(diff)
+
+    @override
+    def reload(self) -> None:
+        """Reload the client data, from the snapshot cache when it is current and nothing is pending."""
+        version = self._disk_version()
+        if self._pending_ops or not self._load_snapshot():
+            super().reload()
+            return
+
+        self._version = version
+        self._generation += 1
+        self._workbook = None
+        self._index = None
+        self._append_cursor = None
+        self._summary_rows = {}
+
+    @override
+    def save(self, restyle: bool = True) -> None:
+        """Save the Excel file, applying styles when the workbook file is written.
+
+        Args:
+            restyle: Whether to restyle the tables. Disable it when only values
+                of already styled cells were changed.
+        """
+        self._restyle_pending = self._restyle_pending or restyle
         super().save()
 
     # -----------------------------------------------------------------------------------------------------
     # Method auxiliary
     # -----------------------------------------------------------------------------------------------------
 
-    def _highlight_overdue_payment(self) -> None:
-        """Highlight overdue payments in the main table using overdue style."""
-        ws = self.get_sheet()
-        today = datetime.today().date()
-        col_idx = self.main_table_headers.index("NEXT_PAYMENT") + 1
-        for row in range(2, ws.max_row + 1):
-            cell = ws.cell(row=row, column=col_idx)
-            val = cell.value
+    @override
+    def _prepare_write(self) -> None:
+        """Apply the styles requested since the last write and fit the column widths."""
+        if self._restyle_pending:
+            self.style_table_area(self.main_table_start_col, self.main_table_headers, self.header_style, self.row_style)
+            self.style_table_area(
+                self.company_table_start_col, self.company_table_headers, self.header_style, self.row_style)
 
-            if not val:
-                continue
+            self._style_summary_table()
+            self._ensure_overdue_rule()
+            self._restyle_pending = False
+
+        self.autofit_column_widths()
+
+    @override
+    def _after_write(self) -> None:
+        """Refresh the snapshot cache from the index and the tracked invalid rows, without scanning the sheet."""
+        try:
+            self._snapshot.write(list(self.index), self.invalid_rows, self._file_stamp(self.filepath))
+        except OSError as e:
+            logging.warning(f"Could not write snapshot {self._snapshot.path}: {e}")
+
+    def _load_snapshot(self) -> bool:
+        """Serve clients from the snapshot cache when it matches the workbook file.
+
+        The snapshot is not used while the journal holds mutations it does not contain.
+
+        Returns:
+            bool: True if the snapshot was loaded.
+        """
+        if self.journal is not None and self.journal.size:
+            return False
+
+        snapshot = self._snapshot.read(self._file_stamp(self.filepath))
+        if snapshot is None:
+            return False
+
+        self._cached_clients, self.invalid_rows = snapshot
+        return True
+
+    def _scan_client_rows(
+            self,
+            ws: Worksheet | ReadOnlyWorksheet | None = None
+    ) -> tuple[list[ClientRecord], list[InvalidClientRow]]:
+        """Parse all main table rows of the workbook.
+
+        Args:
+            ws: Worksheet to scan, e.g. one opened in read-only mode. Defaults to the managed sheet.
+
+        Returns:
+            tuple[list[ClientRecord], list[InvalidClientRow]]: Client records and rows that could not be parsed.
+        """
+        ws = ws or self.get_sheet()
+        required_length = len(ClientRecord._fields)
 
+        clients: list[ClientRecord] = []
+        invalid_rows: list[InvalidClientRow] = []
+        for row_idx, row in enumerate(ws.iter_rows(2, max_col=required_length, values_only=True), start=2):
             try:
-                cell_date = (
-                    datetime.strptime(val, "%Y-%m-%d").date()
-                    if isinstance(val, str) else
-                    val if isinstance(val, date) else
-                    None
-                )
-
-                if cell_date and cell_date <= today and self.overdue_style is not None:
-                    self.style_cell(cell.coordinate, self.overdue_style)
-            except Exception:
+                client = self._parse_client_row(row, required_length)
+            except (TypeError, ValueError) as e:
+                invalid_rows.append(InvalidClientRow(row_idx, str(e)))
                 continue
+            if client is not None:
+                clients.append(client)
+        return clients, invalid_rows
 
-    def _extract_unique_insurance_company(
-        self,
-        ws: Worksheet,
-        company_column_name: str = "INSURANCE_COMPANY",
-    ) -> list[str]:
-        """Extract a list of unique insurance companies from the worksheet.
+    @staticmethod
+    def _diff_clients(before: dict[str, ClientRecord], after: list[ClientRecord]) -> ClientDiff:
+        """Compare loaded clients with the clients read from the file by email.
+
+        Args:
+            before: Loaded clients by email.
+            after: Clients read from the file.
+
+        Returns:
+            ClientDiff: Clients added, changed and removed in the file.
+        """
+        after_by_email = {client.email: client for client in after}
+        added = [client for email, client in after_by_email.items() if email not in before]
+        changed = [client for email, client in after_by_email.items() if email in before and before[email] != client]
+        removed = [email for email in before if email not in after_by_email]
+        return ClientDiff(added, changed, removed)
+
+    def _apply_diff_to_sheet(self, before: dict[str, ClientRecord], diff: ClientDiff) -> None:
+        """Write external client changes into the rows of the loaded workbook without saving it.
+
+        The company summary is rebuilt only when a company count changed.
+
+        Args:
+            before: Loaded clients by email.
+            diff: Clients changed in the file.
+        """
+        ws = self.get_sheet()
+        rows = {
+            str(email): row_idx
+            for row_idx, (email,) in enumerate(ws.iter_rows(2, min_col=2, max_col=2, values_only=True), start=2)
+            if email is not None
+        }
+
+        for client in diff.changed:
+            if client.email in rows:
+                self.add_row(data=client.to_dict(), row_idx=rows[client.email], sheet_name=self.sheet_name)
+        self._delete_rows(ws, sorted(rows[email] for email in diff.removed if email in rows))
+        for client in diff.added:
+            self._append_client_row(ws, client.to_dict())
+
+        companies_changed = diff.added or diff.removed or any(
+            client.insurance_company != before[client.email].insurance_company for client in diff.changed)
+        if companies_changed:
+            company_counts, _, _ = self._compute_summary(ws)
+            self._update_simple_summary(
+                ws,
+                company_counts,
+                tuple(self.company_table_headers),
+                self.company_table_start_col,
+                self._main_col_letter("INSURANCE_COMPANY")
+            )
+
+    def _append_client_row(self, ws: Worksheet, data: ClientDict) -> int:
+        """Write a client into the next free main table row and advance the append cursor.
+
+        Args:
+            ws: Worksheet object.
+            data: Dictionary containing client data.
+
+        Returns:
+            int: Index of the written row.
+        """
+        insert_row = self.get_next_main_table_row()
+        self.add_row(data=data, row_idx=insert_row, sheet_name=self.sheet_name)
+        if not ws.cell(row=insert_row + 1, column=1).value:
+            self._append_cursor = insert_row + 1
+        return insert_row
+
+    def _apply_external_changes(self) -> ClientDiff:
+        """Diff the workbook file against the loaded clients and apply the changes, see `sync_external_changes`.
+
+        Must be called under the write lock and the file lock.
+
+        Returns:
+            ClientDiff: Clients added, changed and removed in the file.
+        """
+        if self._disk_version() == self._version:
+            return ClientDiff([], [], [])
+
+        loaded = self._cached_clients if self._cached_clients is not None else self._scan_client_rows()[0]
+        before = {client.email: client for client in loaded}
+        version = self._disk_version()
+        if version == self._version:
+            return ClientDiff([], [], [])
+
+        if self._pending_ops or (self.journal is not None and self.journal.size):
+            self._replay_pending()
+            return self._diff_clients(before, self.load_client_row())
+
+        workbook = load_workbook(self.filepath, read_only=True)
+        try:
+            clients, invalid_rows = self._scan_client_rows(workbook[self.sheet_name])
+        finally:
+            workbook.close()
+
+        diff = self._diff_clients(before, clients)
+        index = self._index
+        if self._workbook is not None and not invalid_rows and not diff.empty:
+            self._apply_diff_to_sheet(before, diff)
+        else:
+            self._workbook = None
+            self._cached_clients = clients
+            self._append_cursor = None
+            self._summary_rows = {}
+        self._version = version
+        self._generation += 1
+        self.invalid_rows = invalid_rows
+
+        people, gross = self._summary_totals
+        people += len(diff.added) - len(diff.removed)
+        gross += sum(client.price for client in diff.added + diff.changed)
+        gross -= sum(before[client.email].price for client in diff.changed)
+        gross -= sum(before[email].price for email in diff.removed)
+        self._summary_totals = (people, gross)
+        if self._workbook is not None:
+            self._update_metric_table(self.get_sheet(), people, gross)
+
+        if index is not None:
+            for email in diff.removed:
+                index.remove(email)
+            for client in diff.added + diff.changed:
+                index.add(client)
+        self._index = index
+
+        try:
+            self._snapshot.write(clients, invalid_rows, version[0])
+        except OSError as e:
+            logging.warning(f"Could not write snapshot {self._snapshot.path}: {e}")
+        return diff
+
+    def _notify_diff(self, diff: ClientDiff) -> ClientDiff:
+        """Log an external change and notify mutation listeners about it.
+
+        Args:
+            diff: Clients changed in the file.
+
+        Returns:
+            ClientDiff: The given diff.
+        """
+        if diff.empty:
+            return diff
+
+        logging.info(
+            f"[EXTERNAL] {self.filepath} changed: {len(diff.added)} added, "
+            f"{len(diff.changed)} changed, {len(diff.removed)} removed")
+        operation = Operation("sync_external_changes")
+        for listener in self._mutation_listeners:
+            listener(operation)
+        return diff
+
+    @override
+    def _load_workbook(self) -> None:
+        """Load the workbook file and drop the cached client state."""
+        super()._load_workbook()
+        self._cached_clients = None
+        self._index = None
+        self._append_cursor = None
+        self._summary_rows = {}
+        self.invalid_rows = []
+
+        _, people, gross = self._compute_summary(self.get_sheet())
+        self._summary_totals = (people, gross)
+
+    def _delete_rows(self, ws: Worksheet, rows: list[int]) -> None:
+        """Delete rows, grouping consecutive indexes into a single deletion.
+
+        Args:
+            ws: Worksheet object.
+            rows: Ascending row indexes to delete.
+        """
+        runs: list[list[int]] = []
+        for row_idx in rows:
+            if runs and runs[-1][0] + runs[-1][1] == row_idx:
+                runs[-1][1] += 1
+            else:
+                runs.append([row_idx, 1])
+
+        for start, amount in reversed(runs):
+            self.delete_rows(ws, start, amount)
+
+    @staticmethod
+    def _to_date(value: Any) -> date | None:
+        """Convert a next payment cell value into a date.
+
+        Args:
+            value: Cell value as a date, datetime or 'YYYY-MM-DD' string (optionally followed by a time).
+
+        Returns:
+            date | None: Parsed date or None if the value is not a valid date.
+        """
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        if isinstance(value, str):
+            try:
+                return date.fromisoformat(value.partition(" ")[0])
+            except ValueError:
+                return None
+        return None
+
+    @classmethod
+    def _parse_client_row(cls, row: tuple[Any, ...], required_length: int) -> ClientRecord | None:
+        """Convert raw worksheet values into a client record.
+
+        Args:
+            row: Row values starting at the first main table column.
+            required_length: Number of leading values that must be present.
+
+        Returns:
+            ClientRecord | None: Client record or None if the row is empty.
+
+        Raises:
+            ValueError: If the row has missing or invalid values.
+        """
+        values = row[:required_length]
+        if all(val is None for val in values):
+            return None
+        if len(values) < required_length or any(val is None for val in values):
+            raise ValueError("missing values")
+
+        next_payment = cls._to_date(values[6])
+        if next_payment is None:
+            raise ValueError(f"invalid next payment date {values[6]!r}")
+
+        return ClientRecord(
+            name=str(values[0]),
+            email=str(values[1]),
+            insurance_company=str(values[2]),
+            car_model=str(values[3]),
+            car_year=int(str(values[4])),
+            price=int(str(values[5])),
+            next_payment=next_payment,
+        )
+
+    def _reindex_row(self, ws: Worksheet, row_idx: int) -> None:
+        """Refresh the index entry and the tracked invalid rows for a row that was written.
 
         Args:
             ws: Worksheet object.
-            company_column_name: Column name where insurance companies are stored.
+            row_idx: Row index that changed.
+        """
+        if self._index is None:
+            return
+        self.invalid_rows = [row for row in self.invalid_rows if row.row_idx != row_idx]
+
+        required_length = len(ClientRecord._fields)
+        row = next(ws.iter_rows(row_idx, row_idx, max_col=required_length, values_only=True))
+        try:
+            client = self._parse_client_row(row, required_length)
+        except (TypeError, ValueError) as e:
+            self.invalid_rows.append(InvalidClientRow(row_idx, str(e)))
+            self.invalid_rows.sort()
+            return
+        if client is not None:
+            self._index.add(client)
+
+    def _unindex_row(self, ws: Worksheet, row_idx: int) -> None:
+        """Drop the index entry for a row that is about to be overwritten or deleted.
+
+        Args:
+            ws: Worksheet object.
+            row_idx: Row index that changes.
+        """
+        if self._index is None:
+            return
+        email = ws.cell(row=row_idx, column=2).value
+        if email is not None:
+            self._index.remove(str(email))
+
+    def _overdue_formula(self) -> str:
+        """Build the conditional formatting formula marking overdue payments.
+
+        The formula handles payment dates stored both as real dates and as ISO strings.
 
         Returns:
-            list[str]: Sorted list of unique insurance companies.
+            str: Formula relative to the first next payment cell.
+        """
+        cell = f"{self._main_col_letter('NEXT_PAYMENT')}2"
+        return f'AND({cell}<>"",IFERROR(IF(ISNUMBER({cell}),{cell},DATEVALUE({cell})),TODAY()+1)<=TODAY())'
+
+    def _ensure_overdue_rule(self) -> None:
+        """Add a conditional formatting rule highlighting overdue payments, unless already present.
+
+        Excel evaluates the rule when the file is opened, so the highlight is always
+        correct for the current day and costs nothing at save time.
         """
-        company_idx = self.main_table_headers.index(company_column_name)
-        insurance_company: set[str] = set()
+        if self.overdue_style is None:
+            return
 
-        for row in ws.iter_rows(min_row=2, max_col=len(self.main_table_headers), values_only=True):
-            company_val = row[company_idx] if company_idx < len(row) else None
+        ws = self.get_sheet()
+        formula = self._overdue_formula()
+        for conditional_format in ws.conditional_formatting:
+            if any(rule.formula == [formula] for rule in conditional_format.rules):
+                return
+
+        col_letter = self._main_col_letter("NEXT_PAYMENT")
+        ws.conditional_formatting.add(
+            f"{col_letter}2:{col_letter}{EXCEL_MAX_ROW}",
+            Rule(type="expression", formula=[formula], dxf=to_differential_style(self.overdue_style))
+        )
+
+    def _main_col_letter(self, header: str) -> str:
+        """Get the column letter of a main table header.
+
+        Args:
+            header: Main table header name.
+
+        Returns:
+            str: Column letter of the header.
+        """
+        start_idx = column_index_from_string(self.main_table_start_col)
+        return get_column_letter(start_idx + self.main_table_headers.index(header))
+
+    @staticmethod
+    def _as_number(value: Any) -> int:
+        """Convert a cell value to a number the way Excel SUM does, ignoring text.
+
+        Args:
+            value: Cell value.
+
+        Returns:
+            int: Numeric value or 0.
+        """
+        return int(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else 0
+
+    def _compute_summary(self, ws: Worksheet) -> tuple[dict[str, int], int, int]:
+        """Compute company counts, people count and gross total in one pass over the main table.
+
+        Args:
+            ws: Worksheet object.
+
+        Returns:
+            tuple[dict[str, int], int, int]: Client count per upper-cased company
+                (sorted by company), number of people and gross total.
+        """
+        start_idx = column_index_from_string(self.main_table_start_col)
+        company_idx = self.main_table_headers.index("INSURANCE_COMPANY")
+        price_idx = self.main_table_headers.index("PRICE")
+
+        company_counts: dict[str, int] = {}
+        people = 0
+        gross = 0
+        for row in ws.iter_rows(
+                min_row=2,
+                min_col=start_idx,
+                max_col=start_idx + len(self.main_table_headers) - 1,
+                values_only=True):
+            if row[0] not in (None, ""):
+                people += 1
+            company_val = row[company_idx]
             if company_val:
-                insurance_company.add(str(company_val))
+                company = str(company_val).upper()
+                company_counts[company] = company_counts.get(company, 0) + 1
+            gross += self._as_number(row[price_idx])
 
-        return sorted(insurance_company)
+        return dict(sorted(company_counts.items())), people, gross
 
     def _clear_column_range(self, ws: Worksheet, col_letter: str, start_row: int, end_row: int) -> None:
         """Clear values and styles from a given column range.
@@ -308,69 +1044,106 @@ class ClientExcelManager(ExcelManager):
             start_row: Start row index.
             end_row: End row index.
         """
+        col_idx = column_index_from_string(col_letter)
         for row in range(start_row, end_row + 1):
-            cell = ws[f"{col_letter}{row}"]
-            cell.value = None
+            cell = self.write_cell(ws, row, col_idx, None)
             cell.font = Font()
             cell.fill = PatternFill()
             cell.border = Border()
             cell.alignment = Alignment()
             cell.number_format = "General"
 
+    @staticmethod
+    def _count_summary_rows(ws: Worksheet, col_idx: int) -> int:
+        """Count the data rows of a two-column summary table already in the sheet.
+
+        Args:
+            ws: Worksheet object.
+            col_idx: Index of the first summary column.
+
+        Returns:
+            int: Number of consecutive non-empty rows below the header.
+        """
+        rows = 0
+        while ws.max_row >= rows + 2 and (
+                ws.cell(row=rows + 2, column=col_idx).value is not None
+                or ws.cell(row=rows + 2, column=col_idx + 1).value is not None):
+            rows += 1
+        return rows
+
     def _update_simple_summary(
         self,
         ws: Worksheet,
-        unique_values: list[str] | list[int],
+        counts: dict[str, int],
         header_labels: tuple[str, ...],
         start_col_letter: str,
         source_col_letter: str,
     ) -> None:
         """Update a simple summary table with unique values and counts.
 
+        Only rows left over from a longer previous summary are cleared.
+
         Args:
             ws: Worksheet object.
-            unique_values: List of values to summarize.
+            counts: Count per value to summarize.
             header_labels: Headers for the summary table.
             start_col_letter: Column where the summary starts.
-            source_col_letter: Column to count values from.
+            source_col_letter: Column to count values from in formula mode.
         """
         col_idx = column_index_from_string(start_col_letter)
         value_col = get_column_letter(col_idx)
         count_col = get_column_letter(col_idx + 1)
 
-        ws[f"{value_col}1"] = header_labels[0]
-        ws[f"{count_col}1"] = header_labels[1]
+        self.write_cell(ws, 1, col_idx, header_labels[0])
+        self.write_cell(ws, 1, col_idx + 1, header_labels[1])
 
-        self._clear_column_range(ws, value_col, 2, ws.max_row)
-        self._clear_column_range(ws, count_col, 2, ws.max_row)
+        previous_rows = self._summary_rows.get(start_col_letter)
+        if previous_rows is None:
+            previous_rows = self._count_summary_rows(ws, col_idx)
+        if previous_rows > len(counts):
+            self._clear_column_range(ws, value_col, len(counts) + 2, previous_rows + 1)
+            self._clear_column_range(ws, count_col, len(counts) + 2, previous_rows + 1)
+        self._summary_rows[start_col_letter] = len(counts)
 
-        for i, val in enumerate(unique_values):
-            row_idx = i + 2
-            ws[f"{value_col}{row_idx}"].value = str(val).upper() if isinstance(val, str) else val
-            ws[f"{count_col}{row_idx}"] = f'=COUNTIF({source_col_letter}2:{source_col_letter}1000, {value_col}{row_idx})'
+        for row_idx, (val, count) in enumerate(counts.items(), start=2):
+            self.write_cell(ws, row_idx, col_idx, val)
+            if self.summary_mode == "formulas":
+                formula = f"=COUNTIF({source_col_letter}:{source_col_letter}, {value_col}{row_idx})"
+                self.write_cell(ws, row_idx, col_idx + 1, formula)
+            else:
+                self.write_cell(ws, row_idx, col_idx + 1, count)
 
-    def _update_metric_table(self, ws: Worksheet) -> None:
-        """Update the metric summary table with formulas and ratio.
+    def _update_metric_table(self, ws: Worksheet, people: int, gross: int) -> None:
+        """Update the metric summary table with computed values or whole-column formulas.
 
         Args:
             ws: Worksheet object.
+            people: Number of clients in the main table.
+            gross: Gross total of client prices.
         """
+        start_col_idx = column_index_from_string(self.summary_table_start_col)
+        value_col = get_column_letter(start_col_idx + 1)
+
         metrics = ["People", "Gross PLN", "Ratio", "Net PLN"]
-        formulas = [
-            "=COUNTA(A2:A1000)",
-            "=SUM(F2:F1000)",
-            self.ratio,
-            "=M2*M3"
-        ]
-
-        for i, (label, formula) in enumerate(zip(metrics, formulas)):
-            row_idx = i + 1
-            ws[f"L{row_idx}"] = label
-            ws[f"M{row_idx}"].value = formula
-
-        self.set_column_format("M", "0", 2, 2)
-        self.set_column_format("M", "0.00", 3, 3)
-        self.set_column_format("M", "0", 4, 4)
+        if self.summary_mode == "formulas":
+            name_col = self.main_table_start_col
+            price_col = self._main_col_letter("PRICE")
+            values: list[str | int | float] = [
+                f"=COUNTA({name_col}:{name_col})-1",
+                f"=SUM({price_col}:{price_col})",
+                self.ratio,
+                f"={value_col}2*{value_col}3"
+            ]
+        else:
+            values = [people, gross, self.ratio, round(gross * self.ratio)]
+
+        for row_idx, (label, value) in enumerate(zip(metrics, values), start=1):
+            self.write_cell(ws, row_idx, start_col_idx, label)
+            self.write_cell(ws, row_idx, start_col_idx + 1, value)
+
+        self.set_column_format(value_col, "0", 2, 2)
+        self.set_column_format(value_col, "0.00", 3, 3)
+        self.set_column_format(value_col, "0", 4, 4)
 
     def _validate_headers(self) -> None:
         """Validate that headers for all tables are properly defined.
@@ -429,13 +1202,14 @@ class ClientExcelManager(ExcelManager):
         if not self.header_style and not self.row_style:
             return
 
+        ws = self.get_sheet()
         start_col_idx = column_index_from_string(self.summary_table_start_col)
-        label_col_letter = get_column_letter(start_col_idx)
-        value_col_letter = get_column_letter(start_col_idx + 1)
+        apply_header = prepare_style(self.header_style) if self.header_style else None
+        apply_row = prepare_style(self.row_style) if self.row_style else None
 
-        for row_idx in range(1, 5):
-            if self.header_style:
-                self.style_cell(f"{label_col_letter}{row_idx}", self.header_style)
+        for label_cell, value_cell in ws.iter_rows(min_row=1, max_row=4, min_col=start_col_idx, max_col=start_col_idx + 1):
+            if apply_header:
+                apply_header(label_cell)
 
-            if self.row_style:
-                self.style_cell(f"{value_col_letter}{row_idx}", self.row_style)
+            if apply_row:
+                apply_row(value_cell)
@@ -0,0 +1,672 @@
+from src.excel.storage.shard_manifest import ShardManifest, ShardKey
+from src.model.client import ClientDict, ClientRecord, InvalidClientRow, ClientPatch, ClientDiff
+from src.excel.index.client_index import ClientIndex, ClientQuery
+from src.excel.index.client_view import ClientView
+from src.excel.manager.client_manager import ClientExcelManager
+from src.excel.storage.operation import Operation
+from src.excel.storage.file_lock import FileLock
+from typing import Callable, Iterable, Iterator, Unpack
+from contextlib import contextmanager, ExitStack
+from datetime import date, timedelta
+from collections import defaultdict
+import threading
+import os
+
+EMAIL_COLUMN = ClientRecord._fields.index("email") + 1
+
+
+class ShardedIndex:
+    """Read-only view over the indexes of all shards of a `ShardedClientManager`.
+
+    Offers the lookups of `ClientIndex`, asking only the shards a query can match.
+    Built from shard snapshots, it is immutable and safe to read from any thread.
+    """
+
+    def __init__(self, manager: "ShardedClientManager", views: dict[str, ClientView] | None = None) -> None:
+        """Initialize the view.
+
+        Args:
+            manager: Sharded manager whose shards are queried.
+            views: Snapshots of all shards by key, or None to query the live shard indexes.
+        """
+        self.manager = manager
+        self.views = views
+
+    def __len__(self) -> int:
+        return sum(len(index) for index in self._indexes())
+
+    @property
+    def clients(self) -> tuple[ClientRecord, ...]:
+        """tuple[ClientRecord, ...]: Clients of all shards, in shard order."""
+        return tuple(client for index in self._indexes() for client in index)
+
+    def get(self, email: str) -> ClientRecord | None:
+        """Get a client by email from whichever shard holds it.
+
+        Args:
+            email: Client email.
+
+        Returns:
+            ClientRecord | None: Client data or None if not indexed.
+        """
+        if self.views is not None:
+            return next((client for view in self.views.values() if (client := view.get(email)) is not None), None)
+        shard = self.manager.locate(email)
+        return shard.index.get(email) if shard is not None else None
+
+    def first_payment(self) -> date | None:
+        """Get the earliest next payment date over all shards.
+
+        With year shards, the shards are asked in year order and the first non-empty one answers.
+
+        Returns:
+            date | None: Earliest payment date or None if no client is indexed.
+        """
+        payments = (index.first_payment() for index in self._indexes())
+        return self._earliest(payments)
+
+    def next_payment_from(self, day: date) -> date | None:
+        """Get the first next payment date on or after a given day over the shards that can hold it.
+
+        Args:
+            day: First day to consider.
+
+        Returns:
+            date | None: Payment date or None if no payment falls on or after the day.
+        """
+        indexes = self._indexes(self.manager.shard_keys({"due_from": day}))
+        return self._earliest(index.next_payment_from(day) for index in indexes)
+
+    def find(self, **query: Unpack[ClientQuery]) -> list[ClientRecord]:
+        """Find clients matching all given filters in the shards the query can match.
+
+        Args:
+            **query: Filters described by `ClientQuery`.
+
+        Returns:
+            list[ClientRecord]: Matching clients, in no particular order.
+        """
+        indexes = self._indexes(self.manager.shard_keys(query))
+        return [client for index in indexes for client in index.find(**query)]
+
+    # -----------------------------------------------------------------------------------------------------
+    # Method auxiliary
+    # -----------------------------------------------------------------------------------------------------
+
+    def _indexes(self, keys: Iterable[str] | None = None) -> list[ClientIndex | ClientView]:
+        """Get the snapshots of the given shards, or their live indexes without snapshots.
+
+        Args:
+            keys: Shard keys, or None for all shards in key order.
+
+        Returns:
+            list[ClientIndex | ClientView]: Indexes to query.
+        """
+        if self.views is None:
+            return [shard.index for shard in self.manager.shards(keys)]
+        keys = sorted(self.views) if keys is None else keys
+        return [self.views[key] for key in keys if key in self.views]
+
+    def _earliest(self, payments: Iterable[date | None]) -> date | None:
+        """Pick the earliest payment date, stopping at the first one for year shards.
+
+        Args:
+            payments: Payment dates per shard, in shard order.
+
+        Returns:
+            date | None: Earliest date or None if no shard has one.
+        """
+        earliest: date | None = None
+        for payment in payments:
+            if payment is None:
+                continue
+            if self.manager.shard_by == "year":
+                return payment
+            earliest = payment if earliest is None else min(earliest, payment)
+        return earliest
+
+
+class ShardedClientManager:
+    """Routes client operations to one workbook per insurance company or per payment year.
+
+    The shards are listed in `manifest.json` inside the shard directory and
+    each is a regular `ClientExcelManager`, opened on first use. Mutations touch
+    only the shard holding the client, so saves and scans cost in proportion to
+    the shard size. A client whose company or payment year changes is moved to
+    its new shard. Reads that cannot be narrowed to one shard are merged.
+
+    The manager offers the methods of `ClientExcelManager` used by `ClientService`
+    and the scheduler, so either can be passed to the service.
+    """
+
+    def __init__(
+            self,
+            directory: str,
+            manager_factory: Callable[[str], ClientExcelManager],
+            shard_by: ShardKey = "company",
+            ratio: float = 0.74,
+            lock_timeout: float | None = 30.0,
+    ) -> None:
+        """Initialize the sharded manager.
+
+        Args:
+            directory: Directory holding the manifest and the shard workbooks.
+            manager_factory: Function creating the manager of a shard from its workbook path.
+            shard_by: Split clients by "company" or by payment "year".
+            ratio: Ratio used for calculating net totals in reports.
+            lock_timeout: Seconds to wait for the manifest lock, or None to wait forever.
+
+        Raises:
+            ValueError: If an existing manifest uses a different shard key.
+        """
+        self.filepath = directory
+        self.manager_factory = manager_factory
+        self.shard_by = shard_by
+        self.ratio = ratio
+        self.manifest = ShardManifest(os.path.join(directory, "manifest.json"), shard_by)
+        self.file_lock = FileLock(f"{self.manifest.path}.lock", lock_timeout)
+        self._shards: dict[str, ClientExcelManager] = {}
+        self._batch: ExitStack | None = None
+        self._batched: list[ClientExcelManager] = []
+        self._write_lock = threading.RLock()
+        self._mutation_listeners: list[Callable[[Operation], None]] = []
+
+    @property
+    def index(self) -> ShardedIndex:
+        """ShardedIndex: Lookups over the indexes of all shards."""
+        return ShardedIndex(self)
+
+    def snapshot(self) -> ShardedIndex:
+        """Get an immutable view of the clients of all shards for readers.
+
+        Returns:
+            ShardedIndex: Lookups over a snapshot of every shard, see `ClientExcelManager.snapshot`.
+        """
+        keys = sorted(self.manifest.shards)
+        return ShardedIndex(self, {key: shard.snapshot() for key, shard in zip(keys, self.shards(keys))})
+
+    @property
+    def invalid_rows(self) -> list[InvalidClientRow]:
+        """list[InvalidClientRow]: Unparseable rows of the shards loaded so far."""
+        return [row for shard in self._shards.values() for row in shard.invalid_rows]
+
+    def shard_key(self, client: ClientRecord | ClientDict) -> str:
+        """Get the key of the shard a client belongs to.
+
+        Args:
+            client: Client record or row data.
+
+        Returns:
+            str: Insurance company or payment year.
+        """
+        if isinstance(client, ClientRecord):
+            return client.insurance_company if self.shard_by == "company" else str(client.next_payment.year)
+        return client["insurance_company"] if self.shard_by == "company" else client["next_payment"][:4]
+
+    def shard_keys(self, query: ClientQuery) -> list[str]:
+        """Get the keys of the shards a query can match, in key order.
+
+        Args:
+            query: Query filters.
+
+        Returns:
+            list[str]: Registered shard keys.
+        """
+        keys = sorted(self.manifest.shards)
+        if self.shard_by == "company" and "company" in query:
+            return [key for key in keys if key == query["company"]]
+
+        if self.shard_by == "year" and ("due_from" in query or "due_before" in query):
+            first = query["due_from"].year if "due_from" in query else None
+            last = (query["due_before"] - timedelta(days=1)).year if "due_before" in query else None
+            return [key for key in keys
+                    if (first is None or int(key) >= first) and (last is None or int(key) <= last)]
+        return keys
+
+    def shards(self, keys: Iterable[str] | None = None) -> list[ClientExcelManager]:
+        """Get the managers of the given shards, opening them on first use.
+
+        Args:
+            keys: Shard keys, or None for all registered shards in key order.
+
+        Returns:
+            list[ClientExcelManager]: Shard managers.
+        """
+        return [self._open(key) for key in (sorted(self.manifest.shards) if keys is None else keys)]
+
+    def locate(self, email: str) -> ClientExcelManager | None:
+        """Find the shard holding a client.
+
+        Args:
+            email: Client email.
+
+        Returns:
+            ClientExcelManager | None: Shard manager or None if no shard holds the client.
+        """
+        for shard in self.shards():
+            if shard.get_client(email) is not None:
+                return shard
+        return None
+
+    def add_mutation_listener(self, listener: Callable[[Operation], None]) -> None:
+        """Register a function called after every recorded mutation of any shard.
+
+        Args:
+            listener (Callable[[Operation], None]): Function receiving the completed operation.
+        """
+        self._mutation_listeners.append(listener)
+        for shard in self._shards.values():
+            shard.add_mutation_listener(listener)
+
+    def refresh(self, timeout: float | None = None) -> bool:
+        """Reload the manifest and every opened shard changed by another process.
+
+        Args:
+            timeout (float | None, optional): Seconds to wait for each lock instead of `lock_timeout`.
+
+        Returns:
+            bool: True if the manifest or any shard was reloaded.
+
+        Raises:
+            TimeoutError: If a lock could not be acquired in time.
+        """
+        self.file_lock.acquire(timeout)
+        try:
+            manifest = ShardManifest(self.manifest.path, self.shard_by)
+        finally:
+            self.file_lock.release()
+        changed = manifest.shards != self.manifest.shards
+        self.manifest = manifest
+
+        for shard in self._shards.values():
+            changed = shard.refresh(timeout) or changed
+        return changed
+
+    def sync_external_changes(self, timeout: float | None = None) -> ClientDiff:
+        """Pick up edits made by another program to the workbooks of the opened shards.
+
+        Args:
+            timeout (float | None, optional): Seconds to wait for each lock instead of `lock_timeout`.
+
+        Returns:
+            ClientDiff: Clients added, changed and removed over all shards.
+
+        Raises:
+            TimeoutError: If a lock could not be acquired in time.
+        """
+        diff = ClientDiff([], [], [])
+        for shard in self._shards.values():
+            shard_diff = shard.sync_external_changes(timeout)
+            diff = ClientDiff(
+                diff.added + shard_diff.added, diff.changed + shard_diff.changed, diff.removed + shard_diff.removed)
+        return diff
+
+    def save(self) -> None:
+        """Save every opened shard."""
+        for shard in self._shards.values():
+            shard.save()
+
+    def flush(self) -> None:
+        """Write the changes of every opened shard marked dirty in write-behind mode."""
+        for shard in self._shards.values():
+            shard.flush()
+
+    def close(self) -> None:
+        """Stop the write-behind threads of the opened shards and write their pending changes."""
+        for shard in self._shards.values():
+            shard.close()
+
+    def compact(self) -> None:
+        """Write every opened shard workbook and empty its journal."""
+        for shard in self._shards.values():
+            shard.compact()
+
+    @contextmanager
+    def lock(self, timeout: float | None = None) -> Iterator[None]:
+        """Hold every shard for exclusive use, see `ClientExcelManager.lock`.
+
+        Shards are locked in key order. Like `batch`, the block holds the manager's
+        own write lock, so only one thread at a time holds several shards.
+
+        Args:
+            timeout (float | None, optional): Seconds to wait for each lock instead of `lock_timeout`.
+
+        Yields:
+            None: Control to the block.
+
+        Raises:
+            TimeoutError: If a lock could not be acquired in time.
+        """
+        timeout = self.file_lock.timeout if timeout is None else timeout
+        if not self._write_lock.acquire(timeout=-1 if timeout is None else timeout):
+            raise TimeoutError(f"Could not acquire the write lock of {self.filepath}")
+        try:
+            with ExitStack() as stack:
+                for shard in self.shards():
+                    stack.enter_context(shard.lock(timeout))
+                yield
+        finally:
+            self._write_lock.release()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Defer the saves of every shard changed in the block and save each of them once when it ends.
+
+        Only the shards changed in the block join the batch, along with shards first
+        opened inside it, so unrelated shards are not locked. The
+        block holds the manager's write lock, so only one thread at a time holds several shards.
+
+        Yields:
+            None: Control to the block.
+        """
+        if self._batch is not None:
+            yield
+            return
+
+        with self._write_lock, ExitStack() as stack:
+            self._batch = stack
+            try:
+                yield
+            finally:
+                self._batch = None
+                self._batched = []
+
+    # ------------------------------------------------------------------------------------------------------------------
+    #  Data
+    # ------------------------------------------------------------------------------------------------------------------
+
+    def insert_main_row(self, data: ClientDict) -> None:
+        """Insert a new client row into the shard of its company or payment year.
+
+        Args:
+            data: Dictionary containing client data.
+        """
+        self._open(self.shard_key(data)).insert_main_row(data)
+
+    def insert_main_rows(self, rows: list[ClientDict]) -> None:
+        """Insert several client rows, saving each affected shard once.
+
+        Args:
+            rows: Dictionaries containing client data.
+        """
+        groups: dict[str, list[ClientDict]] = defaultdict(list)
+        for data in rows:
+            groups[self.shard_key(data)].append(data)
+        for key in sorted(groups):
+            self._open(key).insert_main_rows(groups[key])
+
+    def get_client(self, email: str) -> ClientRecord | None:
+        """Get a client by email from whichever shard holds it.
+
+        Args:
+            email: Client email.
+
+        Returns:
+            ClientRecord | None: Client record or None if not found.
+        """
+        return self.index.get(email)
+
+    def find(self, **query: Unpack[ClientQuery]) -> list[ClientRecord]:
+        """Find clients matching all given filters in the shards the query can match.
+
+        Args:
+            **query: Filters such as company, car_year_between, price_gte, price_lte,
+                due_from and due_before.
+
+        Returns:
+            list[ClientRecord]: Matching clients.
+        """
+        return self.index.find(**query)
+
+    def update_client_row(self, col_value: int, value: str, data: ClientDict) -> bool:
+        """Update an existing client row, moving it when its shard changes.
+
+        Args:
+            col_value: Index of the column to search in.
+            value: Value to match in the given column.
+            data: New client data to overwrite the row.
+
+        Returns:
+            bool: True if the row was updated, False otherwise.
+        """
+        for shard in self._owners(col_value, value):
+            with self.batch():
+                self._join(shard)
+                if shard.update_client_row(col_value, value, data):
+                    self._rebalance(shard, [data["email"]])
+                    return True
+        return False
+
+    def patch_client_row(self, col_value: int, value: str, fields: ClientPatch) -> bool:
+        """Write only the changed fields of an existing client row, moving it when its shard changes.
+
+        Args:
+            col_value: Index of the column to search in.
+            value: Value to match in the given column.
+            fields: Client fields to change.
+
+        Returns:
+            bool: True if the client was found, False otherwise.
+
+        Raises:
+            ValueError: If fields contain an unknown client attribute.
+        """
+        for shard in self._owners(col_value, value):
+            with self.batch():
+                self._join(shard)
+                if shard.patch_client_row(col_value, value, fields):
+                    if col_value == EMAIL_COLUMN:
+                        self._rebalance(shard, [fields.get("email", value)])
+                    return True
+        return False
+
+    def shift_payment_date(self, col_value: int, value: str, payment_date_col: int, days: int = 360) -> bool:
+        """Shift a client's payment date, moving the client when the payment year changes.
+
+        Args:
+            col_value: Column index used to find the client.
+            value: Value to match in the column.
+            payment_date_col: Column index of the payment date.
+            days: Number of days to shift the payment date by.
+
+        Returns:
+            bool: True if the date was updated, False otherwise.
+        """
+        for shard in self._owners(col_value, value):
+            with self.batch():
+                self._join(shard)
+                if shard.shift_payment_date(col_value, value, payment_date_col, days):
+                    if col_value == EMAIL_COLUMN:
+                        self._rebalance(shard, [value])
+                    return True
+        return False
+
+    def shift_payment_dates(
+            self,
+            col_value: int,
+            values: set[str],
+            payment_date_col: int,
+            days: int = 360
+    ) -> set[str]:
+        """Shift the payment dates of many clients, saving each affected shard once.
+
+        Clients whose payment year changes are moved in one removal per source
+        shard and one bulk insert per target shard.
+
+        Args:
+            col_value: Column index used to find the clients.
+            values: Values to match in the column.
+            payment_date_col: Column index of the payment date.
+            days: Number of days to shift the payment dates by.
+
+        Returns:
+            set[str]: Matched values whose payment date was updated.
+        """
+        shifted: set[str] = set()
+        with self.batch():
+            for shard, shard_values in self._group_owners(col_value, values):
+                self._join(shard)
+                shard_shifted = shard.shift_payment_dates(col_value, shard_values, payment_date_col, days)
+                if col_value == EMAIL_COLUMN:
+                    self._rebalance(shard, shard_shifted)
+                shifted |= shard_shifted
+        return shifted
+
+    def remove_client_row(self, col_value: int, value: str) -> bool:
+        """Remove a client row from the shard holding it.
+
+        Args:
+            col_value: Column index to search.
+            value: Value to match in the column.
+
+        Returns:
+            bool: True if a row was removed, False otherwise.
+        """
+        return any(shard.remove_client_row(col_value, value) for shard in self._owners(col_value, value))
+
+    def remove_client_rows(self, col_value: int, values: set[str]) -> list[str]:
+        """Remove every client row whose column value is in a given set, saving each affected shard once.
+
+        Args:
+            col_value: Column index to search.
+            values: Values to match in the column.
+
+        Returns:
+            list[str]: Matched values of the removed rows, in shard and worksheet order.
+        """
+        removed: list[str] = []
+        for shard, shard_values in self._group_owners(col_value, values):
+            removed.extend(shard.remove_client_rows(col_value, shard_values))
+        return removed
+
+    def load_client_row(self) -> list[ClientRecord]:
+        """Load the clients of all shards.
+
+        Returns:
+            list[ClientRecord]: List of client records, in shard order.
+        """
+        return [client for shard in self.shards() for client in shard.load_client_row()]
+
+    def overwrite_clients(self, clients: list[ClientDict]) -> None:
+        """Overwrite all clients, writing each to the shard of its company or payment year.
+
+        Args:
+            clients: List of client dictionaries.
+        """
+        groups: dict[str, list[ClientDict]] = defaultdict(list)
+        for client in clients:
+            groups[self.shard_key(client)].append(client)
+
+        for key in sorted(set(self.manifest.shards) | set(groups)):
+            self._open(key).overwrite_clients(groups.get(key, []))
+
+    def normalize_uppercase_columns(self) -> None:
+        """Upper-case existing values of the configured columns in every shard."""
+        for shard in self.shards():
+            shard.normalize_uppercase_columns()
+
+    # -----------------------------------------------------------------------------------------------------
+    # Method auxiliary
+    # -----------------------------------------------------------------------------------------------------
+
+    def _open(self, key: str) -> ClientExcelManager:
+        """Get the manager of a shard, registering the shard in the manifest when it is new.
+
+        A shard created while a batch is active joins the batch.
+
+        Args:
+            key: Shard key.
+
+        Returns:
+            ClientExcelManager: Shard manager.
+        """
+        shard = self._shards.get(key)
+        if shard is not None:
+            return shard
+
+        if key not in self.manifest.shards:
+            with self.file_lock:
+                self.manifest = ShardManifest(self.manifest.path, self.shard_by)
+                self.manifest.register(key)
+
+        shard = self.manager_factory(self.manifest.filepath(key))
+        for listener in self._mutation_listeners:
+            shard.add_mutation_listener(listener)
+        self._shards[key] = shard
+        return self._join(shard)
+
+    def _join(self, shard: ClientExcelManager) -> ClientExcelManager:
+        """Add a shard to the active batch, if any and it has not joined yet.
+
+        Args:
+            shard: Shard manager.
+
+        Returns:
+            ClientExcelManager: The given shard.
+        """
+        if self._batch is not None and all(joined is not shard for joined in self._batched):
+            self._batch.enter_context(shard.batch())
+            self._batched.append(shard)
+        return shard
+
+    def _owners(self, col_value: int, value: str) -> list[ClientExcelManager]:
+        """Get the shards that may hold a row matching a column value.
+
+        Email lookups go through the shard indexes, other columns are searched in every shard.
+
+        Args:
+            col_value: Column index to search.
+            value: Value to match in the column.
+
+        Returns:
+            list[ClientExcelManager]: Candidate shards.
+        """
+        if col_value != EMAIL_COLUMN:
+            return self.shards()
+        shard = self.locate(value)
+        return [shard] if shard is not None else []
+
+    def _group_owners(self, col_value: int, values: set[str]) -> list[tuple[ClientExcelManager, set[str]]]:
+        """Split values by the shard holding their rows.
+
+        Args:
+            col_value: Column index to search.
+            values: Values to match in the column.
+
+        Returns:
+            list[tuple[ClientExcelManager, set[str]]]: Shards with the values to look up in each.
+        """
+        if col_value != EMAIL_COLUMN:
+            return [(shard, values) for shard in self.shards()]
+
+        groups: dict[str, set[str]] = defaultdict(set)
+        for key in sorted(self.manifest.shards):
+            shard = self._open(key)
+            for value in values:
+                if shard.get_client(value) is not None:
+                    groups[key].add(value)
+        return [(self._open(key), groups[key]) for key in sorted(groups)]
+
+    def _rebalance(self, shard: ClientExcelManager, emails: Iterable[str]) -> None:
+        """Move clients to other shards when their company or payment year no longer matches.
+
+        The moved clients are removed from the shard in one call and inserted into each target shard in one call.
+
+        Args:
+            shard: Shard currently holding the clients.
+            emails: Client emails.
+        """
+        moves: dict[str, list[ClientRecord]] = defaultdict(list)
+        for email in emails:
+            record = shard.get_client(email)
+            if record is None:
+                continue
+            key = self.shard_key(record)
+            if self._open(key) is not shard:
+                moves[key].append(record)
+
+        if not moves:
+            return
+        shard.remove_client_rows(EMAIL_COLUMN, {record.email for records in moves.values() for record in records})
+        for key in sorted(moves):
+            self._join(self._open(key)).insert_main_rows([record.to_dict() for record in moves[key]])
@@ -0,0 +1,136 @@
+from types import TracebackType
+from typing import IO, Self
+import threading
+import time
+import os
+
+if os.name == "nt":  # pragma: no cover
+    import msvcrt
+else:
+    import fcntl
+
+
+class FileLock:
+    """Advisory lock shared between processes through a sidecar lock file.
+
+    The lock is reentrant within a process and also serializes threads,
+    so it can wrap nested load-modify-save sections.
+    """
+
+    def __init__(self, path: str, timeout: float | None = 30.0, poll_interval: float = 0.05) -> None:
+        """Initialize the lock.
+
+        Args:
+            path: Path of the lock file, created on first use.
+            timeout: Seconds to wait for the lock, or None to wait forever.
+            poll_interval: Seconds between attempts while the lock is held elsewhere.
+        """
+        self.path = path
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._file: IO[bytes] | None = None
+
+    @property
+    def is_locked(self) -> bool:
+        """Whether the lock is held by this process."""
+        return self._depth > 0
+
+    def acquire(self, timeout: float | None = None) -> None:
+        """Acquire the lock, waiting for other processes to release it.
+
+        Args:
+            timeout: Seconds to wait instead of the lock's default timeout.
+
+        Raises:
+            TimeoutError: If the lock could not be acquired within the timeout.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        if not self._thread_lock.acquire(timeout=-1 if timeout is None else timeout):
+            raise TimeoutError(f"Could not acquire lock {self.path}")
+
+        if self._depth == 0:
+            try:
+                self._lock_file(timeout)
+            except BaseException:
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+
+    def release(self) -> None:
+        """Release the lock once; the file lock is dropped when the outermost holder releases it."""
+        self._depth -= 1
+        if self._depth == 0 and self._file is not None:
+            self._unlock(self._file)
+            self._file.close()
+            self._file = None
+        self._thread_lock.release()
+
+    def __enter__(self) -> Self:
+        self.acquire()
+        return self
+
+    def __exit__(
+            self,
+            exc_type: type[BaseException] | None,
+            exc: BaseException | None,
+            traceback: TracebackType | None
+    ) -> None:
+        self.release()
+
+    # -----------------------------------------------------------------------------------------------------
+    # Method auxiliary
+    # -----------------------------------------------------------------------------------------------------
+
+    def _lock_file(self, timeout: float | None) -> None:
+        """Open the lock file and take an exclusive lock on it.
+
+        Args:
+            timeout: Seconds to wait, or None to wait forever.
+
+        Raises:
+            TimeoutError: If another process keeps the lock past the timeout.
+        """
+        file = open(self.path, "a+b")
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while not self._try_lock(file):
+            if deadline is not None and time.monotonic() >= deadline:
+                file.close()
+                raise TimeoutError(f"Could not acquire lock {self.path}")
+            time.sleep(self.poll_interval)
+        self._file = file
+
+    @staticmethod
+    def _try_lock(file: IO[bytes]) -> bool:
+        """Try to lock a file without blocking.
+
+        Args:
+            file: Open lock file.
+
+        Returns:
+            bool: True if the lock was taken.
+        """
+        try:
+            if os.name == "nt":  # pragma: no cover
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            return False
+
+    @staticmethod
+    def _unlock(file: IO[bytes]) -> None:
+        """Unlock a file locked by `_try_lock`.
+
+        Args:
+            file: Open lock file.
+        """
+        if os.name == "nt":  # pragma: no cover
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(file.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,173 @@
+from src.excel.storage.operation import Operation
+from datetime import date, datetime
+from typing import Iterable, NamedTuple, Any
+import logging
+import json
+import os
+
+
+class JournalEntry(NamedTuple):
+    """Operation recorded in the journal.
+
+    Attributes:
+        seq: Sequence number, increasing over the lifetime of the workbook.
+        operation: Recorded operation.
+    """
+    seq: int
+    operation: Operation
+
+
+class Journal:
+    """Append-only journal of workbook mutations stored as JSON lines.
+
+    Every appended batch is flushed and fsynced before returning, so a recorded
+    mutation survives a crash even though the workbook itself was not saved.
+    Entries carry sequence numbers, so entries already written to the workbook
+    can be told apart from newer ones when a crash left them in the journal.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the journal.
+
+        Args:
+            path: Path of the journal file, created on first append.
+        """
+        self.path = path
+
+    @property
+    def size(self) -> int:
+        """Size of the journal file in bytes."""
+        try:
+            return os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
+
+    def append(self, operations: Iterable[Operation], first_seq: int = 1) -> int:
+        """Append operations to the journal and flush them to disk.
+
+        Args:
+            operations: Operations to record.
+            first_seq: Sequence number of the first operation, the following ones are numbered consecutively.
+
+        Returns:
+            int: Sequence number of the last appended operation, or `first_seq - 1` if there was none.
+        """
+        entries = [JournalEntry(seq, operation) for seq, operation in enumerate(operations, start=first_seq)]
+        lines = "".join(self._encode(entry) + "\n" for entry in entries)
+        if not lines:
+            return first_seq - 1
+
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(lines)
+            file.flush()
+            os.fsync(file.fileno())
+        return entries[-1].seq
+
+    def read(self, after: int = 0) -> list[JournalEntry]:
+        """Read the recorded operations newer than a sequence number.
+
+        A trailing line left incomplete by an interrupted append is skipped.
+
+        Args:
+            after: Sequence number of the last operation already applied, e.g. written to the workbook.
+
+        Returns:
+            list[JournalEntry]: Recorded entries in the order they were appended.
+        """
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                lines = file.read().splitlines()
+        except FileNotFoundError:
+            return []
+
+        entries: list[JournalEntry] = []
+        for line_no, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                entry = self._decode(line)
+            except (ValueError, KeyError, TypeError):
+                logging.warning(f"Skipping unreadable journal entry {line_no} in {self.path}")
+                continue
+            if entry.seq > after:
+                entries.append(entry)
+        return entries
+
+    def clear(self) -> None:
+        """Drop all recorded operations once they were written to the workbook."""
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.flush()
+            os.fsync(file.fileno())
+
+    # -----------------------------------------------------------------------------------------------------
+    # Method auxiliary
+    # -----------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def _encode(cls, entry: JournalEntry) -> str:
+        """Serialize a journal entry to a single JSON line.
+
+        Args:
+            entry: Entry to serialize.
+
+        Returns:
+            str: Compact JSON representation.
+        """
+        operation = entry.operation
+        record = {"seq": entry.seq, "op": operation.name, "args": list(operation.args), "kwargs": operation.kwargs}
+        return json.dumps(record, default=cls._encode_value, separators=(",", ":"), ensure_ascii=False)
+
+    @classmethod
+    def _decode(cls, line: str) -> JournalEntry:
+        """Deserialize a journal entry from a JSON line.
+
+        Args:
+            line: JSON line written by `_encode`.
+
+        Returns:
+            JournalEntry: Decoded entry.
+        """
+        record = json.loads(line, object_hook=cls._decode_value)
+        return JournalEntry(int(record["seq"]), Operation(record["op"], tuple(record["args"]), record["kwargs"]))
+
+    @staticmethod
+    def _encode_value(value: Any) -> dict[str, Any]:
+        """Encode values JSON does not support as tagged objects.
+
+        Args:
+            value: Value to encode.
+
+        Returns:
+            dict[str, Any]: Tagged representation.
+
+        Raises:
+            TypeError: If the value type is not supported.
+        """
+        if isinstance(value, datetime):
+            return {"__datetime__": value.isoformat()}
+        if isinstance(value, date):
+            return {"__date__": value.isoformat()}
+        if isinstance(value, (set, frozenset)):
+            return {"__set__": sorted(value, key=str)}
+        raise TypeError(f"Cannot journal value of type {type(value).__name__}")
+
+    @staticmethod
+    def _decode_value(obj: dict[str, Any]) -> Any:
+        """Decode tagged objects written by `_encode_value`.
+
+        Args:
+            obj: Decoded JSON object.
+
+        Returns:
+            Any: Original value or the object itself.
+        """
+        if "__datetime__" in obj:
+            return datetime.fromisoformat(obj["__datetime__"])
+        if "__date__" in obj:
+            return date.fromisoformat(obj["__date__"])
+        if "__set__" in obj:
+            return set(obj["__set__"])
+        return obj
@@ -0,0 +1,14 @@
+from typing import NamedTuple, Any
+
+
+class Operation(NamedTuple):
+    """A recorded call of a mutating manager method.
+
+    Attributes:
+        name: Name of the manager method.
+        args: Positional arguments of the call.
+        kwargs: Keyword arguments of the call.
+    """
+    name: str
+    args: tuple[Any, ...] = ()
+    kwargs: dict[str, Any] = {}
@@ -0,0 +1,101 @@
+from typing import Literal, cast
+from pathlib import Path
+import tempfile
+import json
+import re
+import os
+
+type ShardKey = Literal["company", "year"]
+
+
+class ShardManifest:
+    """JSON manifest of a sharded client layout, e.g. `clients/manifest.json`.
+
+    Records how clients are split (by insurance company or by payment year) and
+    which workbook file, relative to the manifest, holds each shard.
+    """
+
+    def __init__(self, path: str, shard_by: ShardKey = "company") -> None:
+        """Initialize the manifest, loading it when the file exists.
+
+        Args:
+            path: Path of the manifest file.
+            shard_by: Shard key used when the manifest does not exist yet.
+
+        Raises:
+            ValueError: If the existing manifest uses a different shard key or cannot be read.
+        """
+        self.path = path
+        self.shard_by: ShardKey = shard_by
+        self.shards: dict[str, str] = {}
+
+        try:
+            with open(path, encoding="utf-8") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Shard manifest {path} cannot be read: {e}")
+
+        if data.get("shard_by") != shard_by:
+            raise ValueError(f"Shard manifest {path} shards by {data.get('shard_by')}, not {shard_by}")
+        self.shard_by = cast(ShardKey, data["shard_by"])
+        self.shards = dict(data.get("shards", {}))
+
+    @property
+    def directory(self) -> Path:
+        """Directory holding the manifest and the shard workbooks."""
+        return Path(self.path).parent
+
+    def filepath(self, key: str) -> str:
+        """Get the workbook path of a shard.
+
+        Args:
+            key: Shard key, an insurance company or a payment year.
+
+        Returns:
+            str: Path of the shard workbook.
+
+        Raises:
+            ValueError: If the shard is not registered.
+        """
+        if key not in self.shards:
+            raise ValueError(f"Shard {key} is not registered in {self.path}")
+        return str(self.directory / self.shards[key])
+
+    def register(self, key: str) -> str:
+        """Register a new shard with a unique file name and save the manifest.
+
+        Args:
+            key: Shard key, an insurance company or a payment year.
+
+        Returns:
+            str: Path of the shard workbook.
+        """
+        if key in self.shards:
+            return self.filepath(key)
+
+        slug = re.sub(r"[^a-z0-9]+", "_", key.lower()).strip("_") or "shard"
+        used = set(self.shards.values())
+        name = f"clients_{slug}.xlsx"
+        number = 1
+        while name in used:
+            number += 1
+            name = f"clients_{slug}_{number}.xlsx"
+
+        self.shards[key] = name
+        self.save()
+        return self.filepath(key)
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        path = Path(self.path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump({"shard_by": self.shard_by, "shards": self.shards}, file, indent=2, sort_keys=True)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
@@ -0,0 +1,179 @@
+from src.model.client import ClientRecord, InvalidClientRow
+from datetime import date
+from pathlib import Path
+import tempfile
+import logging
+import shutil
+import struct
+import mmap
+import os
+
+
+class ClientSnapshot:
+    """Binary sidecar cache of the client table, e.g. `Clients.xlsx.cache`.
+
+    The file holds a header with the stamp of the workbook it was written from,
+    fixed-width client and invalid row records referencing a string table, and
+    the string table itself. It is read through a memory map, so loading it does
+    not depend on openpyxl and takes milliseconds even for large books.
+    """
+
+    MAGIC = b"CLSN"
+    VERSION = 1
+    HEADER = struct.Struct("<4sHxxqqIII")
+    CLIENT_ROW = struct.Struct("<IIIIiqi")
+    INVALID_ROW = struct.Struct("<II")
+    STRING_LENGTH = struct.Struct("<I")
+
+    def __init__(self, path: str) -> None:
+        """Initialize the snapshot.
+
+        Args:
+            path: Path of the snapshot file.
+        """
+        self.path = path
+
+    def write(
+            self,
+            clients: list[ClientRecord],
+            invalid_rows: list[InvalidClientRow],
+            source_stamp: tuple[int, int] | None
+    ) -> None:
+        """Write the snapshot atomically next to the workbook.
+
+        Like the workbook, the file is flushed to disk before the rename and is
+        readable by the users the umask allows, keeping the mode of an existing snapshot.
+
+        Args:
+            clients: Client records of the written workbook.
+            invalid_rows: Rows of the written workbook that could not be parsed.
+            source_stamp: Modification time in nanoseconds and size of the written workbook.
+        """
+        if source_stamp is None:
+            return
+
+        strings: dict[str, int] = {}
+
+        def string_id(value: str) -> int:
+            return strings.setdefault(value, len(strings))
+
+        client_rows = b"".join(
+            self.CLIENT_ROW.pack(
+                string_id(c.name),
+                string_id(c.email),
+                string_id(c.insurance_company),
+                string_id(c.car_model),
+                c.car_year,
+                c.price,
+                c.next_payment.toordinal(),
+            )
+            for c in clients
+        )
+        invalid = b"".join(self.INVALID_ROW.pack(r.row_idx, string_id(r.reason)) for r in invalid_rows)
+        string_table = b"".join(
+            self.STRING_LENGTH.pack(len(encoded)) + encoded
+            for encoded in (value.encode("utf-8") for value in strings)
+        )
+        header = self.HEADER.pack(
+            self.MAGIC, self.VERSION, *source_stamp, len(clients), len(invalid_rows), len(strings))
+
+        path = Path(self.path)
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(header + client_rows + invalid + string_table)
+                file.flush()
+                os.fsync(file.fileno())
+
+            if path.exists():
+                shutil.copymode(path, tmp_name)
+            else:
+                umask = os.umask(0)
+                os.umask(umask)
+                os.chmod(tmp_name, 0o666 & ~umask)
+
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def read(
+            self,
+            source_stamp: tuple[int, int] | None
+    ) -> tuple[list[ClientRecord], list[InvalidClientRow]] | None:
+        """Read the snapshot if it was written from the given workbook version.
+
+        Args:
+            source_stamp: Modification time in nanoseconds and size of the workbook on disk.
+
+        Returns:
+            tuple | None: Client records and invalid rows, or None if the snapshot is missing,
+                stale or unreadable.
+        """
+        if source_stamp is None:
+            return None
+
+        try:
+            with open(self.path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return self._parse(data, source_stamp)
+        except (OSError, ValueError, IndexError, struct.error) as e:
+            logging.warning(f"Ignoring snapshot {self.path}: {e}")
+            return None
+
+    # -----------------------------------------------------------------------------------------------------
+    # Method auxiliary
+    # -----------------------------------------------------------------------------------------------------
+
+    def _parse(
+            self,
+            data: mmap.mmap,
+            source_stamp: tuple[int, int]
+    ) -> tuple[list[ClientRecord], list[InvalidClientRow]] | None:
+        """Decode a mapped snapshot file.
+
+        Args:
+            data: Memory-mapped snapshot content.
+            source_stamp: Expected workbook stamp.
+
+        Returns:
+            tuple | None: Client records and invalid rows, or None if the snapshot is stale.
+
+        Raises:
+            ValueError: If the file is not a snapshot of a supported version.
+        """
+        magic, version, mtime_ns, size, client_count, invalid_count, string_count = self.HEADER.unpack_from(data)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError("unsupported snapshot format")
+        if (mtime_ns, size) != source_stamp:
+            return None
+
+        view = memoryview(data)
+        try:
+            offset = self.HEADER.size
+            clients_end = offset + client_count * self.CLIENT_ROW.size
+            invalid_end = clients_end + invalid_count * self.INVALID_ROW.size
+
+            strings: list[str] = []
+            pos = invalid_end
+            for _ in range(string_count):
+                (length,) = self.STRING_LENGTH.unpack_from(data, pos)
+                pos += self.STRING_LENGTH.size
+                strings.append(str(view[pos:pos + length], "utf-8"))
+                pos += length
+
+            from_ordinal = date.fromordinal
+            clients = [
+                ClientRecord(
+                    strings[name], strings[email], strings[company], strings[model],
+                    car_year, price, from_ordinal(next_payment)
+                )
+                for name, email, company, model, car_year, price, next_payment
+                in self.CLIENT_ROW.iter_unpack(view[offset:clients_end])
+            ]
+            invalid_rows = [
+                InvalidClientRow(row_idx, strings[reason])
+                for row_idx, reason in self.INVALID_ROW.iter_unpack(view[clients_end:invalid_end])
+            ]
+        finally:
+            view.release()
+        return clients, invalid_rows
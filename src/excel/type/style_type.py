@@ -1,5 +1,7 @@
 from openpyxl.styles import Font, Alignment, Border, PatternFill, Side
-from typing import TypedDict, Literal
+from openpyxl.styles.differential import DifferentialStyle
+from openpyxl.styles.styleable import StyleableObject
+from typing import TypedDict, Literal, Callable
 from openpyxl.cell.cell import Cell
 
 
@@ -56,23 +58,83 @@ def apply_style(cell: Cell, style: CellStyle) -> None:
         style: Dictionary of style attributes to apply. May include
             font, fill, alignment, and border_sides.
     """
-    if "font" in style:
-        cell.font = style["font"]
-    if "fill" in style:
-        cell.fill = style["fill"]
-    if "alignment" in style:
-        cell.alignment = style["alignment"]
-    if "border_sides" in style:
-        sides: dict[str, Side] = {}
-        for direction, border_style in style["border_sides"].items():
-            sides[direction] = Side(
-                style=border_style.get("style"),
-                color=border_style.get("color", "000000")
-            )
-
-        cell.border = Border(
-            left=sides.get("left", Side()),
-            right=sides.get("right", Side()),
-            top=sides.get("top", Side()),
-            bottom=sides.get("bottom", Side())
+    prepare_style(style)(cell)
+
+
+def prepare_style(style: CellStyle) -> Callable[[StyleableObject], None]:
+    """Resolve a style once and return a function applying it to many targets.
+
+    Building the border is done a single time, so styling large ranges does not
+    create new style objects for every cell.
+
+    Args:
+        style: Dictionary of style attributes to apply. May include
+            font, fill, alignment, and border_sides.
+
+    Returns:
+        Callable[[StyleableObject], None]: Function applying the style to a cell or column dimension.
+    """
+    font = style.get("font")
+    fill = style.get("fill")
+    alignment = style.get("alignment")
+    border = build_border(style["border_sides"]) if "border_sides" in style else None
+
+    def apply(target: StyleableObject) -> None:
+        if font is not None:
+            target.font = font
+        if fill is not None:
+            target.fill = fill
+        if alignment is not None:
+            target.alignment = alignment
+        if border is not None:
+            target.border = border
+
+    return apply
+
+
+def build_border(border_sides: dict[str, BorderStyle]) -> Border:
+    """Build an OpenPyXL border from per-side border styles.
+
+    Args:
+        border_sides: Dictionary mapping border sides
+            ('left', 'right', 'top', 'bottom') to a BorderStyle.
+
+    Returns:
+        Border: Border with the given sides.
+    """
+    sides: dict[str, Side] = {}
+    for direction, border_style in border_sides.items():
+        sides[direction] = Side(
+            style=border_style.get("style"),
+            color=border_style.get("color", "000000")
         )
+
+    return Border(
+        left=sides.get("left", Side()),
+        right=sides.get("right", Side()),
+        top=sides.get("top", Side()),
+        bottom=sides.get("bottom", Side())
+    )
+
+
+def to_differential_style(style: CellStyle) -> DifferentialStyle:
+    """Convert a cell style into a differential style usable by conditional formatting.
+
+    Args:
+        style: Dictionary of style attributes. Alignment is not supported by
+            conditional formatting and is ignored.
+
+    Returns:
+        DifferentialStyle: Differential style with the font, fill and border of the cell style.
+    """
+    fill = style.get("fill")
+    if fill is not None:
+        # Conditional formats paint solid fills with the background color.
+        fill = PatternFill(fill_type=fill.fill_type, start_color=fill.fgColor, end_color=fill.fgColor)
+
+    border_sides = style.get("border_sides")
+    return DifferentialStyle(
+        font=style.get("font"),
+        fill=fill,
+        border=build_border(border_sides) if border_sides else None,
+    )
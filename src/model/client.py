@@ -1,5 +1,5 @@
+from typing import TypedDict, NamedTuple
 from dataclasses import dataclass
-from typing import TypedDict
 from datetime import date
 
 
@@ -24,6 +24,27 @@ class ClientDict(TypedDict):
     next_payment: str
 
 
+class ClientPatch(TypedDict, total=False):
+    """Typed dictionary with a subset of client fields to change.
+
+    Attributes:
+        name: Full name of the client.
+        email: Email address of the client.
+        insurance_company: Name of the insurance company.
+        car_model: Model of the client's car.
+        car_year: Year of manufacture of the car.
+        price: Insurance price for the client.
+        next_payment: Next payment date as a datetime.date object.
+    """
+    name: str
+    email: str
+    insurance_company: str
+    car_model: str
+    car_year: int
+    price: int
+    next_payment: date
+
+
 @dataclass
 class Client:
     """Dataclass representing a client and their insurance details.
@@ -61,3 +82,82 @@ class Client:
             "price": self.price,
             "next_payment": self.next_payment.strftime("%Y-%m-%d"),
         }
+
+
+class ClientRecord(NamedTuple):
+    """Compact, typed client row as loaded from the worksheet.
+
+    Attributes:
+        name: Full name of the client.
+        email: Email address of the client.
+        insurance_company: Name of the insurance company.
+        car_model: Model of the client's car.
+        car_year: Year of manufacture of the car.
+        price: Insurance price for the client.
+        next_payment: Next payment date, parsed once when the row is loaded.
+    """
+    name: str
+    email: str
+    insurance_company: str
+    car_model: str
+    car_year: int
+    price: int
+    next_payment: date
+
+    def to_dict(self) -> ClientDict:
+        """Convert the record into a dictionary suitable for writing to the worksheet.
+
+        Returns:
+            ClientDict: A dictionary with the next_payment field formatted as YYYY-MM-DD.
+        """
+        return {
+            "name": self.name,
+            "email": self.email,
+            "insurance_company": self.insurance_company,
+            "car_model": self.car_model,
+            "car_year": self.car_year,
+            "price": self.price,
+            "next_payment": self.next_payment.isoformat(),
+        }
+
+
+class InvalidClientRow(NamedTuple):
+    """Worksheet row that could not be parsed into a client record.
+
+    Attributes:
+        row_idx: Index of the row in the worksheet.
+        reason: Description of the parsing error.
+    """
+    row_idx: int
+    reason: str
+
+
+class ArchivedClient(NamedTuple):
+    """Client moved out of the live workbook into the archive.
+
+    Attributes:
+        client: Client data at the time it was archived.
+        archived_on: Day the client was archived.
+        reason: Why the client was archived, e.g. "removed", "overdue" or "stale".
+    """
+    client: ClientRecord
+    archived_on: date
+    reason: str
+
+
+class ClientDiff(NamedTuple):
+    """Client rows changed in the workbook file since it was loaded, keyed by email.
+
+    Attributes:
+        added: Clients present only in the file.
+        changed: New data of clients whose row differs from the loaded one.
+        removed: Emails of clients no longer present in the file.
+    """
+    added: list[ClientRecord]
+    changed: list[ClientRecord]
+    removed: list[str]
+
+    @property
+    def empty(self) -> bool:
+        """bool: True if no client changed."""
+        return not (self.added or self.changed or self.removed)
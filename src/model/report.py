@@ -13,3 +13,37 @@ class MonthlyReportDict(TypedDict):
     company: dict[str, int]
     gross_total: int
     net_total: int
+
+
+class WorkbookRunDict(TypedDict):
+    """Typed dictionary representation of the nightly run of one workbook.
+
+    Attributes:
+        filepath: Path of the processed workbook.
+        notified: Emails of clients reminded of an upcoming payment.
+        removed: Emails of overdue clients removed from the workbook.
+        report: Monthly report of the workbook, or None if the run failed.
+        error: Error message if the run failed, otherwise None.
+    """
+    filepath: str
+    notified: list[str]
+    removed: list[str]
+    report: MonthlyReportDict | None
+    error: str | None
+
+
+class MultiWorkbookRunDict(TypedDict):
+    """Typed dictionary representation of a nightly run over several workbooks.
+
+    Attributes:
+        workbooks: Per-workbook results, in the order the workbooks were given.
+        notified: Emails notified across all workbooks.
+        removed: Emails removed across all workbooks.
+        report: Monthly report merged over all successfully processed workbooks.
+        failed: Paths of workbooks whose run failed.
+    """
+    workbooks: list[WorkbookRunDict]
+    notified: list[str]
+    removed: list[str]
+    report: MonthlyReportDict
+    failed: list[str]
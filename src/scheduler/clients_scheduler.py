@@ -1,70 +1,542 @@
-from apscheduler.events import JobExecutionEvent, EVENT_JOB_EXECUTED, EVENT_JOB_ERROR  # type: ignore
+from apscheduler.events import (  # type: ignore
+    JobEvent, SchedulerEvent, EVENT_JOB_EXECUTED, EVENT_JOB_ERROR, EVENT_JOB_MISSED, EVENT_JOB_MAX_INSTANCES,
+    EVENT_SCHEDULER_SHUTDOWN
+)
 from apscheduler.schedulers.background import BackgroundScheduler  # type: ignore
-from config import create_client_service
-from datetime import datetime
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore  # type: ignore
+from apscheduler.jobstores.memory import MemoryJobStore  # type: ignore
+from apscheduler.executors.pool import ThreadPoolExecutor  # type: ignore
+from src.scheduler.watermark_store import WatermarkStore
+from src.service.factory import create_client_service
+from src.service.client_service import ClientService
+from datetime import datetime, date, time, timedelta
+from src.excel.storage.operation import Operation
+from src.model.client import ClientRecord
+from typing import Callable, Iterable
+from collections import Counter
 import logging
 
 logging.basicConfig(level=logging.INFO)
 
+NOTIFY_JOB_ID = "job_notify"
+CLEANUP_JOB_ID = "job_cleanup"
+SYNC_JOB_ID = "job_sync"
+RESCHEDULE_JOB_ID = "job_reschedule"
+LISTENER_EVENTS = EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES
 
-def job_notify_and_cleanup(days_ahead: int = 1, overdue_days: int = 3) -> None:
-    """Notify clients of upcoming payments and remove overdue clients.
+job_metrics: Counter[str] = Counter()
+"""Number of job runs per outcome: succeeded, failed, skipped (previous run still active) and missed."""
+
+active_watcher: "DueDateWatcher | None" = None
+"""Watcher the stored jobs run on. Jobs reference module functions so a persistent job store can serialize them."""
+
+
+def job_notify_and_cleanup(
+        days_ahead: int = 1,
+        overdue_days: int = 3,
+        client_service: ClientService | None = None
+) -> None:
+    """Notify clients of upcoming payments and remove overdue clients in one run.
+
+    The scheduler runs both steps as separate jobs, see `DueDateWatcher`.
 
     Args:
         days_ahead: Number of days in advance to notify clients of payments.
         overdue_days: Number of days after which clients are considered overdue and removed.
+        client_service: Service to use. A new one is created when not given.
     """
     logging.info(f"[START] Job started at {datetime.now().isoformat()}")
-    client_service = create_client_service()
+    client_service = client_service or create_client_service()
     client_service.notify_payment_due_in_days(days_ahead=days_ahead)
     remove_clients = client_service.remove_overdue_clients(overdue_days)
     logging.info(f"[DONE] Remove overdue clients {remove_clients}")
 
 
-def default_listener(event: JobExecutionEvent) -> None:
-    """Listener for APScheduler job events to log success or failure.
+def default_listener(event: JobEvent) -> None:
+    """Listener for APScheduler job events to log and count their outcome.
+
+    Runs skipped because the previous run was still active and runs missed
+    past the misfire grace time are counted in `job_metrics` as well.
 
     Args:
-        event: The JobExecutionEvent received from the scheduler.
+        event: The job event received from the scheduler.
     """
-    if event.exception:
+    if event.code == EVENT_JOB_MAX_INSTANCES:
+        job_metrics["skipped"] += 1
+        logging.warning(
+            f"[SKIPPED] Job {event.job_id} is still running, run skipped ({job_metrics['skipped']} skipped so far)")
+    elif event.code == EVENT_JOB_MISSED:
+        job_metrics["missed"] += 1
+        logging.warning(f"[MISSED] Job {event.job_id} missed its run time ({job_metrics['missed']} missed so far)")
+    elif event.exception:
+        job_metrics["failed"] += 1
         logging.error(f"[ERROR] Job {event.job_id} failed: {event.exception} ")
     else:
+        job_metrics["succeeded"] += 1
         logging.info(f"[SUCCESS] Job {event.job_id} succeeded")
 
 
-def create_scheduler(days_ahead: int = 1, overdue_days: int = 3) -> BackgroundScheduler:
-    """Create and configure a background scheduler for periodic jobs.
+def run_notify_job() -> None:
+    """Run the notify step of the active watcher."""
+    if active_watcher is None:
+        raise ValueError("No active due date watcher")
+    active_watcher.run_notify()
+
+
+def run_cleanup_job() -> None:
+    """Run the cleanup step of the active watcher."""
+    if active_watcher is None:
+        raise ValueError("No active due date watcher")
+    active_watcher.run_cleanup()
+
+
+def run_sync_job() -> None:
+    """Pick up external workbook edits for the active watcher."""
+    if active_watcher is None:
+        raise ValueError("No active due date watcher")
+    active_watcher.run_sync()
+
+
+def run_reschedule_job() -> None:
+    """Reschedule the jobs of the active watcher after client data changed."""
+    if active_watcher is None:
+        raise ValueError("No active due date watcher")
+    active_watcher.run_reschedule()
+
+
+class DueDateWatcher:
+    """Schedules the notify and cleanup jobs for the next day each of them has work to do.
+
+    The next reminder date and the next overdue threshold are read from the
+    payment date index, and a one-shot job is scheduled for each at its time of
+    day. A wake-up is never later than the next day, so changes made by other
+    processes are picked up at the daily rollover. Mutations made through the
+    shared service reschedule both jobs after `reschedule_delay` seconds, so a
+    burst of writes takes one snapshot of the index instead of one per write.
+
+    Reminders run on the "notify" thread pool and stop starting new emails after
+    `notify_timeout`. Overdue removal runs on the single-worker "cleanup" pool
+    and gives up when the workbook lock is not acquired within `cleanup_timeout`.
+
+    The last processed day of each job is kept in a `WatermarkStore`. After a
+    restart, the first notify run sends every reminder missed while the
+    scheduler was down in one pass over the payment date index. The notify
+    watermark only moves past payment dates whose reminders were all sent, so a
+    run cut short by the timeout or an error is retried after `retry_delay`.
+    """
+
+    def __init__(
+            self,
+            scheduler: BackgroundScheduler,
+            client_service: ClientService,
+            days_ahead: int = 1,
+            overdue_days: int = 3,
+            notify_at: time = time(0, 0),
+            cleanup_at: time = time(0, 0),
+            notify_timeout: float | None = 600.0,
+            cleanup_timeout: float | None = 120.0,
+            coalesce: bool = True,
+            misfire_grace_time: int | None = 3600,
+            watermarks: WatermarkStore | None = None,
+            retry_delay: float = 900.0,
+            reschedule_delay: float = 1.0,
+    ) -> None:
+        """Initialize the watcher.
+
+        Args:
+            scheduler: Scheduler the jobs are added to.
+            client_service: Shared client service whose index is watched.
+            days_ahead: Number of days in advance to notify clients.
+            overdue_days: Number of days after which clients are considered overdue.
+            notify_at: Time of day reminders are sent on a due day.
+            cleanup_at: Time of day overdue clients are removed on a due day.
+            notify_timeout: Seconds after which no further reminders are started, or None.
+            cleanup_timeout: Seconds to wait for the workbook lock before skipping cleanup, or None.
+            coalesce: Run once instead of several times when runs were missed.
+            misfire_grace_time: Seconds a late run may still start, or None to always run it.
+            watermarks: Store of the last processed day per job. An in-memory store is used when not given.
+            retry_delay: Seconds to wait before retrying a notify run that did not send every reminder.
+            reschedule_delay: Seconds after a mutation at which the jobs are rescheduled.
+        """
+        self.scheduler = scheduler
+        self.client_service = client_service
+        self.days_ahead = days_ahead
+        self.overdue_days = overdue_days
+        self.notify_at = notify_at
+        self.cleanup_at = cleanup_at
+        self.notify_timeout = notify_timeout
+        self.cleanup_timeout = cleanup_timeout
+        self.coalesce = coalesce
+        self.misfire_grace_time = misfire_grace_time
+        self.watermarks = watermarks or WatermarkStore()
+        self.retry_delay = retry_delay
+        self.reschedule_delay = reschedule_delay
+        self._notify_retry_at: datetime | None = None
+        self._reschedule_pending = False
+        client_service.client_excel_manager.add_mutation_listener(self.on_mutation)
+
+    @property
+    def last_notify(self) -> date | None:
+        """date | None: Last day whose reminders were all sent."""
+        return self.watermarks.get(NOTIFY_JOB_ID)
+
+    @last_notify.setter
+    def last_notify(self, day: date) -> None:
+        self.watermarks.set(NOTIFY_JOB_ID, day)
+
+    @property
+    def last_cleanup(self) -> date | None:
+        """date | None: Last day overdue clients were removed."""
+        return self.watermarks.get(CLEANUP_JOB_ID)
+
+    @last_cleanup.setter
+    def last_cleanup(self, day: date) -> None:
+        self.watermarks.set(CLEANUP_JOB_ID, day)
+
+    def notify_window(self, today: date) -> tuple[date, date]:
+        """Compute the payment dates today's notify run covers.
+
+        Without a watermark only payments due in `days_ahead` days are covered.
+        Otherwise the window starts after the payments reminded on the last run,
+        so days missed while the scheduler was down are caught up, but never
+        before today.
+
+        Args:
+            today: Current date.
+
+        Returns:
+            tuple[date, date]: First payment date (inclusive) and end of the window (exclusive).
+        """
+        due_before = today + timedelta(days=self.days_ahead + 1)
+        if self.last_notify is None:
+            return today + timedelta(days=self.days_ahead), due_before
+        return max(self.last_notify + timedelta(days=self.days_ahead + 1), today), due_before
+
+    def next_notify_date(self, today: date) -> date:
+        """Compute the next day on which reminders are due.
+
+        Args:
+            today: Current date.
+
+        Returns:
+            date: The next reminder day, or tomorrow when nothing is due earlier.
+        """
+        index = self.client_service.client_excel_manager.snapshot()
+        first_day = today if self.last_notify != today else today + timedelta(days=1)
+        candidates = [today + timedelta(days=1)]
+
+        reminder_payment = index.next_payment_from(self.notify_window(today)[0])
+        if reminder_payment is not None:
+            candidates.append(max(reminder_payment - timedelta(days=self.days_ahead), first_day))
+        return min(candidates)
+
+    def next_cleanup_date(self, today: date) -> date:
+        """Compute the next day on which a client becomes overdue.
+
+        Args:
+            today: Current date.
+
+        Returns:
+            date: The next overdue day, or tomorrow when nothing is due earlier.
+        """
+        index = self.client_service.client_excel_manager.snapshot()
+        first_day = today if self.last_cleanup != today else today + timedelta(days=1)
+        candidates = [today + timedelta(days=1)]
+
+        first_payment = index.first_payment()
+        if first_payment is not None:
+            candidates.append(max(first_payment + timedelta(days=self.overdue_days), first_day))
+        return min(candidates)
+
+    def notify_due(self, today: date) -> bool:
+        """Check whether any reminder is due today.
+
+        Args:
+            today: Current date.
+
+        Returns:
+            bool: True if a client pays within today's notify window.
+        """
+        due_from, due_before = self.notify_window(today)
+        next_payment = self.client_service.client_excel_manager.snapshot().next_payment_from(due_from)
+        return next_payment is not None and next_payment < due_before
+
+    def cleanup_due(self, today: date) -> bool:
+        """Check whether any client is overdue today.
+
+        Args:
+            today: Current date.
+
+        Returns:
+            bool: True if the earliest payment is at least `overdue_days` old.
+        """
+        first_payment = self.client_service.client_excel_manager.snapshot().first_payment()
+        return first_payment is not None and (today - first_payment).days >= self.overdue_days
+
+    def schedule(self) -> None:
+        """Reschedule both jobs."""
+        self.schedule_notify()
+        self.schedule_cleanup()
+
+    def schedule_notify(self) -> datetime:
+        """Replace the pending notify job with a one-shot job at the next reminder instant.
+
+        Returns:
+            datetime: Time the job will run.
+        """
+        return self._add_job(
+            NOTIFY_JOB_ID, run_notify_job, self.next_notify_date, self.notify_at, "notify", self._notify_retry_at)
+
+    def schedule_cleanup(self) -> datetime:
+        """Replace the pending cleanup job with a one-shot job at the next overdue instant.
+
+        Returns:
+            datetime: Time the job will run.
+        """
+        return self._add_job(CLEANUP_JOB_ID, run_cleanup_job, self.next_cleanup_date, self.cleanup_at, "cleanup")
+
+    def run_notify(self) -> None:
+        """Send today's reminders, including missed ones, and schedule the next notify run.
+
+        The watermark advances only up to the last payment date whose reminders
+        were all sent. When the timeout stops the run early or a reminder fails, the
+        next run starts after `retry_delay` seconds with the remaining reminders.
+        """
+        today = date.today()
+        manager = self.client_service.client_excel_manager
+        complete = True
+        try:
+            try:
+                manager.refresh(timeout=0)
+            except TimeoutError:
+                logging.info("[NOTIFY] Workbook is being written, using loaded data")
+
+            if self.last_notify != today and self.notify_due(today):
+                complete = False
+                due_from, due_before = self.notify_window(today)
+                clients = manager.snapshot().find(due_from=due_from, due_before=due_before)
+                notified = self.client_service.notify_payments_due_between(due_from, due_before, self.notify_timeout)
+                logging.info(f"[DONE] Notified clients {notified}")
+
+                covered = self._covered_through(clients, set(notified), due_before)
+                if covered >= due_from:
+                    self.last_notify = covered - timedelta(days=self.days_ahead)
+                complete = covered == due_before - timedelta(days=1)
+        finally:
+            self._notify_retry_at = None if complete else datetime.now() + timedelta(seconds=self.retry_delay)
+            self.schedule_notify()
+
+    def run_cleanup(self) -> None:
+        """Remove overdue clients if any are due and schedule the next cleanup run.
+
+        Raises:
+            TimeoutError: If the workbook lock was not acquired within `cleanup_timeout`.
+        """
+        today = date.today()
+        manager = self.client_service.client_excel_manager
+        try:
+            with manager.lock(self.cleanup_timeout):
+                manager.refresh()
+                if self.last_cleanup != today and self.cleanup_due(today):
+                    removed = self.client_service.remove_overdue_clients(self.overdue_days)
+                    self.last_cleanup = today
+                    logging.info(f"[DONE] Remove overdue clients {removed}")
+        finally:
+            self.schedule_cleanup()
+
+    def run_sync(self) -> None:
+        """Apply edits made to the workbook file by another program, e.g. by hand in Excel.
+
+        Changed clients reschedule both jobs through the mutation listener. The
+        sync is skipped while the workbook lock is held by a writer.
+        """
+        try:
+            self.client_service.client_excel_manager.sync_external_changes(timeout=0)
+        except TimeoutError:
+            logging.info("[SYNC] Workbook is being written, sync skipped")
+
+    def on_job_missed(self, event: JobEvent) -> None:
+        """Reschedule a run missed past the misfire grace time, e.g. while the host was asleep.
+
+        The watermarks are left alone, so the rescheduled run catches up on the missed work.
+
+        Args:
+            event: The missed job event.
+        """
+        if event.job_id == NOTIFY_JOB_ID:
+            self.schedule_notify()
+        elif event.job_id == CLEANUP_JOB_ID:
+            self.schedule_cleanup()
+
+    def on_shutdown(self, event: SchedulerEvent) -> None:
+        """Write changes still pending in write-behind mode when the scheduler shuts down.
+
+        Args:
+            event: The scheduler shutdown event.
+        """
+        self.client_service.client_excel_manager.close()
+
+    def run_reschedule(self) -> None:
+        """Reschedule both jobs from the clients as of now, after one or more mutations."""
+        self._reschedule_pending = False
+        self.schedule()
+
+    def on_mutation(self, operation: Operation) -> None:
+        """Queue a reschedule of the jobs after client data changed.
+
+        The writer does not wait for a snapshot of the index. One reschedule job
+        runs `reschedule_delay` seconds after the first of a burst of mutations.
+
+        Args:
+            operation: Completed mutation.
+        """
+        if self._reschedule_pending:
+            return
+        self._reschedule_pending = True
+        self.scheduler.add_job(
+            func=run_reschedule_job,
+            trigger="date",
+            run_date=datetime.now() + timedelta(seconds=self.reschedule_delay),
+            id=RESCHEDULE_JOB_ID,
+            replace_existing=True,
+        )
+
+    # -----------------------------------------------------------------------------------------------------
+    # Method auxiliary
+    # -----------------------------------------------------------------------------------------------------
+
+    def _add_job(
+            self,
+            job_id: str,
+            func: Callable[[], None],
+            next_date: Callable[[date], date],
+            run_at: time,
+            executor: str,
+            not_before: datetime | None = None
+    ) -> datetime:
+        """Replace a one-shot job, running it single-flight on the given executor.
+
+        A run due while the previous one is still active is skipped and counted by `default_listener`.
+
+        Args:
+            job_id: Job identifier.
+            func: Job function.
+            next_date: Function computing the next run day from today.
+            run_at: Time of day the job runs.
+            executor: Name of the scheduler executor.
+            not_before: Earliest time the job may run, e.g. when retrying, or None.
+
+        Returns:
+            datetime: Time the job will run.
+        """
+        now = datetime.now()
+        run_date = max(datetime.combine(next_date(now.date()), run_at), not_before or now, now)
+        self.scheduler.add_job(
+            func=func,
+            trigger="date",
+            run_date=run_date,
+            id=job_id,
+            executor=executor,
+            replace_existing=True,
+            max_instances=1,
+            coalesce=self.coalesce,
+            misfire_grace_time=self.misfire_grace_time,
+        )
+        logging.info(f"[SCHEDULED] {job_id} at {run_date.isoformat()}")
+        return run_date
+
+    @staticmethod
+    def _covered_through(clients: Iterable[ClientRecord], notified: set[str], due_before: date) -> date:
+        """Get the last payment date of a notify window whose reminders were all sent.
+
+        Args:
+            clients: Clients paying within the window.
+            notified: Emails of the clients reminded.
+            due_before: End of the window (exclusive).
+
+        Returns:
+            date: Last fully covered payment date, before the window start if none is covered.
+        """
+        missed = [client.next_payment for client in clients if client.email not in notified]
+        return (min(missed) if missed else due_before) - timedelta(days=1)
+
+
+def create_scheduler(
+        days_ahead: int = 1,
+        overdue_days: int = 3,
+        notify_at: time = time(0, 0),
+        cleanup_at: time = time(0, 0),
+        notify_timeout: float | None = 600.0,
+        cleanup_timeout: float | None = 120.0,
+        coalesce: bool = True,
+        misfire_grace_time: int | None = 3600,
+        notify_workers: int = 4,
+        jobstore_url: str | None = None,
+        sync_interval: float | None = 5.0,
+) -> BackgroundScheduler:
+    """Create a background scheduler running the notify and cleanup jobs on actual due dates.
+
+    Both jobs share one client service. Reminders run on a thread pool and
+    overdue removal on a single-worker pool, so neither blocks the other. With a
+    job store URL, jobs and watermarks are kept in that database, so reminders
+    missed while the process was down are sent on restart. The workbook file is
+    polled every `sync_interval` seconds for edits made outside this process.
 
     Args:
         days_ahead: Number of days in advance to notify clients.
         overdue_days: Number of days after which clients are considered overdue.
+        notify_at: Time of day reminders are sent on a due day.
+        cleanup_at: Time of day overdue clients are removed on a due day.
+        notify_timeout: Seconds after which no further reminders are started, or None.
+        cleanup_timeout: Seconds to wait for the workbook lock before skipping cleanup, or None.
+        coalesce: Run once instead of several times when runs were missed.
+        misfire_grace_time: Seconds a late run may still start, or None to always run it.
+        notify_workers: Threads of the executor running network-bound jobs.
+        jobstore_url: SQLAlchemy database URL for jobs and watermarks, or None to keep them in memory.
+        sync_interval: Seconds between checks for external workbook edits, or None to disable them.
 
     Returns:
         BackgroundScheduler: Configured APScheduler background scheduler instance.
     """
-    scheduler = BackgroundScheduler()
-    scheduler.add_listener(default_listener, EVENT_JOB_EXECUTED | EVENT_JOB_ERROR)
-
-    # Uncomment this block for cron-style scheduling
-    # scheduler.add_job(
-    #     func=job_notify_and_cleanup,
-    #     kwargs={"days_ahead": days_ahead, "overdue_days": overdue_days},
-    #     trigger="cron",
-    #     hour=1,
-    #     minute=0,
-    #     id="job_notify_and_cleanup",
-    #     replace_existing=True,
-    # )
-
-    # Interval-based scheduling for testing
-    scheduler.add_job(
-        func=job_notify_and_cleanup,
-        kwargs={"days_ahead": days_ahead, "overdue_days": overdue_days},
-        trigger="interval",
-        seconds=30,
-        id="job_notify_and_cleanup",
-        replace_existing=True,
+    global active_watcher
+
+    scheduler = BackgroundScheduler(
+        jobstores={"default": SQLAlchemyJobStore(url=jobstore_url) if jobstore_url else MemoryJobStore()},
+        executors={
+            "default": ThreadPoolExecutor(),
+            "notify": ThreadPoolExecutor(notify_workers),
+            "cleanup": ThreadPoolExecutor(1),
+        },
+        job_defaults={"max_instances": 1, "coalesce": coalesce, "misfire_grace_time": misfire_grace_time},
+    )
+    scheduler.add_listener(default_listener, LISTENER_EVENTS)
+
+    watcher = DueDateWatcher(
+        scheduler,
+        create_client_service(),
+        days_ahead,
+        overdue_days,
+        notify_at,
+        cleanup_at,
+        notify_timeout,
+        cleanup_timeout,
+        coalesce,
+        misfire_grace_time,
+        WatermarkStore(jobstore_url),
     )
+    active_watcher = watcher
+    scheduler.add_listener(watcher.on_job_missed, EVENT_JOB_MISSED)
+    scheduler.add_listener(watcher.on_shutdown, EVENT_SCHEDULER_SHUTDOWN)
+    watcher.schedule()
+
+    if sync_interval is not None:
+        scheduler.add_job(
+            func=run_sync_job,
+            trigger="interval",
+            seconds=sync_interval,
+            id=SYNC_JOB_ID,
+            executor="cleanup",
+            replace_existing=True,
+        )
 
     return scheduler
@@ -0,0 +1,67 @@
+from sqlalchemy import MetaData, Table, Column, String, Date, create_engine, select, update, insert
+from datetime import date
+import threading
+
+metadata = MetaData()
+
+watermarks = Table(
+    "scheduler_watermarks",
+    metadata,
+    Column("job_id", String(64), primary_key=True),
+    Column("last_run", Date, nullable=False),
+)
+
+
+class WatermarkStore:
+    """Last processed day per scheduler job.
+
+    With a database URL the watermarks are stored in the `scheduler_watermarks`
+    table, so a restarted scheduler knows which days it missed. Without one
+    they are kept in memory only.
+    """
+
+    def __init__(self, url: str | None = None) -> None:
+        """Initialize the store.
+
+        Args:
+            url: SQLAlchemy database URL, e.g. "sqlite:///scheduler.sqlite", or None to keep watermarks in memory.
+        """
+        self.url = url
+        self._lock = threading.Lock()
+        self._cache: dict[str, date] = {}
+        self._engine = create_engine(url) if url else None
+
+        if self._engine is not None:
+            metadata.create_all(self._engine)
+            with self._engine.connect() as connection:
+                for job_id, last_run in connection.execute(select(watermarks.c.job_id, watermarks.c.last_run)):
+                    self._cache[job_id] = last_run
+
+    def get(self, job_id: str) -> date | None:
+        """Get the last day a job processed.
+
+        Args:
+            job_id: Job identifier.
+
+        Returns:
+            date | None: Last processed day or None if the job never ran.
+        """
+        return self._cache.get(job_id)
+
+    def set(self, job_id: str, day: date) -> None:
+        """Record the last day a job processed.
+
+        Args:
+            job_id: Job identifier.
+            day: Processed day.
+        """
+        with self._lock:
+            self._cache[job_id] = day
+            if self._engine is None:
+                return
+
+            with self._engine.begin() as connection:
+                result = connection.execute(
+                    update(watermarks).where(watermarks.c.job_id == job_id).values(last_run=day))
+                if result.rowcount == 0:
+                    connection.execute(insert(watermarks).values(job_id=job_id, last_run=day))
@@ -1,10 +1,17 @@
+from src.excel.manager.sharded_manager import ShardedClientManager
+from src.excel.manager.archive_manager import ClientArchiveManager
 from src.excel.manager.client_manager import ClientExcelManager
+from src.excel.index.client_index import ClientQuery
 from src.model.report import MonthlyReportDict
 from src.service.invoice_service import InvoiceService
 from src.service.email_service import EmailService
-from datetime import datetime, timedelta
-from src.model.client import Client
+from datetime import datetime, date, timedelta
+from src.model.client import Client, ClientRecord, ClientPatch
 from collections import defaultdict
+from typing import Unpack, Iterable
+from itertools import chain
+import logging
+import time
 
 
 class ClientService:
@@ -17,20 +24,24 @@ class ClientService:
 
     def __init__(
         self,
-        client_excel_manager: ClientExcelManager,
+        client_excel_manager: ClientExcelManager | ShardedClientManager,
         email_service: EmailService,
-        invoice_service: InvoiceService
+        invoice_service: InvoiceService,
+        archive: ClientArchiveManager | None = None
     ) -> None:
         """Initialize the ClientService with dependencies.
 
         Args:
-            client_excel_manager: Instance of ClientExcelManager for Excel operations.
+            client_excel_manager: Instance of ClientExcelManager for Excel operations, or a
+                ShardedClientManager routing them to one workbook per company or payment year.
             email_service: Instance of EmailService for sending emails.
             invoice_service: Instance of InvoiceService for invoice generation.
+            archive: Archive receiving removed clients, or None to delete them permanently.
         """
         self.client_excel_manager = client_excel_manager
         self.email_service = email_service
         self.invoice_service = invoice_service
+        self.archive = archive
 
     def add_client(self, client: Client) -> None:
         """Add a new client to the Excel sheet.
@@ -48,19 +59,19 @@ class ClientService:
         for c in clients:
 
             self.email_service.send_email(
-                recipient_email=c["email"],
+                recipient_email=c.email,
                 subject=f"New insurance policy",
                 html=f"""
                                 <html>
                                     <body>
-                                        <p>Hello {c["name"]} <p>Thank you for buying a new insurance policy for
-                                         your car {c["car_model"]} it will be valid until 
-                                         <b>{c["next_payment"]}</b>.</p>
+                                        <p>Hello {c.name} <p>Thank you for buying a new insurance policy for
+                                         your car {c.car_model} it will be valid until 
+                                         <b>{c.next_payment}</b>.</p>
                                     </body>
                                 </html>
                                 """
             )
-            print(f"Email with reminder send to {c['email']}")
+            print(f"Email with reminder send to {c.email}")
 
 
     def update_client(self, email: str, update_client: Client) -> None:
@@ -79,6 +90,23 @@ class ClientService:
         if not self.client_excel_manager.update_client_row(2, email, update_client.to_dict()):
             raise ValueError(f"Client with email {email} not found")
 
+    def patch_client(self, email: str, /, **fields: Unpack[ClientPatch]) -> None:
+        """Change selected fields of an existing client, writing only the changed cells.
+
+        Args:
+            email: Current email of the client to update.
+            **fields: Client fields to change.
+
+        Raises:
+            ValueError: If the new email already exists or client not found.
+        """
+        new_email = fields.get("email", email)
+        if new_email != email and self.check_if_client_exists(new_email):
+            raise ValueError(f"Client with email {new_email} already exists")
+
+        if not self.client_excel_manager.patch_client_row(2, email, fields):
+            raise ValueError(f"Client with email {email} not found")
+
     def confirm_payment(self, email: str, days: int = 360) -> None:
         """Confirm payment by shifting the next payment date.
 
@@ -92,8 +120,22 @@ class ClientService:
         if not self.client_excel_manager.shift_payment_date(2, email, 7, days):
             raise ValueError(f"Client with email {email} not found")
 
+    def confirm_payments(self, emails: Iterable[str], days: int = 360) -> list[str]:
+        """Confirm payments for many clients at once, saving the workbook a single time.
+
+        Args:
+            emails: Emails of the clients who paid.
+            days: Number of days to shift the payment dates.
+
+        Returns:
+            List of emails that were not found.
+        """
+        requested = list(dict.fromkeys(emails))
+        shifted = self.client_excel_manager.shift_payment_dates(2, set(requested), 7, days)
+        return [email for email in requested if email not in shifted]
+
     def remove_client(self, email: str) -> None:
-        """Remove a client from the Excel sheet.
+        """Remove a client from the Excel sheet, buffering it for the archive.
 
         Args:
             email: Email of the client to remove.
@@ -101,9 +143,13 @@ class ClientService:
         Raises:
             ValueError: If the client is not found.
         """
+        client = self.client_excel_manager.get_client(email)
         if not self.client_excel_manager.remove_client_row(2, email):
             raise ValueError(f"Client with email {email} not found")
 
+        if self.archive is not None and client is not None:
+            self.archive.add([client], "removed")
+
     def check_if_client_exists(self, email: str) -> bool:
         """Check if a client exists based on email.
 
@@ -113,54 +159,107 @@ class ClientService:
         Returns:
             True if the client exists, False otherwise.
         """
-        clients = self.client_excel_manager.load_client_row()
-        return any(c["email"] == email for c in clients)
+        return self.client_excel_manager.get_client(email) is not None
+
+    def find_clients(self, **query: Unpack[ClientQuery]) -> list[ClientRecord]:
+        """Find clients by company, car year, price or payment date.
 
-    def notify_payment_due_in_days(self, days_ahead: int = 1) -> None:
+        Args:
+            **query: Filters such as company, car_year_between, price_gte, price_lte,
+                due_from and due_before.
+
+        Returns:
+            List of matching clients.
+        """
+        return self.client_excel_manager.snapshot().find(**query)
+
+    def notify_payment_due_in_days(self, days_ahead: int = 1, timeout: float | None = None) -> list[str]:
         """Send payment reminder emails to clients whose payment is due.
 
         Args:
             days_ahead: Number of days ahead to notify clients.
+            timeout: Seconds the whole notification may take, or None for no limit.
+
+        Returns:
+            List of emails of notified clients.
         """
         target_days = (datetime.today() + timedelta(days=days_ahead)).date()
-        clients = self.client_excel_manager.load_client_row()
+        return self.notify_payments_due_between(target_days, target_days + timedelta(days=1), timeout)
 
-        for client in clients:
-            try:
-                payment_date_str = client["next_payment"].split()[0]
-                payment_date = datetime.strptime(payment_date_str, "%Y-%m-%d").date()
-            except Exception:
+    def notify_payments_due_between(self, due_from: date, due_before: date, timeout: float | None = None) -> list[str]:
+        """Send payment reminder emails to clients whose payment falls in a date window.
+
+        Clients are looked up through the payment date index, so a window covering
+        days missed while the scheduler was down is processed in one pass. Reminders
+        are sent in payment date order. When a timeout is given, no further reminders
+        are started once it has elapsed, so only the latest payment dates are left out.
+        A client whose invoice or email fails is skipped and left out of the result,
+        so the caller retries only the reminders that were not sent.
+
+        Args:
+            due_from: First payment date to remind about (inclusive).
+            due_before: Payment date up to which to remind (exclusive).
+            timeout: Seconds the whole notification may take, or None for no limit.
+
+        Returns:
+            List of emails of clients whose reminder was sent.
+        """
+        clients = sorted(
+            self.client_excel_manager.snapshot().find(due_from=due_from, due_before=due_before),
+            key=lambda client: client.next_payment)
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        notified: list[str] = []
+        for position, client in enumerate(clients):
+            payment_date = client.next_payment
+            if deadline is not None and time.monotonic() >= deadline:
+                logging.warning(f"[TIMEOUT] Reminders stopped, {len(clients) - position} clients not notified")
+                break
+
+            if not due_from <= payment_date < due_before:
                 continue
 
-            if payment_date == target_days:
+            try:
                 invoice_url = self.invoice_service.create_invoice({
-                        "client_name": client["name"],
-                        "client_email": client["email"],
+                        "client_name": client.name,
+                        "client_email": client.email,
                         "client_tax_no": "123-456-78-90",
-                        "item_name": f"Polisa ubezpieczeniowa za auto marki {client['car_model']}",
+                        "item_name": f"Polisa ubezpieczeniowa za auto marki {client.car_model}",
                         "item_quantity": 1,
-                        "item_price": client["price"],
+                        "item_price": client.price,
                     })
-                self.email_service.send_email(
-                    recipient_email=client["email"],
+                sent = self.email_service.send_email(
+                    recipient_email=client.email,
                     subject=f"Payment for insurance policy",
                     html=f"""
                     <html>
                         <body>
-                            <p>Hello {client['name']},</p>
+                            <p>Hello {client.name},</p>
                             <p>We would like to remind you that the payment deadline for your insurance policy for the
-                            {client["car_model"]} is on <b>{payment_date}</b>.</p>
+                            {client.car_model} is on <b>{payment_date}</b>.</p>
                             <p>Please make sure to complete the payment on time.</p>
                             <p>Your invoice <a href={invoice_url}>Link</a></p>
                         </body>
                     </html>
                     """
                 )
-                print(f"Email with reminder send to {client['email']} date: {payment_date}")
+            except Exception as e:
+                logging.error(f"[NOTIFY] Reminder for {client.email} failed: {e}")
+                continue
+
+            if not sent:
+                logging.error(f"[NOTIFY] Reminder for {client.email} was not sent")
+                continue
+            print(f"Email with reminder send to {client.email} date: {payment_date}")
+            notified.append(client.email)
+
+        return notified
 
     def remove_overdue_clients(self, overdue_days: int = 3) -> list[str]:
         """Remove clients whose payment is overdue by a given number of days.
 
+        Rows that cannot be parsed are kept in the sheet.
+
         Args:
             overdue_days: Number of days after which clients are considered overdue.
 
@@ -168,49 +267,55 @@ class ClientService:
             List of emails of removed clients.
         """
         today = datetime.today().date()
-        all_clients = self.client_excel_manager.load_client_row()
+        overdue = self.client_excel_manager.snapshot().find(due_before=today - timedelta(days=overdue_days - 1))
 
-        remaining_clients = []
-        removed_clients = []
-        for client in all_clients:
-            try:
-                payment_date_str = client["next_payment"].split()[0]
-                payment_date = datetime.strptime(payment_date_str, "%Y-%m-%d").date()
-            except Exception:
-                remaining_clients.append(client)
-                continue
+        return self._archive_and_remove(overdue, "overdue")
 
-            if (today - payment_date).days < overdue_days:
-                remaining_clients.append(client)
-            else:
-                removed_clients.append(client["email"])
+    def archive_stale_clients(self, stale_days: int = 365) -> list[str]:
+        """Move clients whose payment is long past out of the live workbook into the archive.
 
-        self.client_excel_manager.overwrite_clients(remaining_clients)
-        return removed_clients
+        Args:
+            stale_days: Number of days after the payment date after which a client is stale.
+
+        Returns:
+            List of emails of archived clients.
+
+        Raises:
+            ValueError: If no archive is configured.
+        """
+        if self.archive is None:
+            raise ValueError("No client archive configured")
+
+        today = datetime.today().date()
+        stale = self.client_excel_manager.snapshot().find(due_before=today - timedelta(days=stale_days))
+        return self._archive_and_remove(stale, "stale")
 
-    def generate_monthly_report(self) -> MonthlyReportDict:
+    def generate_monthly_report(self, include_archive: bool = False) -> MonthlyReportDict:
         """Generate a report summarizing client activity for the current month.
 
+        Args:
+            include_archive: Also count archived clients, streamed from the archive workbook.
+
         Returns:
             MonthlyReportDict: Dictionary containing month, company counts, gross and net totals.
         """
-        clients = self.client_excel_manager.load_client_row()
+        clients: Iterable[ClientRecord] = self.client_excel_manager.snapshot().clients
+        if include_archive and self.archive is not None:
+            clients = chain(clients, (archived.client for archived in self.archive.iter_clients()))
         current_month = datetime.today().strftime("%Y-%m")
         ratio = self.client_excel_manager.ratio
 
         company_count: dict[str, int] = defaultdict(int)
         gross_total = 0
 
+        today = datetime.today().date()
+
         for client in clients:
-            try:
-                payment_date_str = client["next_payment"].split()[0]
-                payment_date = datetime.strptime(payment_date_str, "%Y-%m-%d").date()
-            except Exception:
-                continue
+            payment_date = client.next_payment
 
-            if payment_date.strftime("%Y-%m") == current_month:
-                course = client["insurance_company"]
-                price = client["price"]
+            if (payment_date.year, payment_date.month) == (today.year, today.month):
+                course = client.insurance_company
+                price = client.price
                 company_count[course] += 1
                 gross_total += price
 
@@ -222,3 +327,29 @@ class ClientService:
             "gross_total": gross_total,
             "net_total": net_total
         }
+
+    # -----------------------------------------------------------------------------------------------------
+    # Method auxiliary
+    # -----------------------------------------------------------------------------------------------------
+
+    def _archive_and_remove(self, clients: list[ClientRecord], reason: str) -> list[str]:
+        """Archive clients as one batch and then remove them from the live workbook.
+
+        The archive is written first, so a failed removal leaves a client in both
+        files rather than in neither.
+
+        Args:
+            clients: Clients to remove.
+            reason: Why the clients are archived.
+
+        Returns:
+            List of emails of removed clients.
+        """
+        emails = {client.email for client in clients}
+        if not emails:
+            return []
+
+        if self.archive is not None:
+            self.archive.add(clients, reason)
+            self.archive.flush()
+        return self.client_excel_manager.remove_client_rows(2, emails)
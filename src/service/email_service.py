@@ -1,5 +1,6 @@
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+import logging
 import smtplib
 import ssl
 
@@ -32,16 +33,19 @@ class EmailService:
         recipient_email: str,
         subject: str,
         html: str | None = None,
-    ) -> None:
+    ) -> bool:
         """Send an email to a recipient with optional HTML content.
 
+        A failure is logged instead of raised, so callers sending many emails
+        can go on with the next one and report which were not sent.
+
         Args:
             recipient_email: Recipient's email address.
             subject: Subject line of the email.
             html: Optional HTML content of the email.
 
-        Raises:
-            Exception: If sending the email fails.
+        Returns:
+            bool: True if the email was sent, False if sending it failed.
         """
         message = MIMEMultipart("alternative")
         message["From"] = self.sender_email
@@ -59,5 +63,7 @@ class EmailService:
                 server.login(self.sender_email, self.sender_password)
                 server.sendmail(self.sender_email, recipient_email, message.as_string())
             print("Email sent successfully")
+            return True
         except Exception as e:
-            print(f"Failed to send email: {e}")
+            logging.error(f"Failed to send email to {recipient_email}: {e}")
+            return False
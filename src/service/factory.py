@@ -0,0 +1,130 @@
+from src.excel.manager.sharded_manager import ShardedClientManager
+from src.excel.manager.archive_manager import ClientArchiveManager
+from src.excel.manager.client_manager import ClientExcelManager
+from src.excel.storage.shard_manifest import ShardKey
+from openpyxl.styles import Font, Alignment, PatternFill
+from src.service.invoice_service import InvoiceService
+from src.service.client_service import ClientService
+from src.service.email_service import EmailService
+from src.excel.type.style_type import CellStyle
+from dotenv import load_dotenv
+import atexit
+import os
+
+load_dotenv()
+
+# -----------------------------------------------------------------------------------------------------
+# Default styles for Excel tables
+# -----------------------------------------------------------------------------------------------------
+
+header_style: CellStyle = {
+    "font": Font(bold=True, color="000000"),
+    "fill": PatternFill(start_color="4CAF50", end_color="4CAF50", fill_type="solid"),
+    "alignment": Alignment(horizontal="left", vertical="center"),
+    "border_sides": {
+        "top": {"style": "medium", "color": "000000"},
+        "bottom": {"style": "medium", "color": "000000"},
+        "left": {"style": "medium", "color": "000000"},
+        "right": {"style": "medium", "color": "000000"},
+    }
+}
+
+row_style: CellStyle = {
+    "font": Font(name="Calibri", size=11, color="000000"),
+    "fill": PatternFill(start_color="D9EAD3", end_color="D9EAD3", fill_type="solid"),
+    "alignment": Alignment(horizontal="left", vertical="center"),
+    "border_sides": {
+        "top": {"style": "thin", "color": "000000"},
+        "bottom": {"style": "thin", "color": "000000"},
+        "left": {"style": "thin", "color": "000000"},
+        "right": {"style": "thin", "color": "000000"},
+    }
+}
+
+overdue_style: CellStyle = {
+    "fill": PatternFill(start_color="FFCCCC", end_color="FFCCCC", fill_type="solid"),
+    "font": Font(color="000000")
+}
+
+# -----------------------------------------------------------------------------------------------------
+# Factories reading the environment variables when called
+# -----------------------------------------------------------------------------------------------------
+
+write_behind_interval = float(os.getenv("WRITE_BEHIND_INTERVAL", "0")) or None
+journal_enabled = os.getenv("JOURNAL_ENABLED", "0").lower() in ("1", "true", "yes")
+
+
+def create_client_excel_manager(filepath: str = "Clients.xlsx") -> ClientExcelManager:
+    """Factory function to create a ClientExcelManager with the default styles.
+
+    Args:
+        filepath: Path of the client workbook.
+
+    Returns:
+        ClientExcelManager: Configured client Excel manager.
+    """
+    return ClientExcelManager(
+        filepath=filepath,
+        sheet_name="Clients",
+        main_table_headers=["NAME", "EMAIL", "INSURANCE_COMPANY", "CAR_MODEL", "CAR_YEAR", "PRICE", "NEXT_PAYMENT"],
+        header_style=header_style,
+        row_style=row_style,
+        overdue_style=overdue_style,
+        main_table_start_col="A",
+        company_table_start_col="I",
+        journal=journal_enabled,
+        write_behind_interval=write_behind_interval,
+    )
+
+
+def create_email_service() -> EmailService:
+    """Factory function to create an EmailService from the SMTP environment variables.
+
+    Returns:
+        EmailService: Configured email service.
+    """
+    smtp_server = os.getenv("SMTP_SERVER")
+    port = int(os.getenv("SMTP_PORT"))
+    sender_email = os.getenv("SENDER_EMAIL")
+    sender_password = os.getenv("SENDER_PASSWORD")
+    return EmailService(smtp_server, port, sender_email, sender_password)
+
+
+def create_invoice_service() -> InvoiceService:
+    """Factory function to create an InvoiceService from the invoice environment variables.
+
+    Returns:
+        InvoiceService: Configured invoice service.
+    """
+    return InvoiceService(
+        api_token=os.getenv("INVOICE_API_TOKEN"),
+        domain=os.getenv("INVOICE_DOMAIN"),
+    )
+
+
+def create_client_service(filepath: str = "Clients.xlsx", shard_by: ShardKey | None = None) -> ClientService:
+    """Factory function to create and return a fully configured ClientService instance.
+
+    This function initializes the ClientExcelManager, EmailService, and InvoiceService
+    with default styles and environment variable credentials, and returns a ClientService.
+
+    Removed clients are archived to `<name>.archive.xlsx` next to the workbook,
+    or `archive.xlsx` in the shard directory. Buffered archive rows are written on exit.
+
+    Args:
+        filepath: Path of the client workbook, or of the shard directory when `shard_by` is given.
+        shard_by: Keep one workbook per "company" or per payment "year" in the `filepath` directory.
+
+    Returns:
+        ClientService: Configured client service instance.
+    """
+    client_excel_manager: ClientExcelManager | ShardedClientManager
+    if shard_by is None:
+        client_excel_manager = create_client_excel_manager(filepath)
+        archive = ClientArchiveManager(f"{os.path.splitext(filepath)[0]}.archive.xlsx")
+    else:
+        client_excel_manager = ShardedClientManager(filepath, create_client_excel_manager, shard_by)
+        archive = ClientArchiveManager(os.path.join(filepath, "archive.xlsx"))
+    atexit.register(archive.flush)
+
+    return ClientService(client_excel_manager, create_email_service(), create_invoice_service(), archive)
@@ -0,0 +1,155 @@
+from src.model.report import MonthlyReportDict, WorkbookRunDict, MultiWorkbookRunDict
+from src.service.factory import create_client_service
+from concurrent.futures import ProcessPoolExecutor
+from collections.abc import Iterable
+from collections import defaultdict
+from openpyxl import load_workbook
+from datetime import datetime
+from pathlib import Path
+import logging
+import re
+
+BACKUP_NAME = re.compile(r"\.bak\d+\.xlsx$")
+
+
+def find_workbooks(source: str | Path | Iterable[str | Path], sheet_name: str = "Clients") -> list[Path]:
+    """Resolve the workbooks to process.
+
+    Args:
+        source: Directory containing `.xlsx` workbooks, or paths of workbooks.
+        sheet_name: Worksheet a client workbook contains.
+
+    Returns:
+        list[Path]: Workbook paths. A directory is listed in name order, skipping Excel's `~$` lock files,
+            rolling backups, client archives and workbooks without the client sheet. Files that cannot be
+            opened are kept, so the run reports them as failed.
+
+    Raises:
+        ValueError: If a directory is given that does not exist.
+    """
+    if isinstance(source, (str, Path)):
+        directory = Path(source)
+        if not directory.is_dir():
+            raise ValueError(f"Workbook directory {directory} does not exist")
+        return sorted(path for path in directory.glob("*.xlsx") if is_client_workbook(path, sheet_name))
+    return [Path(path) for path in source]
+
+
+def is_client_workbook(path: Path, sheet_name: str = "Clients") -> bool:
+    """Check whether a file found in a workbook directory holds clients.
+
+    Args:
+        path: Path of an `.xlsx` file.
+        sheet_name: Worksheet a client workbook contains.
+
+    Returns:
+        bool: False for Excel lock files, backups, archives and workbooks without the client sheet.
+    """
+    name = path.name
+    if name.startswith("~$") or BACKUP_NAME.search(name) or name == "archive.xlsx" or name.endswith(".archive.xlsx"):
+        return False
+
+    try:
+        workbook = load_workbook(path, read_only=True)
+    except Exception:
+        return True
+    try:
+        return sheet_name in workbook.sheetnames
+    finally:
+        workbook.close()
+
+
+def run_workbook(filepath: str, days_ahead: int = 1, overdue_days: int = 3) -> WorkbookRunDict:
+    """Run the nightly steps on one workbook.
+
+    Sends reminders, removes overdue clients and generates the monthly report.
+    Runs in a worker process, so it builds its own client service.
+
+    Args:
+        filepath: Path of the workbook.
+        days_ahead: Number of days in advance to notify clients.
+        overdue_days: Number of days after which clients are considered overdue.
+
+    Returns:
+        WorkbookRunDict: Result of the workbook run.
+    """
+    client_service = create_client_service(filepath)
+    try:
+        notified = client_service.notify_payment_due_in_days(days_ahead)
+        removed = client_service.remove_overdue_clients(overdue_days)
+        report = client_service.generate_monthly_report()
+    finally:
+        client_service.client_excel_manager.close()
+    return {"filepath": filepath, "notified": notified, "removed": removed, "report": report, "error": None}
+
+
+def merge_reports(reports: Iterable[MonthlyReportDict]) -> MonthlyReportDict:
+    """Merge monthly reports of several workbooks.
+
+    Company counts and totals are summed. Net totals are summed as reported,
+    since each workbook applies its own net ratio.
+
+    Args:
+        reports: Reports to merge.
+
+    Returns:
+        MonthlyReportDict: Merged report for the current month.
+    """
+    company_count: dict[str, int] = defaultdict(int)
+    gross_total = 0
+    net_total = 0
+
+    for report in reports:
+        for company, count in report["company"].items():
+            company_count[company] += count
+        gross_total += report["gross_total"]
+        net_total += report["net_total"]
+
+    return {
+        "month": datetime.today().strftime("%Y-%m"),
+        "company": dict(company_count),
+        "gross_total": gross_total,
+        "net_total": net_total
+    }
+
+
+def run_workbooks(
+        source: str | Path | Iterable[str | Path],
+        days_ahead: int = 1,
+        overdue_days: int = 3,
+        max_workers: int | None = None
+) -> MultiWorkbookRunDict:
+    """Run the nightly steps on several workbooks in parallel worker processes.
+
+    Parsing a workbook is CPU-bound, so each workbook is processed in its own
+    process. A failing workbook is logged and reported in `failed` without
+    stopping the others.
+
+    Args:
+        source: Directory containing `.xlsx` workbooks, or paths of workbooks.
+        days_ahead: Number of days in advance to notify clients.
+        overdue_days: Number of days after which clients are considered overdue.
+        max_workers: Number of worker processes, or None for one per CPU.
+
+    Returns:
+        MultiWorkbookRunDict: Per-workbook results and the merged totals.
+    """
+    workbooks = [str(path) for path in find_workbooks(source)]
+    results: list[WorkbookRunDict] = []
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(run_workbook, path, days_ahead, overdue_days) for path in workbooks]
+        for path, future in zip(workbooks, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                logging.error(f"[ERROR] Workbook {path} failed: {e}")
+                results.append({"filepath": path, "notified": [], "removed": [], "report": None, "error": str(e)})
+
+    return {
+        "workbooks": results,
+        "notified": [email for result in results for email in result["notified"]],
+        "removed": [email for result in results for email in result["removed"]],
+        "report": merge_reports(result["report"] for result in results if result["report"] is not None),
+        "failed": [result["filepath"] for result in results if result["error"] is not None],
+    }
@@ -1,9 +1,16 @@
 from openpyxl.styles import Font, PatternFill, Alignment, Border
-from src.excel.type.style_type import CellStyle, apply_style
+from src.excel.type.style_type import CellStyle, apply_style, to_differential_style
 from src.excel.manager.base_manager import ExcelManager
+from src.excel.storage.operation import Operation
+from src.excel.storage.file_lock import FileLock
+from src.model.client import ClientRecord, InvalidClientRow
+from src.excel.storage.snapshot import ClientSnapshot
+from src.excel.storage.journal import Journal
 from unittest.mock import patch
+from datetime import date
 from pathlib import Path
 import pytest
+import os
 
 
 def fill_style() -> CellStyle:
@@ -34,6 +41,75 @@ def test_save(tmp_path: Path) -> None:
 
     assert tmp_file.exists()
 
+def test_save_is_atomic_when_write_fails(tmp_path: Path) -> None:
+    tmp_file = tmp_path / "test.xlsx"
+    manager = ExcelManager(str(tmp_file))
+    manager.add_row("Clients", data={"A": "kept"})
+    manager.save()
+
+    manager.add_row("Clients", data={"A": "lost"})
+    with patch.object(manager, "_write_workbook", side_effect=RuntimeError("killed")):
+        with pytest.raises(RuntimeError):
+            manager.save()
+
+    assert [p.name for p in tmp_path.iterdir() if p.suffix != ".lock"] == ["test.xlsx"]
+    assert ExcelManager(str(tmp_file)).get_sheet()["A1"].value == "kept"
+
+def test_save_rotates_backups(tmp_path: Path) -> None:
+    tmp_file = tmp_path / "test.xlsx"
+    manager = ExcelManager(str(tmp_file), backup_count=2)
+    for value in ("v1", "v2", "v3", "v4"):
+        manager.add_row("Clients", data={"A": value})
+        manager.save()
+
+    assert sorted(p.name for p in tmp_path.iterdir() if p.suffix != ".lock") == [
+        "test.bak1.xlsx", "test.bak2.xlsx", "test.xlsx"]
+    assert ExcelManager(str(tmp_path / "test.bak1.xlsx")).get_sheet()["A1"].value == "v3"
+    assert ExcelManager(str(tmp_path / "test.bak2.xlsx")).get_sheet()["A1"].value == "v2"
+
+def test_file_lock_is_exclusive_and_reentrant(tmp_path: Path) -> None:
+    lock_path = str(tmp_path / "test.xlsx.lock")
+    lock = FileLock(lock_path)
+    other = FileLock(lock_path, timeout=0.1)
+
+    with lock:
+        with lock:
+            assert lock.is_locked
+        with pytest.raises(TimeoutError):
+            other.acquire()
+
+    assert not lock.is_locked
+    with other:
+        assert other.is_locked
+
+def test_save_replays_pending_operations_on_conflict(tmp_path: Path) -> None:
+    tmp_file = tmp_path / "test.xlsx"
+    first = ExcelManager(str(tmp_file))
+    first.save()
+    second = ExcelManager(str(tmp_file))
+
+    first.add_row("Clients", data={"A": "first"})
+    first.save()
+
+    operation = Operation("add_row", ("Clients", {"B": "second"}, 1, "B"))
+    second._pending_ops.append(operation)
+    second.add_row(*operation.args)
+    second.save()
+
+    ws = ExcelManager(str(tmp_file)).get_sheet()
+    assert ws["A1"].value == "first"
+    assert ws["B1"].value == "second"
+
+def test_save_with_compression_level(tmp_path: Path) -> None:
+    tmp_file = tmp_path / "test.xlsx"
+    manager = ExcelManager(str(tmp_file), compression_level=1)
+    manager.add_row("Clients", data={"A": "Hello"})
+    manager.save()
+
+    assert ExcelManager(str(tmp_file)).get_sheet()["A1"].value == "Hello"
+    with pytest.raises(ValueError, match="Compression level"):
+        ExcelManager(str(tmp_path / "other.xlsx"), compression_level=10)
+
 def test_add_row(example_base_manager: ExcelManager) -> None:
     sheet_name = "test"
     example_base_manager.add_row(sheet_name, data={"A": 1})
@@ -87,6 +163,8 @@ def test_style_table_area(example_base_manager: ExcelManager) -> None:
     assert cell_b.value == "Email"
     assert sheet["A1"].alignment.horizontal == "center"
     assert sheet["A2"].font.bold == True
+    assert sheet["B2"].font.bold == True
+    assert sheet["C2"].font.bold != True
 
 def test_set_column_format(example_base_manager: ExcelManager) -> None:
     sheet_name = "test"
@@ -95,7 +173,18 @@ def test_set_column_format(example_base_manager: ExcelManager) -> None:
     example_base_manager.set_column_format("A", "0.00", sheet_name=sheet_name)
 
     assert sheet["A1"].number_format == "0.00"
+    assert sheet.column_dimensions["A"].number_format == "0.00"
+
+def test_set_column_format_range_keeps_column_dimension(example_base_manager: ExcelManager) -> None:
+    sheet_name = "test"
+    example_base_manager.add_row(sheet_name, data={"A": 1}, row_idx=1)
+    example_base_manager.add_row(sheet_name, data={"A": 2}, row_idx=2)
+    sheet = example_base_manager.get_sheet(sheet_name)
+    example_base_manager.set_column_format("A", "0.00", 2, 2, sheet_name=sheet_name)
 
+    assert sheet["A1"].number_format == "General"
+    assert sheet["A2"].number_format == "0.00"
+    assert sheet.column_dimensions["A"].number_format == "General"
 
 def test_get_last_row_in_col_is_empty(example_base_manager: ExcelManager) -> None:
     sheet_name = "test"
@@ -109,6 +198,22 @@ def test_get_last_row_in_col_is_empty(example_base_manager: ExcelManager) -> Non
     assert last_row_empty == 1
 
 
+def test_get_last_row_in_col_cache_follows_writes_and_deletes(example_base_manager: ExcelManager) -> None:
+    sheet_name = "test"
+    sheet = example_base_manager.get_sheet(sheet_name)
+    for row_idx in range(1, 4):
+        example_base_manager.add_row(sheet_name, data={"A": f"v{row_idx}"}, row_idx=row_idx)
+    assert example_base_manager.get_last_row_in_col("A", sheet_name=sheet_name) == 3
+
+    example_base_manager.write_cell(sheet, 5, 1, "v5")
+    assert example_base_manager.get_last_row_in_col("A", sheet_name=sheet_name) == 5
+
+    example_base_manager.delete_rows(sheet, 1)
+    assert example_base_manager.get_last_row_in_col("A", sheet_name=sheet_name) == 4
+
+    example_base_manager.write_cell(sheet, 4, 1, None)
+    assert example_base_manager.get_last_row_in_col("A", sheet_name=sheet_name) == 2
+
 def test_autofit_column_withs_sets_correct_withs(example_base_manager: ExcelManager) -> None:
     sheet_name = 'test'
     example_base_manager.add_row(sheet_name, data={"A": "MuchLongerValueHere", "B": "test_b"})
@@ -130,6 +235,48 @@ def test_autofit_column_withs_exception_is_caught(example_base_manager: ExcelMan
             pytest.fail('Exception inside autofit_column_widths() was not caught')
 
 
+def test_autofit_tracks_writes_without_rescan(example_base_manager: ExcelManager) -> None:
+    sheet_name = "test"
+    sheet = example_base_manager.get_sheet(sheet_name)
+    example_base_manager.add_row(sheet_name, data={"A": "short"})
+    example_base_manager.autofit_column_widths(sheet_name, offset_dim=0)
+
+    with patch.object(example_base_manager, "_measure_columns") as mock_measure:
+        example_base_manager.add_row(sheet_name, data={"A": "much longer value"}, row_idx=2)
+        example_base_manager.autofit_column_widths(sheet_name, offset_dim=0)
+
+    mock_measure.assert_not_called()
+    assert sheet.column_dimensions["A"].width == len("much longer value")
+
+def test_autofit_recomputes_when_widest_removed(example_base_manager: ExcelManager) -> None:
+    sheet_name = "test"
+    sheet = example_base_manager.get_sheet(sheet_name)
+    example_base_manager.add_row(sheet_name, data={"A": "short", "B": "b"})
+    example_base_manager.add_row(sheet_name, data={"A": "much longer value", "B": "b"}, row_idx=2)
+    example_base_manager.autofit_column_widths(sheet_name, offset_dim=0)
+
+    example_base_manager.write_cell(sheet, 2, 1, "mid value")
+    example_base_manager.autofit_column_widths(sheet_name, offset_dim=0)
+    assert sheet.column_dimensions["A"].width == len("mid value")
+
+    example_base_manager.delete_rows(sheet, 2)
+    example_base_manager.autofit_column_widths(sheet_name, offset_dim=0)
+    assert sheet.column_dimensions["A"].width == len("short")
+    assert sheet.column_dimensions["B"].width == 1
+
+def test_autofit_sampling_caps_measured_rows(tmp_path: Path) -> None:
+    manager = ExcelManager(str(tmp_path / "test.xlsx"), sheet_name="test", autofit_sample_rows=2)
+    sheet = manager.get_sheet()
+    for row_idx in range(1, 11):
+        manager.add_row("test", data={"A": "x" * (20 if row_idx == 3 else 2)}, row_idx=row_idx)
+
+    manager.autofit_column_widths(offset_dim=0)
+    assert sheet.column_dimensions["A"].width == 2
+
+    manager.autofit_sample_rows = None
+    manager.autofit_column_widths(offset_dim=0, full=True)
+    assert sheet.column_dimensions["A"].width == 20
+
 def test_load_or_create(tmp_path: Path) -> None:
     tmp_file = tmp_path / "test.xlsx"
     sheet_name = "test"
@@ -174,11 +321,61 @@ def test_style_border_side(example_base_manager: ExcelManager) -> None:
     assert border.left.color.rgb == "00FF0000"
     assert border.right.style == "thin"
 
+def test_to_differential_style() -> None:
+    style: CellStyle = {
+        "fill": PatternFill(start_color="FFCCCC", end_color="FFCCCC", fill_type="solid"),
+        "font": Font(color="000000"),
+        "alignment": Alignment("center"),
+    }
 
-
-
-
-
-
-
-
+    dxf = to_differential_style(style)
+
+    assert dxf.fill.fgColor.rgb == "00FFCCCC"
+    assert dxf.fill.bgColor.rgb == "00FFCCCC"
+    assert dxf.font.color.rgb == "00000000"
+    assert dxf.border is None
+    assert dxf.alignment is None
+
+def test_journal_round_trip_skips_torn_entry(tmp_path: Path) -> None:
+    journal = Journal(str(tmp_path / "test.xlsx.journal"))
+    operations = [
+        Operation("remove_client_rows", (2, {"a@example.com", "b@example.com"})),
+        Operation("patch_client_row", (2, "a@example.com", {"next_payment": date(2025, 9, 1)})),
+    ]
+    assert journal.append(operations, first_seq=5) == 6
+    with open(journal.path, "a", encoding="utf-8") as file:
+        file.write('{"seq":7,"op":"insert_main_row","ar')
+
+    assert [entry.operation for entry in journal.read()] == operations
+    assert [entry.seq for entry in journal.read()] == [5, 6]
+    assert [entry.operation for entry in journal.read(after=5)] == operations[1:]
+
+    journal.clear()
+    assert journal.size == 0
+    assert journal.read() == []
+
+def test_snapshot_round_trip_and_stamp_check(tmp_path: Path) -> None:
+    snapshot = ClientSnapshot(str(tmp_path / "clients.xlsx.cache"))
+    clients = [
+        ClientRecord("Żaneta", "z@example.com", "PZU", "Audi", 2015, 1500, date(2025, 8, 15)),
+        ClientRecord("Adam", "a@example.com", "PZU", "Audi", 2010, 900, date(2026, 1, 1)),
+    ]
+    invalid_rows = [InvalidClientRow(4, "missing values")]
+    snapshot.write(clients, invalid_rows, (123, 456))
+
+    assert snapshot.read((123, 456)) == (clients, invalid_rows)
+    assert snapshot.read((123, 457)) is None
+    assert ClientSnapshot(str(tmp_path / "missing.cache")).read((123, 456)) is None
+
+def test_snapshot_is_readable_by_the_umask_and_keeps_its_mode(tmp_path: Path) -> None:
+    path = tmp_path / "clients.xlsx.cache"
+    umask = os.umask(0o022)
+    try:
+        ClientSnapshot(str(path)).write([], [], (1, 2))
+    finally:
+        os.umask(umask)
+    assert path.stat().st_mode & 0o777 == 0o644
+
+    path.chmod(0o664)
+    ClientSnapshot(str(path)).write([], [], (3, 4))
+    assert path.stat().st_mode & 0o777 == 0o664
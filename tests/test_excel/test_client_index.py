@@ -0,0 +1,92 @@
+from src.excel.manager.client_manager import ClientExcelManager
+from src.model.client import ClientDict, ClientRecord
+from src.excel.index.client_index import ClientIndex
+from datetime import date
+import pytest
+
+
+@pytest.fixture
+def example_clients() -> list[ClientRecord]:
+    return [
+        ClientRecord("a", "a@example.com", "PZU", "Audi", 2010, 1000, date(2025, 8, 1)),
+        ClientRecord("b", "b@example.com", "PZU", "Bmw", 2015, 2000, date(2025, 8, 15)),
+        ClientRecord("c", "c@example.com", "WARTA", "Opel", 2020, 3000, date(2025, 9, 1)),
+        ClientRecord("d", "d@example.com", "LINK4", "Seat", 2012, 1500, date(2025, 7, 1)),
+    ]
+
+
+def emails(clients: list[ClientRecord]) -> set[str]:
+    return {c.email for c in clients}
+
+
+def test_find_by_company(example_clients: list[ClientRecord]) -> None:
+    index = ClientIndex(example_clients)
+
+    assert emails(index.find(company="PZU")) == {"a@example.com", "b@example.com"}
+    assert index.find(company="UNKNOWN") == []
+
+def test_find_by_ranges(example_clients: list[ClientRecord]) -> None:
+    index = ClientIndex(example_clients)
+
+    assert emails(index.find(car_year_between=(2011, 2015))) == {"b@example.com", "d@example.com"}
+    assert emails(index.find(price_gte=2000)) == {"b@example.com", "c@example.com"}
+    assert emails(index.find(price_lte=1500)) == {"a@example.com", "d@example.com"}
+    assert emails(index.find(due_before=date(2025, 8, 15))) == {"a@example.com", "d@example.com"}
+    assert emails(index.find(due_from=date(2025, 8, 15))) == {"b@example.com", "c@example.com"}
+
+def test_find_combined_filters(example_clients: list[ClientRecord]) -> None:
+    index = ClientIndex(example_clients)
+
+    result = index.find(company="PZU", price_gte=1500, due_before=date(2025, 9, 1))
+
+    assert emails(result) == {"b@example.com"}
+
+def test_find_without_filters_returns_all(example_clients: list[ClientRecord]) -> None:
+    index = ClientIndex(example_clients)
+
+    assert len(index.find()) == 4
+
+def test_add_replaces_and_remove(example_clients: list[ClientRecord]) -> None:
+    index = ClientIndex(example_clients)
+    updated = example_clients[0]._replace(insurance_company="WARTA", price=5000)
+
+    index.add(updated)
+
+    assert len(index) == 4
+    assert emails(index.find(company="PZU")) == {"b@example.com"}
+    assert emails(index.find(price_gte=4000)) == {"a@example.com"}
+
+    assert index.remove("a@example.com") is True
+    assert index.remove("a@example.com") is False
+    assert index.get("a@example.com") is None
+    assert emails(index.find(company="WARTA")) == {"c@example.com"}
+
+def test_manager_index_follows_mutations(
+        example_client_manager: ClientExcelManager,
+        client1_data: ClientDict,
+        client2_data: ClientDict
+) -> None:
+    example_client_manager.insert_main_row(client1_data)
+    assert emails(example_client_manager.find(company="abc")) == {"client1@example.com"}
+
+    example_client_manager.insert_main_row(client2_data)
+    example_client_manager.shift_payment_date(2, "client2@example.com", 7, 30)
+    assert emails(example_client_manager.find(due_from=date(2025, 9, 1))) == {"client2@example.com"}
+
+    example_client_manager.update_client_row(2, "client1@example.com", {**client1_data, "email": "new@example.com"})
+    assert example_client_manager.get_client("client1@example.com") is None
+    assert example_client_manager.get_client("new@example.com") is not None
+
+    example_client_manager.remove_client_row(2, "new@example.com")
+    assert emails(example_client_manager.find()) == {"client2@example.com"}
+
+    example_client_manager.overwrite_clients([client1_data])
+    assert emails(example_client_manager.find()) == {"client1@example.com"}
+
+def test_payment_date_lookups(example_clients: list[ClientRecord]) -> None:
+    index = ClientIndex(example_clients)
+
+    assert index.first_payment() == date(2025, 7, 1)
+    assert index.next_payment_from(date(2025, 8, 2)) == date(2025, 8, 15)
+    assert index.next_payment_from(date(2025, 9, 2)) is None
+    assert ClientIndex().first_payment() is None
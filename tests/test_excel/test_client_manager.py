@@ -3,8 +3,12 @@ from src.excel.manager.client_manager import ClientExcelManager
 from datetime import datetime, date, timedelta
 from src.model.client import ClientDict
 from tests.conftest import client1_data
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
+from openpyxl import load_workbook
+from pathlib import Path
 import pytest
+import time
 
 
 def test_insert_and_load_client(example_client_manager: ClientExcelManager, client1_data: ClientDict):
@@ -12,8 +16,9 @@ def test_insert_and_load_client(example_client_manager: ClientExcelManager, clie
     clients = example_client_manager.load_client_row()
 
     assert len(clients) == 1
-    assert clients[0]["name"] == "client1"
-    assert clients[0]["insurance_company"] == "abc"
+    assert clients[0].name == "client1"
+    assert clients[0].insurance_company == "abc"
+    assert clients[0].next_payment == date(2025, 8, 15)
 
 def test_get_next_main_table_row(example_client_manager: ClientExcelManager, client1_data: ClientDict, client2_data: ClientDict) -> None:
 
@@ -24,6 +29,23 @@ def test_get_next_main_table_row(example_client_manager: ClientExcelManager, cli
 
     assert row_idx == 4
 
+def test_next_main_table_row_is_tracked(
+        example_client_manager: ClientExcelManager,
+        client1_data: ClientDict,
+        client2_data: ClientDict
+) -> None:
+    example_client_manager.insert_main_row(client1_data)
+    example_client_manager.insert_main_row(client2_data)
+
+    with patch.object(example_client_manager, "get_sheet", side_effect=AssertionError("scanned")):
+        assert example_client_manager.get_next_main_table_row() == 4
+
+    example_client_manager.remove_client_row(2, "client1@example.com")
+    assert example_client_manager.get_next_main_table_row() == 3
+
+    example_client_manager.insert_main_row(client1_data)
+    assert [c.email for c in example_client_manager.load_client_row()] == ["client2@example.com", "client1@example.com"]
+
 def test_get_next_main_table_row_empty_sheet(example_client_manager: ClientExcelManager):
     mock_ws = MagicMock()
     mock_ws.max_row = 5
@@ -54,6 +76,45 @@ def test_update_client_row(example_client_manager: ClientExcelManager, client1_d
     assert email_value == "client1@example.com"
     assert no_updated_client is False
 
+def test_patch_client_row_writes_only_changed_fields(
+        example_client_manager: ClientExcelManager,
+        client1_data: ClientDict
+) -> None:
+    example_client_manager.insert_main_row(client1_data)
+
+    with patch.object(example_client_manager, "update_summary_tables") as mock_summary, \
+            patch.object(example_client_manager, "save") as mock_save:
+        result = example_client_manager.patch_client_row(2, "client1@example.com", {"price": 2000, "name": "client1"})
+
+    ws = example_client_manager.get_sheet()
+    assert result is True
+    assert ws.cell(row=2, column=6).value == 2000
+    assert example_client_manager.get_client("client1@example.com").price == 2000
+    mock_summary.assert_not_called()
+    mock_save.assert_called_once_with(restyle=False)
+
+def test_patch_client_row_company_rebuilds_summary(
+        example_client_manager: ClientExcelManager,
+        client1_data: ClientDict
+) -> None:
+    example_client_manager.insert_main_row(client1_data)
+
+    example_client_manager.patch_client_row(2, "client1@example.com", {"insurance_company": "xyz"})
+    ws = example_client_manager.get_sheet()
+
+    assert ws["I2"].value == "XYZ"
+
+def test_patch_client_row_not_found_and_unknown_field(
+        example_client_manager: ClientExcelManager,
+        client1_data: ClientDict
+) -> None:
+    example_client_manager.insert_main_row(client1_data)
+
+    assert example_client_manager.patch_client_row(2, "missing@example.com", {"price": 1}) is False
+    assert example_client_manager.patch_client_row(2, "client1@example.com", {"price": 1500}) is True
+    with pytest.raises(ValueError, match="Unknown client fields: color"):
+        example_client_manager.patch_client_row(2, "client1@example.com", {"color": "red"})  # type: ignore[typeddict-unknown-key]
+
 def test_shift_payment_date_with_str(example_client_manager: ClientExcelManager, client1_data: ClientDict) -> None:
     example_client_manager.insert_main_row(client1_data)
 
@@ -91,6 +152,24 @@ def test_shift_payment_date_value_not_found(example_client_manager: ClientExcelM
 
     assert result is False
 
+def test_shift_payment_dates(
+        example_client_manager: ClientExcelManager,
+        client1_data: ClientDict,
+        client2_data: ClientDict
+) -> None:
+    example_client_manager.insert_main_row(client1_data)
+    example_client_manager.insert_main_row({**client2_data, "next_payment": "not_a_date"})
+
+    with patch.object(example_client_manager, "save") as mock_save:
+        shifted = example_client_manager.shift_payment_dates(
+            2, {"client1@example.com", "client2@example.com", "missing@example.com"}, 7, 30)
+
+    ws = example_client_manager.get_sheet()
+    assert shifted == {"client1@example.com"}
+    assert ws.cell(row=2, column=7).value == "2025-09-14"
+    assert example_client_manager.get_client("client1@example.com").next_payment == date(2025, 9, 14)
+    mock_save.assert_called_once()
+
 def test_remove_client(example_client_manager: ClientExcelManager, client1_data: ClientDict) -> None:
     example_client_manager.insert_main_row(client1_data)
 
@@ -118,6 +197,76 @@ def test_overwrite_clients(example_client_manager: ClientExcelManager, client1_d
 
     assert email == "client1@example.com"
 
+def test_summary_tables_values(
+        example_client_manager: ClientExcelManager,
+        client1_data: ClientDict,
+        client2_data: ClientDict
+) -> None:
+    example_client_manager.insert_main_row(client1_data)
+    example_client_manager.insert_main_row(client2_data)
+    example_client_manager.insert_main_row({**client2_data, "email": "c3@example.com", "insurance_company": "ABC"})
+    ws = example_client_manager.get_sheet()
+
+    assert [(ws[f"I{r}"].value, ws[f"J{r}"].value) for r in (2, 3, 4)] == [("ABC", 2), ("DEF", 1), (None, None)]
+    assert [ws[f"M{r}"].value for r in range(1, 5)] == [3, 4500, 0.74, 3330]
+
+    example_client_manager.patch_client_row(2, "client1@example.com", {"price": 2500})
+
+    assert ws["M2"].value == 5500
+    assert ws["M4"].value == round(5500 * 0.74)
+
+def test_summary_clears_only_stale_rows(tmp_path: Path, client1_data: ClientDict, client2_data: ClientDict) -> None:
+    filepath = str(tmp_path / "clients.xlsx")
+    manager = ClientExcelManager(filepath)
+    manager.insert_main_row(client1_data)
+    manager.insert_main_row(client2_data)
+    Path(f"{filepath}.cache").unlink()
+
+    reloaded = ClientExcelManager(filepath)
+    with patch.object(reloaded, "_clear_column_range", wraps=reloaded._clear_column_range) as mock_clear:
+        reloaded.remove_client_row(2, "client1@example.com")
+        reloaded.update_summary_tables()
+    ws = reloaded.get_sheet()
+
+    assert [c.args[2:] for c in mock_clear.call_args_list] == [(3, 3), (3, 3)]
+    assert (ws["I2"].value, ws["J2"].value) == ("DEF", 1)
+    assert (ws["I3"].value, ws["J3"].value) == (None, None)
+
+def test_summary_tables_formulas(tmp_path: Path, client1_data: ClientDict) -> None:
+    manager = ClientExcelManager(str(tmp_path / "clients.xlsx"), summary_mode="formulas")
+    manager.insert_main_row(client1_data)
+    ws = manager.get_sheet()
+
+    assert ws["J2"].value == "=COUNTIF(C:C, I2)"
+    assert ws["M1"].value == "=COUNTA(A:A)-1"
+    assert ws["M2"].value == "=SUM(F:F)"
+    assert ws["M4"].value == "=M2*M3"
+
+def test_uppercase_applied_on_write(tmp_path: Path, client1_data: ClientDict) -> None:
+    manager = ClientExcelManager(str(tmp_path / "clients.xlsx"), uppercase_columns=["A", "C"])
+    manager.insert_main_row(client1_data)
+    manager.patch_client_row(2, "client1@example.com", {"car_model": "audi a4", "name": "new name"})
+    ws = manager.get_sheet()
+
+    assert ws["A2"].value == "NEW NAME"
+    assert ws["C2"].value == "ABC"
+    assert ws["D2"].value == "audi a4"
+    assert ws["A1"].value == "NAME"
+
+    with patch.object(manager, "_aplay_uppercase") as mock_uppercase:
+        manager.update_summary_tables()
+    mock_uppercase.assert_not_called()
+
+def test_normalize_uppercase_columns(example_client_manager: ClientExcelManager, client1_data: ClientDict) -> None:
+    example_client_manager.insert_main_row(client1_data)
+    example_client_manager.uppercase_columns = ["B"]
+
+    with patch.object(example_client_manager, "save") as mock_save:
+        example_client_manager.normalize_uppercase_columns()
+
+    assert example_client_manager.get_sheet()["B2"].value == "CLIENT1@EXAMPLE.COM"
+    mock_save.assert_called_once()
+
 def test_aplay_uppercase(example_client_manager: ClientExcelManager, client1_data: ClientDict) -> None:
     example_client_manager.insert_main_row(client1_data)
 
@@ -186,21 +335,27 @@ def test_style_summary_table(example_client_manager: ClientExcelManager, client1
     assert cell_header.font.italic == True
     assert cell_row.font.bold == True
 
-def test_highlight_overdue_payment(example_client_manager: ClientExcelManager, client1_data: ClientDict) -> None:
-    ws = example_client_manager.get_sheet()
-    yesterday = datetime.today().date() - timedelta(days=1)
-    ws.cell(row=2, column=3).value = yesterday
-    ws.cell(row=3, column=3).value = "invalid_data"
+def test_overdue_rule_added_once(tmp_path: Path, client1_data: ClientDict) -> None:
+    filepath = str(tmp_path / "clients.xlsx")
+    manager = ClientExcelManager(filepath, overdue_style=italic_font_style())
+    manager.insert_main_row(client1_data)
+    manager.save()
 
-    example_client_manager.main_table_headers = ["NAME", "EMAIL", "NEXT_PAYMENT"]
-    example_client_manager.overdue_style = italic_font_style()
+    reloaded = ClientExcelManager(filepath, overdue_style=italic_font_style())
+    reloaded.save()
+    rules = [(str(cf.sqref), rule) for cf in reloaded.get_sheet().conditional_formatting for rule in cf.rules]
 
-    example_client_manager._highlight_overdue_payment()
+    assert len(rules) == 1
+    sqref, rule = rules[0]
+    assert sqref == "G2:G1048576"
+    assert rule.type == "expression"
+    assert "TODAY()" in rule.formula[0]
+    assert rule.dxf.font.italic == True
 
-    cell = ws.cell(row=2, column=3)
-    cell_invalid = ws.cell(row=3, column=3)
-    assert cell.font.italic == True
-    assert cell_invalid.font.italic == False
+def test_overdue_rule_skipped_without_style(example_client_manager: ClientExcelManager, client1_data: ClientDict) -> None:
+    example_client_manager.insert_main_row(client1_data)
+
+    assert len(example_client_manager.get_sheet().conditional_formatting) == 0
 
 def test_load_client_row_with_exceptions(example_client_manager: ClientExcelManager, client1_data: ClientDict) -> None:
     example_client_manager.insert_main_row(client1_data)
@@ -210,6 +365,46 @@ def test_load_client_row_with_exceptions(example_client_manager: ClientExcelMana
     clients = example_client_manager.load_client_row()
 
     assert clients == []
+    assert [row.row_idx for row in example_client_manager.invalid_rows] == [2]
+
+def test_load_client_row_reports_invalid_date(
+        example_client_manager: ClientExcelManager,
+        client1_data: ClientDict,
+        client2_data: ClientDict
+) -> None:
+    example_client_manager.insert_main_row(client1_data)
+    example_client_manager.insert_main_row({**client2_data, "next_payment": "not_a_date"})
+
+    clients = example_client_manager.load_client_row()
+
+    assert [c.email for c in clients] == ["client1@example.com"]
+    assert len(example_client_manager.invalid_rows) == 1
+    assert example_client_manager.invalid_rows[0].row_idx == 3
+    assert "not_a_date" in example_client_manager.invalid_rows[0].reason
+
+def test_load_client_row_accepts_date_cells(example_client_manager: ClientExcelManager, client1_data: ClientDict) -> None:
+    example_client_manager.insert_main_row(client1_data)
+    ws = example_client_manager.get_sheet()
+    ws.cell(row=2, column=7).value = datetime(2025, 8, 20)
+
+    clients = example_client_manager.load_client_row()
+
+    assert clients[0].next_payment == date(2025, 8, 20)
+
+def test_remove_client_rows(
+        example_client_manager: ClientExcelManager,
+        client1_data: ClientDict,
+        client2_data: ClientDict
+) -> None:
+    example_client_manager.insert_main_row(client1_data)
+    example_client_manager.insert_main_row(client2_data)
+
+    removed = example_client_manager.remove_client_rows(2, {"client1@example.com", "missing@example.com"})
+    clients = example_client_manager.load_client_row()
+
+    assert removed == ["client1@example.com"]
+    assert [c.email for c in clients] == ["client2@example.com"]
+    assert example_client_manager.remove_client_rows(2, {"missing@example.com"}) == []
 
 
 
@@ -223,3 +418,355 @@ def test_load_client_row_with_exceptions(example_client_manager: ClientExcelMana
 
 
 
+
+def test_concurrent_managers_do_not_lose_updates(
+        tmp_path: Path,
+        client1_data: ClientDict,
+        client2_data: ClientDict
+) -> None:
+    filepath = str(tmp_path / "clients.xlsx")
+    cli = ClientExcelManager(filepath)
+    scheduler = ClientExcelManager(filepath)
+
+    cli.insert_main_row(client1_data)
+    scheduler.insert_main_row(client2_data)
+    cli.shift_payment_date(2, "client1@example.com", 7, 30)
+
+    reloaded = ClientExcelManager(filepath)
+    clients = {c.email: c for c in reloaded.load_client_row()}
+    assert set(clients) == {"client1@example.com", "client2@example.com"}
+    assert clients["client1@example.com"].next_payment == date(2025, 9, 14)
+    assert reloaded.get_sheet()["J2"].value == 1
+    assert reloaded.get_sheet()["J3"].value == 1
+
+def test_journal_defers_workbook_writes_until_compaction(
+        tmp_path: Path,
+        client1_data: ClientDict,
+        client2_data: ClientDict
+) -> None:
+    filepath = str(tmp_path / "clients.xlsx")
+    manager = ClientExcelManager(filepath, journal=True, journal_compact_interval=None)
+    manager.insert_main_row(client1_data)
+    manager.patch_client_row(2, "client1@example.com", {"next_payment": date(2025, 9, 1)})
+
+    assert ClientExcelManager(filepath).load_client_row() == []
+    assert [entry.operation.name for entry in manager.journal.read()] == ["insert_main_row", "patch_client_row"]
+
+    recovered = ClientExcelManager(filepath, journal=True, journal_compact_interval=None)
+    clients = recovered.load_client_row()
+    assert [c.email for c in clients] == ["client1@example.com"]
+    assert clients[0].next_payment == date(2025, 9, 1)
+
+    recovered.insert_main_row(client2_data)
+    recovered.compact()
+
+    assert recovered.journal.size == 0
+    assert {c.email for c in ClientExcelManager(filepath).load_client_row()} == {
+        "client1@example.com", "client2@example.com"}
+
+def test_journal_entries_in_workbook_are_not_replayed_after_crash(tmp_path: Path, client1_data: ClientDict) -> None:
+    filepath = str(tmp_path / "clients.xlsx")
+    manager = ClientExcelManager(filepath, journal=True, journal_compact_interval=None)
+    manager.insert_main_row(client1_data)
+    manager.shift_payment_date(2, "client1@example.com", 7, 30)
+
+    with patch.object(manager.journal, "clear", side_effect=OSError("crash")), pytest.raises(OSError):
+        manager.compact()
+    assert len(manager.journal.read()) == 2
+
+    recovered = ClientExcelManager(filepath, journal=True, journal_compact_interval=None)
+    clients = recovered.load_client_row()
+    assert [c.email for c in clients] == ["client1@example.com"]
+    assert clients[0].next_payment == date(2025, 9, 14)
+
+    recovered.patch_client_row(2, "client1@example.com", {"price": 1800})
+    assert [entry.seq for entry in recovered.journal.read()] == [1, 2, 3]
+    reopened = ClientExcelManager(filepath, journal=True, journal_compact_interval=None)
+    assert [(c.price, c.next_payment) for c in reopened.load_client_row()] == [(1800, date(2025, 9, 14))]
+
+def test_journal_compacts_on_size_threshold(tmp_path: Path, client1_data: ClientDict) -> None:
+    filepath = str(tmp_path / "clients.xlsx")
+    manager = ClientExcelManager(filepath, journal=True, journal_max_bytes=1, journal_compact_interval=None)
+    manager.insert_main_row(client1_data)
+
+    assert manager.journal.size == 0
+    assert len(ClientExcelManager(filepath).load_client_row()) == 1
+
+def test_snapshot_serves_reads_without_parsing_workbook(
+        tmp_path: Path,
+        client1_data: ClientDict,
+        client2_data: ClientDict
+) -> None:
+    filepath = str(tmp_path / "clients.xlsx")
+    manager = ClientExcelManager(filepath)
+    manager.insert_main_row(client1_data)
+    manager.insert_main_row(client2_data)
+    expected = manager.load_client_row()
+
+    with patch("src.excel.manager.base_manager.load_workbook") as mock_load:
+        cached = ClientExcelManager(filepath)
+        assert cached.load_client_row() == expected
+        assert cached.get_client("client2@example.com") == expected[1]
+    mock_load.assert_not_called()
+
+    cached.remove_client_row(2, "client1@example.com")
+    assert [c.email for c in ClientExcelManager(filepath).load_client_row()] == ["client2@example.com"]
+
+def test_snapshot_is_written_from_index_without_scanning(
+        tmp_path: Path,
+        client1_data: ClientDict,
+        client2_data: ClientDict
+) -> None:
+    filepath = str(tmp_path / "clients.xlsx")
+    manager = ClientExcelManager(filepath)
+    manager.insert_main_row(client1_data)
+    manager.insert_main_row({**client2_data, "email": "bad@example.com", "next_payment": "not_a_date"})
+    manager.insert_main_row(client2_data)
+
+    with patch.object(manager, "_scan_client_rows", wraps=manager._scan_client_rows) as scan:
+        manager.patch_client_row(2, "client2@example.com", {"price": 1900})
+        manager.remove_client_row(2, "client1@example.com")
+    scan.assert_not_called()
+
+    cached = manager._snapshot.read(manager._file_stamp(filepath))
+    assert cached is not None
+    assert cached == ClientExcelManager(filepath)._scan_client_rows()
+    clients, invalid_rows = cached
+    assert [(c.email, c.price) for c in clients] == [("client2@example.com", 1900)]
+    assert [row.row_idx for row in invalid_rows] == [2]
+
+def test_stale_snapshot_falls_back_to_workbook(tmp_path: Path, client1_data: ClientDict) -> None:
+    filepath = str(tmp_path / "clients.xlsx")
+    manager = ClientExcelManager(filepath)
+    manager.insert_main_row(client1_data)
+
+    stale = ClientExcelManager(filepath)
+    stale._snapshot.write([], [], (0, 0))
+
+    assert [c.email for c in ClientExcelManager(filepath).load_client_row()] == ["client1@example.com"]
+
+def test_mutation_listeners_and_refresh(tmp_path: Path, client1_data: ClientDict, client2_data: ClientDict) -> None:
+    filepath = str(tmp_path / "clients.xlsx")
+    manager = ClientExcelManager(filepath)
+    other = ClientExcelManager(filepath)
+    listener = MagicMock()
+    manager.add_mutation_listener(listener)
+
+    manager.insert_main_row(client1_data)
+    manager.get_client("missing@example.com")
+
+    listener.assert_called_once()
+    assert listener.call_args.args[0].name == "insert_main_row"
+
+    assert other.get_client("client1@example.com") is None
+    assert other.refresh() is True
+    assert other.refresh() is False
+    assert other.get_client("client1@example.com") is not None
+
+def test_sync_external_changes_applies_only_changed_rows(
+        tmp_path: Path,
+        client1_data: ClientDict,
+        client2_data: ClientDict
+) -> None:
+    filepath = str(tmp_path / "clients.xlsx")
+    manager = ClientExcelManager(filepath)
+    manager.insert_main_row(client1_data)
+    manager.insert_main_row(client2_data)
+    index = manager.index
+    listener = MagicMock()
+    manager.add_mutation_listener(listener)
+
+    assert manager.sync_external_changes().empty
+    loaded = manager.get_sheet()
+
+    workbook = load_workbook(filepath)
+    ws = workbook["Clients"]
+    ws["F2"] = 2500
+    ws.delete_rows(3)
+    ws.append(["client3", "client3@example.com", "xyz", "Bmw", 2018, 900, "2025-09-01"])
+    workbook.save(filepath)
+
+    diff = manager.sync_external_changes()
+
+    assert [c.email for c in diff.added] == ["client3@example.com"]
+    assert [(c.email, c.price) for c in diff.changed] == [("client1@example.com", 2500)]
+    assert diff.removed == ["client2@example.com"]
+    assert manager.index is index
+    assert manager.get_client("client2@example.com") is None
+    assert [c.email for c in manager.find(price_lte=1000)] == ["client3@example.com"]
+    assert manager._summary_totals == (2, 3400)
+    listener.assert_called_once()
+
+    assert manager.get_sheet() is loaded
+    companies = {row[0]: row[1] for row in loaded.iter_rows(2, 3, min_col=9, max_col=10, values_only=True)}
+    assert companies == {client1_data["insurance_company"].upper(): 1, "XYZ": 1}
+
+    with patch.object(manager, "_load_workbook", wraps=manager._load_workbook) as load:
+        manager.patch_client_row(2, "client3@example.com", {"car_year": 2019})
+    load.assert_not_called()
+    assert manager.index is index
+    saved = {c.email: c for c in ClientExcelManager(filepath).load_client_row()}
+    assert set(saved) == {"client1@example.com", "client3@example.com"}
+    assert (saved["client1@example.com"].price, saved["client3@example.com"].car_year) == (2500, 2019)
+
+def test_sync_external_changes_keeps_edits_outside_client_rows(
+        tmp_path: Path,
+        client1_data: ClientDict,
+        client2_data: ClientDict
+) -> None:
+    filepath = str(tmp_path / "clients.xlsx")
+    manager = ClientExcelManager(filepath)
+    manager.insert_main_row(client1_data)
+    manager.get_sheet()
+    locked: list[bool] = []
+    manager.add_mutation_listener(lambda operation: locked.append(manager._write_lock._is_owned()))
+
+    workbook = load_workbook(filepath)
+    workbook.create_sheet("Notes")["A1"] = "call back"
+    workbook.save(filepath)
+
+    assert manager.sync_external_changes().empty
+    assert manager._workbook is None
+    manager.insert_main_row(client2_data)
+    assert load_workbook(filepath)["Notes"]["A1"].value == "call back"
+
+    workbook = load_workbook(filepath)
+    workbook["Clients"]["F2"] = 2500
+    workbook.save(filepath)
+    assert not manager.sync_external_changes().empty
+    assert locked[-1] is False
+
+def test_write_behind_coalesces_saves(tmp_path: Path, client1_data: ClientDict, client2_data: ClientDict) -> None:
+    filepath = tmp_path / "clients.xlsx"
+    manager = ClientExcelManager(str(filepath), write_behind_interval=0.3)
+
+    with patch.object(manager, "_write_file", wraps=manager._write_file) as write:
+        manager.insert_main_row(client1_data)
+        manager.insert_main_row(client2_data)
+        manager.patch_client_row(2, "client1@example.com", {"price": 1800})
+        assert write.call_count == 0
+
+        time.sleep(1)
+        assert write.call_count == 1
+
+    saved = {c.email: c.price for c in ClientExcelManager(str(filepath)).load_client_row()}
+    assert saved == {"client1@example.com": 1800, "client2@example.com": 1500}
+    manager.close()
+
+def test_write_behind_flush_and_close(tmp_path: Path, client1_data: ClientDict) -> None:
+    filepath = str(tmp_path / "clients.xlsx")
+    manager = ClientExcelManager(filepath, write_behind_interval=60)
+    manager.insert_main_row(client1_data)
+    assert ClientExcelManager(filepath).load_client_row() == []
+
+    manager.flush()
+    assert [c.email for c in ClientExcelManager(filepath).load_client_row()] == ["client1@example.com"]
+
+    manager.shift_payment_date(2, "client1@example.com", 7, 30)
+    manager.close()
+    assert manager._writer is None
+    assert ClientExcelManager(filepath).get_client("client1@example.com").next_payment == date(2025, 9, 14)
+
+def test_snapshot_is_isolated_from_later_mutations(
+        example_client_manager: ClientExcelManager, client1_data: ClientDict, client2_data: ClientDict) -> None:
+    example_client_manager.insert_main_row(client1_data)
+    view = example_client_manager.snapshot()
+    assert example_client_manager.snapshot() is view
+
+    example_client_manager.insert_main_row(client2_data)
+    example_client_manager.patch_client_row(2, "client1@example.com", {"price": 9999})
+
+    assert [c.email for c in view] == ["client1@example.com"]
+    assert view.get("client1@example.com").price == client1_data["price"]
+    assert view.find(price_gte=9999) == []
+
+    latest = example_client_manager.snapshot()
+    assert latest is not view and latest.version > view.version
+    assert {c.email for c in latest} == {"client1@example.com", "client2@example.com"}
+    assert latest.get("client1@example.com").price == 9999
+
+def test_snapshot_readers_run_alongside_writer(tmp_path: Path, client1_data: ClientDict) -> None:
+    manager = ClientExcelManager(str(tmp_path / "clients.xlsx"), write_behind_interval=60)
+    emails = [f"client{i}@example.com" for i in range(30)]
+
+    def write() -> None:
+        for email in emails:
+            manager.insert_main_row({**client1_data, "email": email})
+
+    def read() -> list[int]:
+        sizes = []
+        while len(sizes) < 200 and (not sizes or sizes[-1] < len(emails)):
+            view = manager.snapshot()
+            assert len(view.find(company=client1_data["insurance_company"])) == len(view)
+            sizes.append(len(view))
+        return sizes
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        reader = executor.submit(read)
+        executor.submit(write).result()
+        sizes = reader.result()
+
+    assert sizes == sorted(sizes)
+    assert len(manager.snapshot()) == len(emails)
+    manager.close()
+
+def test_lock_holds_writers_back_without_deadlock(tmp_path: Path, client1_data: ClientDict) -> None:
+    manager = ClientExcelManager(str(tmp_path / "clients.xlsx"), lock_timeout=5)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with manager.lock(1):
+            writer = executor.submit(manager.insert_main_row, client1_data)
+            time.sleep(0.2)
+            assert not writer.done()
+            manager.refresh()
+            assert len(manager.snapshot()) == 0
+        writer.result(timeout=5)
+
+    assert [c.email for c in manager.snapshot()] == ["client1@example.com"]
+
+def test_write_behind_retries_failed_save(tmp_path: Path, client1_data: ClientDict) -> None:
+    filepath = str(tmp_path / "clients.xlsx")
+    manager = ClientExcelManager(filepath, write_behind_interval=0.1)
+    write_file = manager._write_file
+    failures = iter([OSError("disk full")])
+
+    def flaky_write() -> None:
+        error = next(failures, None)
+        if error is not None:
+            raise error
+        write_file()
+
+    with patch.object(manager, "_write_file", side_effect=flaky_write):
+        manager.insert_main_row(client1_data)
+        deadline = time.monotonic() + 5
+        while manager._pending_ops and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+    assert [c.email for c in ClientExcelManager(filepath).load_client_row()] == ["client1@example.com"]
+    manager.close()
+
+def test_refresh_and_sync_time_out_while_locked(tmp_path: Path, client1_data: ClientDict) -> None:
+    manager = ClientExcelManager(str(tmp_path / "clients.xlsx"), lock_timeout=5)
+    manager.insert_main_row(client1_data)
+
+    def try_reads() -> float:
+        started = time.monotonic()
+        with pytest.raises(TimeoutError):
+            manager.refresh(timeout=0)
+        with pytest.raises(TimeoutError):
+            manager.sync_external_changes(timeout=0)
+        return time.monotonic() - started
+
+    with ThreadPoolExecutor(max_workers=1) as executor, manager.lock():
+        elapsed = executor.submit(try_reads).result(timeout=5)
+
+    assert elapsed < 0.5
+
+def test_snapshot_does_not_wait_for_another_writer(tmp_path: Path, client1_data: ClientDict) -> None:
+    manager = ClientExcelManager(str(tmp_path / "clients.xlsx"))
+    view = manager.snapshot()
+
+    with ThreadPoolExecutor(max_workers=1) as executor, manager.lock():
+        manager.insert_main_row(client1_data)
+        assert executor.submit(manager.snapshot).result(timeout=1) is view
+        assert len(manager.snapshot()) == 1
@@ -0,0 +1,115 @@
+from src.excel.manager.sharded_manager import ShardedClientManager
+from src.excel.manager.client_manager import ClientExcelManager
+from src.service.client_service import ClientService
+from src.model.client import Client
+from unittest.mock import MagicMock, patch
+from freezegun import freeze_time
+from datetime import date
+from pathlib import Path
+import pytest
+import json
+
+
+def make_client(email: str, company: str, next_payment: date, price: int = 1000) -> Client:
+    return Client(email.split("@")[0], email, company, "Audi", 2015, price, next_payment)
+
+def test_sharded_manager_routes_clients_by_company(tmp_path: Path) -> None:
+    manager = ShardedClientManager(str(tmp_path), ClientExcelManager)
+    manager.insert_main_row(make_client("a@example.com", "PZU", date(2025, 8, 15)).to_dict())
+    manager.insert_main_row(make_client("b@example.com", "Warta S.A.", date(2025, 8, 16)).to_dict())
+    manager.insert_main_row(make_client("c@example.com", "PZU", date(2025, 9, 1)).to_dict())
+
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    assert manifest == {"shard_by": "company", "shards": {"PZU": "clients_pzu.xlsx", "Warta S.A.": "clients_warta_s_a.xlsx"}}
+
+    reopened = ShardedClientManager(str(tmp_path), ClientExcelManager)
+    assert sorted(c.email for c in reopened.find(company="PZU")) == ["a@example.com", "c@example.com"]
+    assert list(reopened._shards) == ["PZU"]
+    assert reopened.index.first_payment() == date(2025, 8, 15)
+    assert len(reopened.load_client_row()) == 3
+
+def test_sharded_manager_moves_client_when_shard_key_changes(tmp_path: Path) -> None:
+    manager = ShardedClientManager(str(tmp_path), ClientExcelManager, shard_by="year")
+    manager.insert_main_row(make_client("a@example.com", "PZU", date(2025, 12, 30)).to_dict())
+    manager.insert_main_row(make_client("b@example.com", "PZU", date(2025, 6, 1)).to_dict())
+
+    assert manager.shift_payment_date(2, "a@example.com", 7, 5)
+    assert manager.shift_payment_dates(2, {"b@example.com", "missing@example.com"}, 7, 10) == {"b@example.com"}
+
+    assert [c.email for c in manager.shards(["2025"])[0].load_client_row()] == ["b@example.com"]
+    assert manager.shards(["2026"])[0].get_client("a@example.com").next_payment == date(2026, 1, 4)
+    assert manager.shard_keys({"due_from": date(2026, 1, 1)}) == ["2026"]
+    assert manager.index.next_payment_from(date(2025, 6, 2)) == date(2025, 6, 11)
+
+    with pytest.raises(ValueError, match="shards by year"):
+        ShardedClientManager(str(tmp_path), ClientExcelManager, shard_by="company")
+
+@freeze_time("2025-08-20")
+def test_client_service_runs_on_sharded_manager(tmp_path: Path) -> None:
+    manager = ShardedClientManager(str(tmp_path), ClientExcelManager)
+    service = ClientService(manager, MagicMock(), MagicMock())
+    service.add_client(make_client("a@example.com", "PZU", date(2025, 8, 1), 1000))
+    service.add_client(make_client("b@example.com", "Warta", date(2025, 8, 21), 2000))
+    service.add_client(make_client("c@example.com", "Warta", date(2025, 9, 21), 3000))
+
+    service.patch_client("c@example.com", insurance_company="PZU")
+    assert sorted(c.email for c in manager.find(company="PZU")) == ["a@example.com", "c@example.com"]
+
+    assert service.notify_payment_due_in_days(1) == ["b@example.com"]
+    assert service.remove_overdue_clients(3) == ["a@example.com"]
+    assert not service.check_if_client_exists("a@example.com")
+
+    report = service.generate_monthly_report()
+    assert report["company"] == {"Warta": 1}
+    assert report["gross_total"] == 2000
+
+def test_sharded_snapshot_is_isolated_from_later_mutations(tmp_path: Path) -> None:
+    manager = ShardedClientManager(str(tmp_path), ClientExcelManager)
+    manager.insert_main_row(make_client("a@example.com", "PZU", date(2025, 8, 15)).to_dict())
+    view = manager.snapshot()
+
+    manager.insert_main_row(make_client("b@example.com", "Warta", date(2025, 8, 1)).to_dict())
+    manager.remove_client_row(2, "a@example.com")
+
+    assert [c.email for c in view.clients] == ["a@example.com"]
+    assert view.get("a@example.com") is not None and view.get("b@example.com") is None
+    assert view.first_payment() == date(2025, 8, 15)
+    assert [c.email for c in manager.snapshot().clients] == ["b@example.com"]
+
+def test_sharded_moves_are_batched_saving_each_shard_once(tmp_path: Path) -> None:
+    manager = ShardedClientManager(str(tmp_path), ClientExcelManager, shard_by="year")
+    manager.insert_main_rows([
+        make_client(f"{i}@example.com", "PZU", date(2025, 3, 1) if i < 8 else date(2025, 1, 1)).to_dict()
+        for i in range(10)
+    ] + [make_client("x@example.com", "PZU", date(2026, 6, 1)).to_dict()])
+    assert manager.shards(["2025"])[0].get_client("9@example.com") is not None
+
+    with patch.object(ClientExcelManager, "_write_file", autospec=True) as write:
+        emails = {f"{i}@example.com" for i in range(10)}
+        assert manager.shift_payment_dates(2, emails, 7, 320) == emails
+
+    assert sorted(Path(call.args[0].filepath).name for call in write.call_args_list) == [
+        "clients_2025.xlsx", "clients_2026.xlsx"]
+    assert len(manager.shards(["2026"])[0].load_client_row()) == 9
+    assert {c.email for c in manager.shards(["2025"])[0].load_client_row()} == {"8@example.com", "9@example.com"}
+
+    with patch.object(ClientExcelManager, "_write_file", autospec=True) as write:
+        assert manager.patch_client_row(2, "8@example.com", {"next_payment": date(2026, 5, 1)})
+    assert write.call_count == 2
+    assert manager.shards(["2026"])[0].get_client("8@example.com") is not None
+
+def test_sharded_batch_locks_only_changed_shards(tmp_path: Path) -> None:
+    manager = ShardedClientManager(str(tmp_path), ClientExcelManager, shard_by="year")
+    manager.insert_main_rows([
+        make_client(f"{year}@example.com", "PZU", date(year, 3, 1)).to_dict() for year in (2025, 2026, 2027)])
+    batch = ClientExcelManager.batch
+
+    with patch.object(ClientExcelManager, "batch", autospec=True, side_effect=batch) as batched:
+        assert manager.patch_client_row(2, "2025@example.com", {"price": 1500})
+    assert [Path(call.args[0].filepath).name for call in batched.call_args_list] == ["clients_2025.xlsx"]
+
+    with patch.object(ClientExcelManager, "batch", autospec=True, side_effect=batch) as batched:
+        assert manager.shift_payment_date(2, "2025@example.com", 7, 365)
+    assert sorted(Path(call.args[0].filepath).name for call in batched.call_args_list) == [
+        "clients_2025.xlsx", "clients_2026.xlsx"]
+    assert manager.shards(["2026"])[0].get_client("2025@example.com") is not None
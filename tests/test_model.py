@@ -1,4 +1,4 @@
-from src.model.client import Client, ClientDict
+from src.model.client import Client, ClientDict, ClientRecord
 from src.model.report import MonthlyReportDict
 from src.model.invoice import InvoiceDict
 
@@ -8,6 +8,11 @@ def test_model_client(client_1: Client, client1_data: ClientDict) -> None:
     assert result == client1_data
     assert result["name"] == "client1"
 
+def test_model_client_record(client_1: Client, client1_data: ClientDict) -> None:
+    record = ClientRecord(**vars(client_1))
+
+    assert record.to_dict() == client1_data
+
 def test_invoice_dict(invoice_dict: InvoiceDict) -> None:
     assert invoice_dict["client_name"] == "client1"
 
@@ -1,7 +1,17 @@
-from src.scheduler.clients_scheduler import job_notify_and_cleanup, create_scheduler, default_listener
-from apscheduler.events import JobExecutionEvent, EVENT_JOB_EXECUTED, EVENT_JOB_ERROR  # type: ignore
+from src.scheduler.clients_scheduler import (
+    job_notify_and_cleanup, create_scheduler, default_listener, DueDateWatcher, job_metrics, NOTIFY_JOB_ID, CLEANUP_JOB_ID,
+    SYNC_JOB_ID, RESCHEDULE_JOB_ID
+)
+from src.scheduler.watermark_store import WatermarkStore
+from src.service.factory import create_client_service
+from apscheduler.events import EVENT_JOB_MISSED, EVENT_JOB_MAX_INSTANCES  # type: ignore
 from apscheduler.schedulers.background import BackgroundScheduler  # type: ignore
+from src.excel.index.client_index import ClientIndex
+from datetime import date, datetime
+from pathlib import Path
 from unittest.mock import patch, MagicMock
+from src.model.client import ClientRecord
+import pytest
 import time
 
 
@@ -18,15 +28,17 @@ def test_scheduler_adds_jobs_correctly() -> None:
     assert mocked_job.called
     mocked_job.assert_called_with("test", 123)
 
-def test_create_scheduler() -> None:
-    scheduler = create_scheduler()
+def test_create_scheduler(tmp_path: Path) -> None:
+    service = create_client_service(str(tmp_path / "Clients.xlsx"))
+    with patch("src.scheduler.clients_scheduler.create_client_service", return_value=service):
+        scheduler = create_scheduler()
     assert isinstance(scheduler, BackgroundScheduler)
 
     scheduler.start()
     try:
         time.sleep(3)
         jobs = scheduler.get_jobs()
-        assert len(jobs) == 1
+        assert {job.id for job in jobs} == {NOTIFY_JOB_ID, CLEANUP_JOB_ID, SYNC_JOB_ID}
 
     finally:
         scheduler.shutdown(wait=False)
@@ -64,4 +76,195 @@ def test_default_listener_with_exception() -> None:
     assert str(event.exception) == "Boom"
 
 
+def make_watcher(*payments: date) -> tuple[DueDateWatcher, MagicMock, MagicMock]:
+    clients = [
+        ClientRecord(f"c{i}", f"c{i}@example.com", "PZU", "Audi", 2015, 1000, payment)
+        for i, payment in enumerate(payments)
+    ]
+    scheduler = MagicMock()
+    client_service = MagicMock()
+    client_service.client_excel_manager.snapshot.return_value = ClientIndex(clients)
+    client_service.notify_payments_due_between.side_effect = lambda due_from, due_before, timeout: [
+        c.email for c in clients if due_from <= c.next_payment < due_before]
+    return DueDateWatcher(scheduler, client_service, days_ahead=1, overdue_days=3), scheduler, client_service
 
+def test_watcher_next_dates_use_reminders_overdue_and_rollover() -> None:
+    watcher, _, client_service = make_watcher(date(2025, 8, 20), date(2025, 8, 30))
+
+    assert watcher.next_notify_date(date(2025, 8, 10)) == date(2025, 8, 11)
+    assert watcher.next_notify_date(date(2025, 8, 19)) == date(2025, 8, 19)
+    assert watcher.next_cleanup_date(date(2025, 8, 19)) == date(2025, 8, 20)
+
+    client_service.client_excel_manager.snapshot.return_value = ClientIndex([
+        ClientRecord("a", "a@example.com", "PZU", "Audi", 2015, 1000, date(2025, 8, 1))])
+    assert watcher.next_cleanup_date(date(2025, 8, 3)) == date(2025, 8, 4)
+    assert watcher.next_cleanup_date(date(2025, 8, 6)) == date(2025, 8, 6)
+
+    watcher.last_cleanup = date(2025, 8, 6)
+    assert watcher.next_cleanup_date(date(2025, 8, 6)) == date(2025, 8, 7)
+
+def test_watcher_schedules_separate_jobs_and_reschedules_on_mutation() -> None:
+    watcher, scheduler, client_service = make_watcher(date(2025, 8, 20))
+    client_service.client_excel_manager.add_mutation_listener.assert_called_once_with(watcher.on_mutation)
+
+    with patch("src.scheduler.clients_scheduler.datetime") as mock_datetime:
+        mock_datetime.now.return_value = datetime(2025, 8, 18, 12, 0)
+        mock_datetime.combine = datetime.combine
+        watcher.schedule()
+        client_service.client_excel_manager.snapshot.reset_mock()
+        watcher.on_mutation(MagicMock())
+        watcher.on_mutation(MagicMock())
+
+        client_service.client_excel_manager.snapshot.assert_not_called()
+        reschedule = scheduler.add_job.call_args.kwargs
+        assert scheduler.add_job.call_count == 3
+        assert (reschedule["id"], reschedule["run_date"]) == (RESCHEDULE_JOB_ID, datetime(2025, 8, 18, 12, 0, 1))
+
+        watcher.run_reschedule()
+        watcher.on_mutation(MagicMock())
+
+    jobs = {c.kwargs["id"]: c.kwargs for c in scheduler.add_job.call_args_list}
+    assert scheduler.add_job.call_count == 6
+    assert jobs[NOTIFY_JOB_ID]["run_date"] == datetime(2025, 8, 19, 0, 0)
+    assert jobs[NOTIFY_JOB_ID]["executor"] == "notify"
+    assert jobs[CLEANUP_JOB_ID]["run_date"] == datetime(2025, 8, 19, 0, 0)
+    assert jobs[CLEANUP_JOB_ID]["executor"] == "cleanup"
+    assert all(job["trigger"] == "date" and job["replace_existing"] for job in jobs.values())
+
+def test_watcher_runs_only_work_on_due_days() -> None:
+    watcher, scheduler, client_service = make_watcher(date(2025, 8, 20))
+
+    with patch("src.scheduler.clients_scheduler.date") as mock_date:
+        mock_date.today.return_value = date(2025, 8, 10)
+        watcher.run_notify()
+        watcher.run_cleanup()
+        client_service.notify_payments_due_between.assert_not_called()
+        client_service.remove_overdue_clients.assert_not_called()
+
+        mock_date.today.return_value = date(2025, 8, 19)
+        watcher.run_notify()
+        watcher.run_notify()
+        client_service.notify_payments_due_between.assert_called_once_with(date(2025, 8, 20), date(2025, 8, 21), 600.0)
+
+        mock_date.today.return_value = date(2025, 8, 23)
+        watcher.run_cleanup()
+        watcher.run_cleanup()
+        client_service.remove_overdue_clients.assert_called_once_with(3)
+
+    assert scheduler.add_job.call_count == 6
+
+def test_watcher_cleanup_times_out_on_busy_workbook() -> None:
+    watcher, scheduler, client_service = make_watcher(date(2025, 8, 1))
+    client_service.client_excel_manager.lock.side_effect = TimeoutError("busy")
+
+    with pytest.raises(TimeoutError):
+        watcher.run_cleanup()
+
+    client_service.client_excel_manager.lock.assert_called_once_with(120.0)
+    client_service.remove_overdue_clients.assert_not_called()
+    assert scheduler.add_job.call_args.kwargs["id"] == CLEANUP_JOB_ID
+
+def test_default_listener_counts_skipped_and_missed_runs() -> None:
+    job_metrics.clear()
+    for code in (EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED):
+        event = MagicMock()
+        event.code = code
+        default_listener(event)
+
+    assert job_metrics == {"skipped": 2, "missed": 1}
+
+def test_scheduler_runs_are_single_flight() -> None:
+    job_metrics.clear()
+    scheduler = BackgroundScheduler()
+    scheduler.add_listener(default_listener, EVENT_JOB_MAX_INSTANCES)
+    scheduler.add_job(func=time.sleep, args=[1.5], trigger="interval", seconds=0.5, max_instances=1)
+    scheduler.start()
+    try:
+        time.sleep(1.4)
+    finally:
+        scheduler.shutdown(wait=False)
+
+    assert job_metrics["skipped"] >= 1
+
+def test_watcher_job_options_and_missed_run() -> None:
+    watcher, scheduler, _ = make_watcher(date(2025, 8, 20))
+    watcher.misfire_grace_time = 60
+    watcher.schedule()
+
+    options = scheduler.add_job.call_args.kwargs
+    assert (options["max_instances"], options["coalesce"], options["misfire_grace_time"]) == (1, True, 60)
+
+    event = MagicMock()
+    event.job_id = NOTIFY_JOB_ID
+    event.scheduled_run_time = datetime(2025, 8, 19, 0, 0)
+    with patch("src.scheduler.clients_scheduler.datetime") as mock_datetime:
+        mock_datetime.now.return_value = datetime(2025, 8, 19, 7, 30)
+        mock_datetime.combine = datetime.combine
+        watcher.on_job_missed(event)
+
+    assert watcher.last_notify is None
+    assert watcher.last_cleanup is None
+    assert scheduler.add_job.call_count == 3
+    assert scheduler.add_job.call_args.kwargs["id"] == NOTIFY_JOB_ID
+    assert scheduler.add_job.call_args.kwargs["run_date"] == datetime(2025, 8, 19, 7, 30)
+
+def test_watcher_keeps_watermark_before_unsent_reminders() -> None:
+    watcher, scheduler, client_service = make_watcher(date(2025, 8, 16), date(2025, 8, 17), date(2025, 8, 17))
+    watcher.last_notify = date(2025, 8, 13)
+    client_service.notify_payments_due_between.side_effect = lambda *args: ["c0@example.com", "c1@example.com"]
+
+    with (patch("src.scheduler.clients_scheduler.date") as mock_date,
+          patch("src.scheduler.clients_scheduler.datetime") as mock_datetime):
+        mock_date.today.return_value = date(2025, 8, 16)
+        mock_datetime.now.return_value = datetime(2025, 8, 16, 0, 0)
+        mock_datetime.combine = datetime.combine
+        watcher.run_notify()
+
+        assert watcher.last_notify == date(2025, 8, 15)
+        assert scheduler.add_job.call_args.kwargs["run_date"] == datetime(2025, 8, 16, 0, 15)
+
+        client_service.notify_payments_due_between.side_effect = lambda *args: []
+        watcher.run_notify()
+        assert watcher.last_notify == date(2025, 8, 15)
+
+        client_service.notify_payments_due_between.side_effect = lambda *args: ["c1@example.com", "c2@example.com"]
+        watcher.run_notify()
+
+    assert client_service.notify_payments_due_between.call_args.args[:2] == (date(2025, 8, 17), date(2025, 8, 18))
+    assert watcher.last_notify == date(2025, 8, 16)
+    assert scheduler.add_job.call_args.kwargs["run_date"] == datetime(2025, 8, 17, 0, 0)
+
+
+def test_watermark_store_persists_last_runs(tmp_path: Path) -> None:
+    url = f"sqlite:///{tmp_path / 'scheduler.sqlite'}"
+    store = WatermarkStore(url)
+    store.set(NOTIFY_JOB_ID, date(2025, 8, 18))
+    store.set(NOTIFY_JOB_ID, date(2025, 8, 19))
+
+    restarted = WatermarkStore(url)
+    assert restarted.get(NOTIFY_JOB_ID) == date(2025, 8, 19)
+    assert restarted.get(CLEANUP_JOB_ID) is None
+
+def test_watcher_catches_up_reminders_missed_during_downtime() -> None:
+    watcher, _, client_service = make_watcher(date(2025, 8, 14), date(2025, 8, 16), date(2025, 8, 18), date(2025, 8, 25))
+    watcher.last_notify = date(2025, 8, 12)
+
+    assert watcher.notify_window(date(2025, 8, 16)) == (date(2025, 8, 16), date(2025, 8, 18))
+    assert watcher.next_notify_date(date(2025, 8, 16)) == date(2025, 8, 16)
+
+    with patch("src.scheduler.clients_scheduler.date") as mock_date:
+        mock_date.today.return_value = date(2025, 8, 16)
+        watcher.run_notify()
+
+    client_service.notify_payments_due_between.assert_called_once_with(date(2025, 8, 16), date(2025, 8, 18), 600.0)
+    assert watcher.last_notify == date(2025, 8, 16)
+    assert watcher.notify_window(date(2025, 8, 17)) == (date(2025, 8, 18), date(2025, 8, 19))
+
+def test_watcher_sync_skips_busy_workbook() -> None:
+    watcher, _, client_service = make_watcher(date(2025, 8, 20))
+    manager = client_service.client_excel_manager
+    manager.sync_external_changes.side_effect = TimeoutError("busy")
+
+    watcher.run_sync()
+
+    manager.sync_external_changes.assert_called_once_with(timeout=0)
@@ -1,9 +1,12 @@
+from src.excel.manager.archive_manager import ClientArchiveManager
 from src.excel.manager.client_manager import ClientExcelManager
 from src.service.client_service import ClientService
 from unittest.mock import MagicMock, patch
 from datetime import datetime, timedelta
-from src.model.client import Client
+from dataclasses import replace
+from src.model.client import Client, ClientRecord
 from freezegun import freeze_time
+from pathlib import Path
 import pytest
 
 
@@ -18,6 +21,14 @@ def test_add_client_service_with_email_already_exist(example_client_service: Cli
     with pytest.raises(ValueError, match="Client with email"):
         example_client_service.add_client(client_1)
 
+def test_find_clients(example_client_service: ClientService, client_1: Client, client_2: Client) -> None:
+    example_client_service.add_client(client_1)
+    example_client_service.add_client(client_2)
+
+    result = example_client_service.find_clients(company="xyz", price_gte=1000)
+
+    assert [c.email for c in result] == ["client2@gmail.com"]
+
 def test_update_client_service(
         example_client_service: ClientService,
         example_client_manager: ClientExcelManager,
@@ -49,10 +60,36 @@ def test_update_client_service_if_email_not_exist(example_client_service: Client
         example_client_service.update_client("client1@example.com", client_2)
 
 
+def test_patch_client(example_client_service: ClientService, client_1: Client, client_2: Client) -> None:
+    example_client_service.add_client(client_1)
+    example_client_service.add_client(client_2)
+
+    example_client_service.patch_client("client1@example.com", price=900, email="new@example.com")
+
+    client = example_client_service.client_excel_manager.get_client("new@example.com")
+    assert client is not None
+    assert client.price == 900
+
+    with pytest.raises(ValueError, match="Client with email client2@gmail.com already exists"):
+        example_client_service.patch_client("new@example.com", email="client2@gmail.com")
+
+    with pytest.raises(ValueError, match="Client with email client1@example.com not found"):
+        example_client_service.patch_client("client1@example.com", price=1)
+
 def test_confirm_payment_if_client_not_exist(example_client_service: ClientService) -> None:
     with pytest.raises(ValueError, match="Client with email client1@example.com not found"):
         example_client_service.confirm_payment("client1@example.com")
 
+def test_confirm_payments(example_client_service: ClientService, client_1: Client, client_2: Client) -> None:
+    example_client_service.add_client(client_1)
+    example_client_service.add_client(client_2)
+
+    not_found = example_client_service.confirm_payments(
+        ["client1@example.com", "missing@example.com", "client2@gmail.com", "missing@example.com"], days=10)
+
+    assert not_found == ["missing@example.com"]
+    assert len(example_client_service.find_clients(due_from=client_1.next_payment + timedelta(days=10))) == 2
+
 def test_remove_client_service_if_client_not_exist(example_client_service: ClientService) -> None:
      with pytest.raises(ValueError, match="Client with email client1@example.com not found"):
         example_client_service.remove_client("client1@example.com")
@@ -87,21 +124,69 @@ def test_remove_overdue_clients(example_client_manager: ClientExcelManager, exam
     assert "client1@example.com" in removed
     assert "client2@gmail.com" not in removed
 
-def test_remove_overdue_clients_except(example_client_service: ClientService):
-    bad_client = {
-        "name": "bad_client",
-        "email": "bad@example.com",
-        "insurance_company": "abc",
-        "car_model": "Audi",
-        "car_year": 2020,
-        "price": 1000,
-        "next_payment": "not_a_date"
-    }
+def test_remove_overdue_clients_except(
+        example_client_manager: ClientExcelManager,
+        example_client_service: ClientService,
+        example_bad_client: dict[str, str | int]
+) -> None:
+    example_client_manager.insert_main_row(example_bad_client)  # type: ignore[arg-type]
 
-    with patch.object(ClientExcelManager, "load_client_row", return_value=[bad_client]):
-        removed = example_client_service.remove_overdue_clients()
+    removed = example_client_service.remove_overdue_clients()
+    ws = example_client_manager.get_sheet()
 
     assert "bad@example.com" not in removed
+    assert ws["B2"].value == "bad@example.com"
+    assert len(example_client_manager.invalid_rows) == 1
+
+@freeze_time("2025-08-20")
+def test_removed_clients_are_archived_in_batches(
+        tmp_path: Path,
+        example_client_service: ClientService,
+        client_1: Client,
+        client_2: Client
+) -> None:
+    archive = ClientArchiveManager(str(tmp_path / "clients.archive.xlsx"), batch_size=2)
+    example_client_service.archive = archive
+    example_client_service.add_client(client_1)
+    example_client_service.add_client(replace(client_2, next_payment=datetime(2024, 1, 10).date()))
+    example_client_service.add_client(replace(client_2, email="client3@example.com"))
+
+    example_client_service.remove_client("client3@example.com")
+    assert not Path(archive.filepath).exists()
+
+    assert example_client_service.archive_stale_clients(365) == ["client2@gmail.com"]
+    assert Path(archive.filepath).exists()
+    assert example_client_service.remove_overdue_clients() == ["client1@example.com"]
+
+    archived = list(ClientArchiveManager(archive.filepath).iter_clients())
+    assert [(a.client.email, a.reason) for a in archived] == [
+        ("client3@example.com", "removed"), ("client2@gmail.com", "stale"), ("client1@example.com", "overdue")]
+    assert archived[0].archived_on == datetime(2025, 8, 20).date()
+
+    report = example_client_service.generate_monthly_report(include_archive=True)
+    assert report["company"] == {"abc": 1, "xyz": 1}
+
+def test_archive_flush_keeps_rows_saved_by_another_instance(tmp_path: Path) -> None:
+    filepath = str(tmp_path / "clients.archive.xlsx")
+    first = ClientArchiveManager(filepath)
+    second = ClientArchiveManager(filepath)
+
+    def record(email: str) -> ClientRecord:
+        return ClientRecord("Name", email, "PZU", "Audi", 2015, 1000, datetime(2025, 8, 1).date())
+
+    first.add([record("1@example.com")], "removed")
+    first.flush()
+    second.add([record("2@example.com")], "removed")
+    second.flush()
+    first.add([record("3@example.com")], "removed")
+    first.flush()
+
+    archived = ClientArchiveManager(filepath).iter_clients()
+    assert [a.client.email for a in archived] == ["1@example.com", "2@example.com", "3@example.com"]
+
+def test_archive_stale_clients_without_archive(example_client_service: ClientService) -> None:
+    with pytest.raises(ValueError, match="No client archive configured"):
+        example_client_service.archive_stale_clients()
 
 def test_notify_payment_due_in_days(
         example_client_manager: ClientExcelManager,
@@ -137,9 +222,35 @@ def test_notify_payment_due_in_days(
     example_client_manager.load_client_row()
 
     mock_invoice_service.create_invoice.return_value = "fake_invoice_url"
-    example_client_service.notify_payment_due_in_days()
+    notified = example_client_service.notify_payment_due_in_days()
 
     assert mock_email_service.send_email.called
+    assert notified == ["client1@example.com"]
+
+def test_notify_payments_skip_failed_reminders(example_client_service: ClientService, client_1: Client) -> None:
+    example_client_service.email_service = MagicMock()
+    example_client_service.invoice_service = MagicMock()
+    due = datetime.today() + timedelta(days=1)
+    for name in ("a", "b", "c"):
+        example_client_service.add_client(replace(client_1, name=name, email=f"{name}@example.com", next_payment=due))
+    example_client_service.email_service.reset_mock()
+
+    example_client_service.invoice_service.create_invoice.side_effect = [RuntimeError("500"), "url_b", "url_c"]
+    example_client_service.email_service.send_email.side_effect = [False, True]
+
+    assert example_client_service.notify_payment_due_in_days() == ["c@example.com"]
+    assert example_client_service.email_service.send_email.call_count == 2
+
+def test_notify_payment_due_in_days_stops_after_timeout(
+        example_client_service: ClientService,
+        client_1: Client
+) -> None:
+    example_client_service.email_service = MagicMock()
+    example_client_service.add_client(replace(client_1, next_payment=datetime.today() + timedelta(days=1)))
+    example_client_service.email_service.reset_mock()
+
+    assert example_client_service.notify_payment_due_in_days(timeout=0) == []
+    assert not example_client_service.email_service.send_email.called
 
 def test_notify_payment_due_in_days_except(
         example_client_manager: ClientExcelManager,
@@ -152,17 +263,13 @@ def test_notify_payment_due_in_days_except(
     example_client_service.invoice_service = mock_invoice_service
     example_client_service.email_service = mock_email_service
 
-    bad_client = example_bad_client
-
-    example_client_manager.load_client_row()
+    example_client_manager.insert_main_row(example_bad_client)  # type: ignore[arg-type]
 
     mock_invoice_service.create_invoice.return_value = "fake_invoice_url"
-    example_client_service.notify_payment_due_in_days()
-
-    with patch.object(ClientExcelManager, "load_client_row", return_value=[bad_client]):
-        example_client_service.notify_payment_due_in_days(1)
+    example_client_service.notify_payment_due_in_days(1)
 
     assert not mock_email_service.send_email.called
+    assert len(example_client_manager.invalid_rows) == 1
 
 @freeze_time("2025-08-15")
 def test_generate_monthly_report(example_client_service: ClientService, client_1: Client) -> None:
@@ -182,15 +289,16 @@ def test_generate_monthly_report(example_client_service: ClientService, client_1
     assert str(next_payment_date) == "2025-08-15"
 
 def test_generate_monthly_report_except(
+        example_client_manager: ClientExcelManager,
         example_client_service: ClientService,
         example_bad_client: dict[str, str | int]
 ) -> None:
-    bad_client = example_bad_client
+    example_client_manager.insert_main_row(example_bad_client)  # type: ignore[arg-type]
 
-    with patch.object(ClientExcelManager, "load_client_row", return_value=[bad_client]):
-        report = example_client_service.generate_monthly_report()
+    report = example_client_service.generate_monthly_report()
 
-        assert "bad@example.com" not in report
+    assert report["gross_total"] == 0
+    assert "abc" not in report["company"]
 
 
 # def test_current_month_filter(monkeypatch, example_client_service):
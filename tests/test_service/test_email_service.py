@@ -1,5 +1,7 @@
 from unittest.mock import MagicMock, patch
-from config import email_service
+from src.service.factory import create_email_service
+
+email_service = create_email_service()
 
 
 def test_send_email() ->  None:
@@ -7,7 +9,7 @@ def test_send_email() ->  None:
         instance = mock_smtp.return_value.__enter__.return_value
         instance.sendmail = MagicMock()
 
-        email_service.send_email("test@example.com", "Subject", "<b>HTML</b>")
+        assert email_service.send_email("test@example.com", "Subject", "<b>HTML</b>")
         instance.sendmail.assert_called_once()
 
 def test_send_email_with_except() ->  None:
@@ -15,5 +17,5 @@ def test_send_email_with_except() ->  None:
         instance = mock_smtp.return_value.__enter__.return_value
         instance.sendmail.side_effect = Exception("SMTP fail")
 
-        email_service.send_email("test@example.com", "Subject", "<b>HTML</b>")
+        assert not email_service.send_email("test@example.com", "Subject", "<b>HTML</b>")
         assert instance.sendmail.call_count == 1
\ No newline at end of file
@@ -1,6 +1,8 @@
 from unittest.mock import patch, MagicMock
 from src.model.invoice import InvoiceDict
-from config import invoice_service
+from src.service.factory import create_invoice_service
+
+invoice_service = create_invoice_service()
 
 
 
@@ -0,0 +1,71 @@
+from src.service.workbook_runner import find_workbooks, merge_reports, run_workbooks
+from src.service.factory import create_client_service
+from openpyxl import Workbook
+from datetime import date
+from pathlib import Path
+import pytest
+
+
+def write_workbook(path: Path, *clients: tuple[str, str, int, date]) -> None:
+    manager = create_client_service(str(path)).client_excel_manager
+    for email, company, price, next_payment in clients:
+        manager.insert_main_row({
+            "name": email.split("@")[0],
+            "email": email,
+            "insurance_company": company,
+            "car_model": "Audi",
+            "car_year": 2015,
+            "price": price,
+            "next_payment": next_payment.isoformat()
+        })
+    manager.save()
+
+def test_find_workbooks_lists_directory_in_name_order(tmp_path: Path) -> None:
+    for name in ("b.xlsx", "a.xlsx", "~$a.xlsx", "a.xlsx.lock", "notes.txt"):
+        (tmp_path / name).touch()
+
+    assert find_workbooks(tmp_path) == [tmp_path / "a.xlsx", tmp_path / "b.xlsx"]
+    assert find_workbooks(["x.xlsx", tmp_path / "y.xlsx"]) == [Path("x.xlsx"), tmp_path / "y.xlsx"]
+
+    with pytest.raises(ValueError, match="does not exist"):
+        find_workbooks(tmp_path / "missing")
+
+def test_find_workbooks_skips_backups_archives_and_foreign_books(tmp_path: Path) -> None:
+    write_workbook(tmp_path / "Clients.xlsx")
+    for name in ("Clients.bak1.xlsx", "Clients.bak2.xlsx", "Clients.archive.xlsx", "archive.xlsx"):
+        (tmp_path / name).write_bytes((tmp_path / "Clients.xlsx").read_bytes())
+    other = Workbook()
+    other.active.title = "Prices"
+    other.save(tmp_path / "prices.xlsx")
+
+    assert find_workbooks(tmp_path) == [tmp_path / "Clients.xlsx"]
+
+def test_merge_reports_sums_companies_and_totals() -> None:
+    merged = merge_reports([
+        {"month": "2025-08", "company": {"PZU": 1, "ABC": 2}, "gross_total": 3000, "net_total": 2400},
+        {"month": "2025-08", "company": {"PZU": 2}, "gross_total": 1000, "net_total": 800},
+    ])
+
+    assert merged["company"] == {"PZU": 3, "ABC": 2}
+    assert (merged["gross_total"], merged["net_total"]) == (4000, 3200)
+
+def test_run_workbooks_processes_books_in_worker_processes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    today = date.today()
+    write_workbook(
+        tmp_path / "north.xlsx",
+        ("old@example.com", "PZU", 1000, date(2020, 1, 1)),
+        ("north@example.com", "PZU", 1500, today),
+    )
+    write_workbook(tmp_path / "south.xlsx", ("south@example.com", "ABC", 2000, today))
+    (tmp_path / "broken.xlsx").write_text("not a workbook")
+
+    monkeypatch.chdir(tmp_path)
+    result = run_workbooks(tmp_path, max_workers=2)
+
+    assert [Path(run["filepath"]).name for run in result["workbooks"]] == ["broken.xlsx", "north.xlsx", "south.xlsx"]
+    assert result["failed"] == [str(tmp_path / "broken.xlsx")]
+    assert result["removed"] == ["old@example.com"]
+    assert result["notified"] == []
+    assert result["report"]["company"] == {"PZU": 1, "ABC": 1}
+    assert result["report"]["gross_total"] == 3500
+    assert not (tmp_path / "Clients.xlsx").exists()